@@ -0,0 +1,336 @@
+"""
+Benchmark of the processor's `ExecuteDagPart` hot path.
+
+Builds synthetic `ExecutionRequest`s with a configurable number of algorithms,
+dependency results, window metadata fields and result type, and drives
+`Processor.ExecuteDagPart` directly, and over a real in-process gRPC server in
+both serving modes. Reports requests/s, p50/p99/p999 latency, and the memory
+allocated while serving a request, traced by `tracemalloc`: the peak bytes
+allocated at once and the bytes still held afterwards.
+
+Results are written as JSON so runs can be compared between releases, e.g.
+by passing the file of an earlier run to `--compare`.
+
+Usage:
+    poetry run python benchmarks/bench_execute_dag_part.py [--requests N]
+        [--algorithms N] [--fan-in N] [--metadata-fields N]
+        [--result-type value|array|struct] [--modes direct,grpc,aio]
+        [--output FILE] [--compare FILE]
+"""
+
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+import platform
+import threading
+import tracemalloc
+from typing import Any, Dict, List, Tuple, Callable, Optional
+from concurrent import futures
+
+import grpc
+import service_pb2 as pb
+import service_pb2_grpc
+from google.protobuf import timestamp_pb2
+
+from orca_python import (
+    Processor,
+    WindowType,
+    ArrayResult,
+    ValueResult,
+    StructResult,
+    ExecutionParams,
+)
+from orca_python.main import SERVER_OPTIONS
+
+Window = WindowType(name="Bench", version="1.0.0", description="Benchmark window")
+
+
+def build_processor(args: argparse.Namespace) -> Processor:
+    """Registers `--algorithms` algorithms that read every dependency result."""
+    proc = Processor("bench", executor_max_workers=args.workers)
+    proc._algorithmsSingleton._flush()
+    results: Dict[str, Callable[[ExecutionParams], Any]] = {
+        "value": lambda params: ValueResult(len(params.dependency_values)),
+        "array": lambda params: ArrayResult([0.5] * args.array_size),
+        "struct": lambda params: StructResult(
+            {"origin": params.window.origin, "values": [1.0, 2.0, 3.0]}
+        ),
+    }
+    resultType = {"value": ValueResult, "array": ArrayResult, "struct": StructResult}[
+        args.result_type
+    ]
+    make = results[args.result_type]
+
+    for i in range(args.algorithms):
+
+        def algorithm(params: ExecutionParams) -> Any:
+            for key in params.dependency_values:
+                params.dependency_values[key]
+            return make(params)
+
+        algorithm.__annotations__["return"] = resultType
+        proc.algorithm(f"Algorithm{i}", "1.0.0", Window)(algorithm)
+    return proc
+
+
+def _dependency_result(args: argparse.Namespace, i: int) -> pb.AlgorithmResult:
+    result = pb.Result(status=pb.ResultStatus.RESULT_STATUS_SUCEEDED)
+    if args.result_type == "value":
+        result.single_value = random.random()
+    elif args.result_type == "array":
+        result.float_values.values.extend(
+            random.random() for _ in range(args.array_size)
+        )
+    else:
+        result.struct_value.update({"mean": random.random(), "count": i})
+    return pb.AlgorithmResult(
+        algorithm=pb.Algorithm(name=f"Upstream{i}", version="1.0.0"), result=result
+    )
+
+
+def build_request(args: argparse.Namespace, index: int) -> pb.ExecutionRequest:
+    """A DAG part of every algorithm, with `--fan-in` dependency results."""
+    request = pb.ExecutionRequest(
+        exec_id=f"bench-{index}",
+        window=pb.Window(
+            time_from=timestamp_pb2.Timestamp(seconds=index),
+            time_to=timestamp_pb2.Timestamp(seconds=index + 30),
+            window_type_name=Window.name,
+            window_type_version=Window.version,
+            origin="bench",
+        ),
+        algorithm_results=[_dependency_result(args, i) for i in range(args.fan_in)],
+        algorithms=[
+            pb.Algorithm(name=f"Algorithm{i}", version="1.0.0")
+            for i in range(args.algorithms)
+        ],
+    )
+    request.window.metadata.update(
+        {f"field{i}": random.random() for i in range(args.metadata_fields)}
+    )
+    return request
+
+
+def percentile(sortedValues: List[float], q: float) -> float:
+    """The nearest-rank percentile of already sorted values."""
+    index = min(len(sortedValues) - 1, max(0, int(q * len(sortedValues) + 0.5) - 1))
+    return sortedValues[index]
+
+
+def run_direct(
+    proc: Processor, requests: List[pb.ExecutionRequest], concurrency: int
+) -> List[float]:
+    """Calls `ExecuteDagPart` on `concurrency` threads, as gRPC threads would."""
+
+    def call(request: pb.ExecutionRequest) -> float:
+        started = time.perf_counter()
+        results = list(proc.ExecuteDagPart(request, context=None))  # type: ignore[arg-type]
+        assert len(results) == len(request.algorithms)
+        return time.perf_counter() - started
+
+    if concurrency == 1:
+        return [call(request) for request in requests]
+    with futures.ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(call, requests))
+
+
+def run_grpc(
+    address: str, requests: List[pb.ExecutionRequest], concurrency: int
+) -> List[float]:
+    """Streams every request from a client on `concurrency` threads."""
+    with grpc.insecure_channel(address, options=SERVER_OPTIONS) as channel:
+        stub = service_pb2_grpc.OrcaProcessorStub(channel)
+
+        def call(request: pb.ExecutionRequest) -> float:
+            started = time.perf_counter()
+            results = list(stub.ExecuteDagPart(request))
+            assert len(results) == len(request.algorithms)
+            return time.perf_counter() - started
+
+        with futures.ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(call, requests))
+
+
+def serve_sync(proc: Processor, workers: int) -> Tuple[int, Callable[[], Any]]:
+    """Starts a threaded gRPC server, as `Processor.Start()` does."""
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=workers), options=SERVER_OPTIONS
+    )
+    service_pb2_grpc.add_OrcaProcessorServicer_to_server(proc, server)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    return port, lambda: server.stop(grace=None)
+
+
+def serve_aio(proc: Processor) -> Tuple[int, Callable[[], Any]]:
+    """Starts a `grpc.aio` server on an event loop of its own thread."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    server, port = asyncio.run_coroutine_threadsafe(
+        proc._start_aio_server("localhost:0"), loop
+    ).result()
+
+    def stop() -> None:
+        asyncio.run_coroutine_threadsafe(server.stop(grace=None), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    return port, stop
+
+
+def trace_allocations(
+    run: Callable[[List[pb.ExecutionRequest]], Any],
+    requests: List[pb.ExecutionRequest],
+) -> Dict[str, float]:
+    """Serves requests one at a time under `tracemalloc`."""
+    peaks = []
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        for request in requests:
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            run([request])
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - current)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "peak_bytes_per_request": sum(peaks) / len(peaks),
+        "retained_bytes_per_request": (after - before) / len(requests),
+    }
+
+
+def measure(
+    mode: str,
+    run: Callable[[List[pb.ExecutionRequest]], List[float]],
+    args: argparse.Namespace,
+) -> Dict[str, Any]:
+    random.seed(0)
+    run([build_request(args, i) for i in range(args.warmup)])
+    requests = [build_request(args, i) for i in range(args.requests)]
+
+    started = time.perf_counter()
+    latencies = sorted(run(requests))
+    elapsed = time.perf_counter() - started
+
+    allocations = trace_allocations(run, requests[: args.alloc_requests])
+    return {
+        "mode": mode,
+        "requests": len(requests),
+        "requests_per_second": len(requests) / elapsed,
+        "latency_ms": {
+            "mean": sum(latencies) / len(latencies) * 1e3,
+            "p50": percentile(latencies, 0.50) * 1e3,
+            "p99": percentile(latencies, 0.99) * 1e3,
+            "p999": percentile(latencies, 0.999) * 1e3,
+            "max": latencies[-1] * 1e3,
+        },
+        "allocations": allocations,
+    }
+
+
+def compare(results: List[Dict[str, Any]], baselinePath: str) -> None:
+    with open(baselinePath) as f:
+        baseline = {r["mode"]: r for r in json.load(f)["results"]}
+    print(f"\nCompared with {baselinePath}:")
+    for result in results:
+        before = baseline.get(result["mode"])
+        if before is None:
+            continue
+        throughput = result["requests_per_second"] / before["requests_per_second"]
+        p99 = result["latency_ms"]["p99"] / before["latency_ms"]["p99"]
+        print(
+            f"{result['mode']:<8} throughput {throughput:>6.2f}x  p99 latency {p99:>6.2f}x"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--alloc-requests", type=int, default=200)
+    parser.add_argument("--algorithms", type=int, default=4)
+    parser.add_argument("--fan-in", type=int, default=4)
+    parser.add_argument("--metadata-fields", type=int, default=8)
+    parser.add_argument(
+        "--result-type", choices=("value", "array", "struct"), default="value"
+    )
+    parser.add_argument("--array-size", type=int, default=256)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--modes", default="direct,grpc,aio")
+    parser.add_argument("--output", default="bench_execute_dag_part.json")
+    parser.add_argument("--compare", default=None)
+    args = parser.parse_args()
+
+    # per algorithm info logs would dominate the timings
+    logging.getLogger("orca_python").setLevel(logging.WARNING)
+    proc = build_processor(args)
+    results = []
+    for mode in args.modes.split(","):
+        stop: Optional[Callable[[], Any]] = None
+        if mode == "direct":
+            run = lambda requests: run_direct(proc, requests, args.concurrency)  # noqa: E731
+        elif mode in ("grpc", "aio"):
+            if mode == "grpc":
+                port, stop = serve_sync(proc, args.workers)
+            else:
+                port, stop = serve_aio(proc)
+            address = f"localhost:{port}"
+            run = lambda requests: run_grpc(address, requests, args.concurrency)  # noqa: E731
+        else:
+            parser.error(f"unknown mode {mode!r}")
+        try:
+            results.append(measure(mode, run, args))
+        finally:
+            if stop is not None:
+                stop()
+
+    header = (
+        f"{'mode':<8}{'req/s':>10}{'p50':>10}{'p99':>10}{'p999':>10}"
+        f"{'peak/req':>12}{'held/req':>12}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        latency = r["latency_ms"]
+        allocations = r["allocations"]
+        print(
+            f"{r['mode']:<8}{r['requests_per_second']:>10.0f}"
+            f"{latency['p50']:>8.2f}ms{latency['p99']:>8.2f}ms{latency['p999']:>8.2f}ms"
+            f"{allocations['peak_bytes_per_request'] / 1024:>10.1f}KB"
+            f"{allocations['retained_bytes_per_request'] / 1024:>10.1f}KB"
+        )
+
+    config = {
+        key: value
+        for key, value in vars(args).items()
+        if key not in ("output", "compare")
+    }
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "benchmark": "execute_dag_part",
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "python": sys.version,
+                "platform": platform.platform(),
+                "config": config,
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+    print(f"\nWrote {args.output}")
+    if args.compare is not None:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
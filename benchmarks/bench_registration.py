@@ -0,0 +1,147 @@
+"""
+Benchmark of algorithm registration and dispatch as the registry grows.
+
+Registers N generated algorithms, each depending on up to `--fan-in` of the
+algorithms registered before it, for each N of `--sizes`, and reports the time
+taken per algorithm, which stays flat while registration is linear. With the
+registry of each size it also times `ExecuteDagPart` on a DAG part of one
+algorithm, with and without `local_dag`, which should not grow with N.
+
+Results are written as JSON so runs can be compared between releases.
+
+Usage:
+    poetry run python benchmarks/bench_registration.py [--sizes 500,1000,2000,4000]
+        [--fan-in N] [--requests N] [--output FILE]
+"""
+
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import platform
+from typing import Any, Dict, List
+
+import service_pb2 as pb
+from google.protobuf import timestamp_pb2
+
+from orca_python import Processor, WindowType, ValueResult, ExecutionParams
+
+Window = WindowType(name="Bench", version="1.0.0", description="Benchmark window")
+
+
+def register(size: int, fanIn: int, localDag: bool) -> Processor:
+    """Registers `size` algorithms, each depending on earlier ones."""
+    random.seed(0)
+    proc = Processor("bench", local_dag=localDag)
+    registered: List[Any] = []
+    for i in range(size):
+
+        def algorithm(params: ExecutionParams) -> ValueResult:
+            return ValueResult(len(params.dependency_values))
+
+        dependencies = random.sample(registered, min(fanIn, len(registered)))
+        registered.append(
+            proc.algorithm(f"Algorithm{i}", "1.0.0", Window, depends_on=dependencies)(
+                algorithm
+            )
+        )
+    return proc
+
+
+def build_request(name: str, index: int) -> pb.ExecutionRequest:
+    return pb.ExecutionRequest(
+        exec_id=f"bench-{index}",
+        window=pb.Window(
+            time_from=timestamp_pb2.Timestamp(seconds=index),
+            time_to=timestamp_pb2.Timestamp(seconds=index + 30),
+            window_type_name=Window.name,
+            window_type_version=Window.version,
+            origin="bench",
+        ),
+        algorithms=[pb.Algorithm(name=name, version="1.0.0")],
+    )
+
+
+def time_requests(proc: Processor, requests: List[pb.ExecutionRequest]) -> float:
+    """Returns the mean seconds per `ExecuteDagPart` call."""
+    started = time.perf_counter()
+    for request in requests:
+        for _ in proc.ExecuteDagPart(request, context=None):  # type: ignore[arg-type]
+            pass
+    return (time.perf_counter() - started) / len(requests)
+
+
+def measure(size: int, args: argparse.Namespace) -> Dict[str, Any]:
+    started = time.perf_counter()
+    proc = register(size, args.fan_in, localDag=False)
+    registration = time.perf_counter() - started
+    started = time.perf_counter()
+    proc._algorithmsSingleton._freeze()
+    freeze = time.perf_counter() - started
+
+    # an algorithm without dependencies, so the DAG part is a single execution
+    requests = [build_request("Algorithm0", i) for i in range(args.requests)]
+    time_requests(proc, requests[: args.requests // 10 or 1])
+    dispatch = time_requests(proc, requests)
+
+    localProc = register(size, args.fan_in, localDag=True)
+    localProc._algorithmsSingleton._freeze()
+    time_requests(localProc, requests[: args.requests // 10 or 1])
+    localDispatch = time_requests(localProc, requests)
+    return {
+        "algorithms": size,
+        "registration_seconds": registration,
+        "registration_us_per_algorithm": registration / size * 1e6,
+        "freeze_seconds": freeze,
+        "execute_dag_part_us": dispatch * 1e6,
+        "execute_dag_part_local_dag_us": localDispatch * 1e6,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="500,1000,2000,4000")
+    parser.add_argument("--fan-in", type=int, default=2)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--output", default="bench_registration.json")
+    args = parser.parse_args()
+
+    # per algorithm info logs would dominate the timings
+    logging.getLogger("orca_python").setLevel(logging.WARNING)
+    results = [measure(int(size), args) for size in args.sizes.split(",")]
+
+    header = (
+        f"{'algorithms':>10}{'register':>12}{'per algo':>12}{'freeze':>10}"
+        f"{'dispatch':>12}{'local dag':>12}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['algorithms']:>10}{r['registration_seconds'] * 1e3:>10.1f}ms"
+            f"{r['registration_us_per_algorithm']:>10.1f}us"
+            f"{r['freeze_seconds'] * 1e3:>8.1f}ms"
+            f"{r['execute_dag_part_us']:>10.1f}us"
+            f"{r['execute_dag_part_local_dag_us']:>10.1f}us"
+        )
+
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "benchmark": "registration",
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "python": sys.version,
+                "platform": platform.platform(),
+                "config": {"fan_in": args.fan_in, "requests": args.requests},
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+    print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
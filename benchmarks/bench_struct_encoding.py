@@ -0,0 +1,115 @@
+"""
+Benchmark of the `Struct` encoder and decoder against `json_format`.
+
+Runs each payload shape through `json_format.ParseDict`/`MessageToDict` and
+through `orca_python.encoding.encode_struct`/`decode_struct`, and reports the
+mean time per payload and the speedup.
+
+Usage:
+    poetry run python benchmarks/bench_struct_encoding.py [--iterations N]
+"""
+
+import time
+import random
+import argparse
+from typing import Any, Dict, List, Callable
+
+from google.protobuf import struct_pb2, json_format
+
+from orca_python.encoding import decode_struct, encode_struct
+
+
+def summary_stats() -> Dict[str, Any]:
+    """A handful of scalar statistics, the most common struct result."""
+    return {
+        "min": random.random(),
+        "median": random.random(),
+        "max": random.random(),
+        "count": random.randint(0, 1000),
+        "unit": "m/s",
+        "valid": True,
+    }
+
+
+def nested_report() -> Dict[str, Any]:
+    """A nested report with labelled sections and short lists."""
+    return {
+        "vehicle": {"id": "bus-42", "route": 7, "depot": None},
+        "stops": [
+            {"name": f"stop-{i}", "dwell": random.random(), "late": i % 3 == 0}
+            for i in range(20)
+        ],
+        "summary": summary_stats(),
+    }
+
+
+def time_series() -> Dict[str, Any]:
+    """A series of 500 timestamped readings."""
+    return {
+        "series": [{"t": i, "v": random.random()} for i in range(500)],
+        "resolution": 1.0,
+    }
+
+
+def numeric_lists() -> Dict[str, Any]:
+    """Columns of 1000 floats each."""
+    return {name: [random.random() for _ in range(1000)] for name in ("x", "y", "z")}
+
+
+SHAPES: Dict[str, Callable[[], Dict[str, Any]]] = {
+    "summary_stats": summary_stats,
+    "nested_report": nested_report,
+    "time_series": time_series,
+    "numeric_lists": numeric_lists,
+}
+
+
+def _time_per_item(fn: Callable[[Any], Any], items: List[Any]) -> float:
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - start) / len(items)
+
+
+def _json_encode(payload: Dict[str, Any]) -> struct_pb2.Struct:
+    struct = struct_pb2.Struct()
+    json_format.ParseDict(payload, struct)
+    return struct
+
+
+def _fast_encode(payload: Dict[str, Any]) -> struct_pb2.Struct:
+    struct = struct_pb2.Struct()
+    encode_struct(struct, payload)
+    return struct
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    random.seed(0)
+    header = f"{'payload':<16}{'op':<8}{'json_format':>14}{'orca':>14}{'speedup':>10}"
+    print(header)
+    print("-" * len(header))
+
+    for name, make in SHAPES.items():
+        payloads = [make() for _ in range(args.iterations)]
+        structs = [_json_encode(payload) for payload in payloads]
+        assert _fast_encode(payloads[0]) == structs[0]
+        assert decode_struct(structs[0]) == json_format.MessageToDict(structs[0])
+
+        for op, baseline, fast, items in (
+            ("encode", _json_encode, _fast_encode, payloads),
+            ("decode", json_format.MessageToDict, decode_struct, structs),
+        ):
+            baseline_s = _time_per_item(baseline, items)
+            fast_s = _time_per_item(fast, items)
+            print(
+                f"{name:<16}{op:<8}{baseline_s * 1e6:>12.1f}us{fast_s * 1e6:>12.1f}us"
+                f"{baseline_s / fast_s:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
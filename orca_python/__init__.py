@@ -1,19 +1,37 @@
-from orca_python.main import (
-    Window,
-    Processor,
-    EmitWindow,
-    NoneResult,
-    WindowType,
-    ArrayResult,
-    ValueResult,
-    StructResult,
-    MetadataField,
-    ExecutionParams,
-)
+# `typing` is not imported, as it takes longer to import than the package itself
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from orca_python.main import (
+        Processor,
+        NoneResult,
+        ArrayResult,
+        ValueResult,
+        StructResult,
+        ExecutionParams,
+        DependencyResults,
+    )
+    from orca_python.cache import CachePolicy, DiskResultStore
+    from orca_python.client import OrcaCoreClient
+    from orca_python.windows import (
+        Window,
+        EmitResult,
+        EmitWindow,
+        WindowType,
+        EmitWindows,
+        MetadataField,
+        WindowEmitter,
+        EmitWindowsAsync,
+    )
+    from orca_python.batching import BatchPolicy
+    from orca_python.admission import AdmissionPolicy
 
 __all__ = [
     "Processor",
     "EmitWindow",
+    "EmitWindows",
+    "EmitWindowsAsync",
+    "EmitResult",
+    "WindowEmitter",
     "Window",
     "MetadataField",
     "WindowType",
@@ -22,4 +40,49 @@ __all__ = [
     "ArrayResult",
     "NoneResult",
     "ExecutionParams",
+    "DependencyResults",
+    "OrcaCoreClient",
+    "CachePolicy",
+    "DiskResultStore",
+    "AdmissionPolicy",
+    "BatchPolicy",
 ]
+
+# the module each export is defined in, imported on first use of one of its
+# exports, so that e.g. a window emitter does not load the processor
+_EXPORTS = {
+    "Processor": "orca_python.main",
+    "StructResult": "orca_python.main",
+    "ValueResult": "orca_python.main",
+    "ArrayResult": "orca_python.main",
+    "NoneResult": "orca_python.main",
+    "ExecutionParams": "orca_python.main",
+    "DependencyResults": "orca_python.main",
+    "EmitWindow": "orca_python.windows",
+    "EmitWindows": "orca_python.windows",
+    "EmitWindowsAsync": "orca_python.windows",
+    "EmitResult": "orca_python.windows",
+    "WindowEmitter": "orca_python.windows",
+    "Window": "orca_python.windows",
+    "MetadataField": "orca_python.windows",
+    "WindowType": "orca_python.windows",
+    "OrcaCoreClient": "orca_python.client",
+    "CachePolicy": "orca_python.cache",
+    "DiskResultStore": "orca_python.cache",
+    "AdmissionPolicy": "orca_python.admission",
+    "BatchPolicy": "orca_python.batching",
+}
+
+
+def __getattr__(name: str) -> object:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # `__import__` rather than `importlib`, so `-X importtime` reports the import
+    value = getattr(__import__(_EXPORTS[name], fromlist=[name]), name)
+    # cached, so later lookups do not come through here
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,163 @@
+"""
+Admission control for DAG parts.
+
+Every algorithm of an accepted DAG part is queued at once, so a processor that
+accepts work faster than it completes it, e.g. while Orca-core catches up after
+an outage, grows without bound. An `AdmissionController` caps the algorithm
+executions that are queued or running. A DAG part that does not fit waits in a
+short, bounded queue for earlier ones to complete, or is rejected so that
+Orca-core retries it later.
+"""
+
+import asyncio
+import threading
+from typing import Any, Deque, Optional
+from collections import deque
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class AdmissionPolicy:
+    """
+    Limits of the work a processor accepts.
+
+    Attributes:
+        max_pending (int): The most algorithm executions queued or running at
+            once. A DAG part larger than this is only admitted when nothing else
+            is pending.
+        max_waiting (int): The most DAG parts waiting to be admitted. Further
+            DAG parts are rejected straight away (default: 0, never wait).
+        max_wait (float): Seconds a DAG part waits to be admitted before it is
+            rejected.
+        retry_after (float): Seconds Orca-core is asked to wait before retrying
+            a rejected DAG part.
+    """
+
+    max_pending: int
+    max_waiting: int = 0
+    max_wait: float = 5.0
+    retry_after: float = 1.0
+
+    def __post_init__(self) -> None:
+        if self.max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        if self.max_waiting < 0:
+            raise ValueError("max_waiting must not be negative")
+        if self.max_wait <= 0:
+            raise ValueError("max_wait must be positive")
+        if self.retry_after < 0:
+            raise ValueError("retry_after must not be negative")
+
+
+class _Waiter:
+    def __init__(self, count: int, loop: asyncio.AbstractEventLoop):
+        self.count = count
+        self.loop = loop
+        self.future: "asyncio.Future[None]" = loop.create_future()
+        self.admitted = False
+
+    def admit(self) -> None:
+        self.admitted = True
+        self.loop.call_soon_threadsafe(self._wake)
+
+    def _wake(self) -> None:
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+class AdmissionController:
+    """
+    Counts pending algorithm executions against an `AdmissionPolicy`.
+
+    DAG parts are admitted in arrival order: while any DAG part is waiting, new
+    ones queue behind it even if they would fit. The controller is shared by
+    the threads and event loops serving DAG parts.
+
+    Args:
+        policy (AdmissionPolicy): The limits to enforce.
+    """
+
+    def __init__(self, policy: AdmissionPolicy):
+        self._policy = policy
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._waiters: Deque[_Waiter] = deque()
+
+    @property
+    def policy(self) -> AdmissionPolicy:
+        return self._policy
+
+    @property
+    def pending(self) -> int:
+        """The number of admitted algorithm executions not yet completed."""
+        return self._pending
+
+    @property
+    def waiting(self) -> int:
+        """The number of DAG parts waiting to be admitted."""
+        return len(self._waiters)
+
+    def _fits(self, count: int) -> bool:
+        return self._pending == 0 or self._pending + count <= self._policy.max_pending
+
+    async def admit(self, count: int) -> Optional[str]:
+        """
+        Admits `count` algorithm executions, waiting up to `max_wait` seconds
+        for room.
+
+        Args:
+            count (int): The number of algorithms in the DAG part.
+
+        Returns:
+            Optional[str]: `None` once admitted, otherwise why the DAG part was
+            rejected: `"full"` if it could not wait, or `"timeout"`.
+        """
+        with self._lock:
+            if not self._waiters and self._fits(count):
+                self._pending += count
+                return None
+            if len(self._waiters) >= self._policy.max_waiting:
+                return "full"
+            waiter = _Waiter(count, asyncio.get_running_loop())
+            self._waiters.append(waiter)
+
+        try:
+            await asyncio.wait({waiter.future}, timeout=self._policy.max_wait)
+        except BaseException:
+            # cancelled, e.g. because the caller went away
+            with self._lock:
+                self._withdraw(waiter)
+            raise
+        with self._lock:
+            if waiter.admitted:
+                return None
+            self._withdraw(waiter)
+        return "timeout"
+
+    def _withdraw(self, waiter: _Waiter) -> None:
+        if waiter.admitted:
+            self._pending -= waiter.count
+        else:
+            self._waiters.remove(waiter)
+        # the next DAG part may fit now that this one has left
+        self._admit_waiters()
+
+    def release(self, count: int = 1) -> None:
+        """Marks `count` admitted algorithm executions as completed."""
+        with self._lock:
+            self._pending -= count
+            self._admit_waiters()
+
+    def _admit_waiters(self) -> None:
+        while self._waiters and self._fits(self._waiters[0].count):
+            waiter = self._waiters.popleft()
+            self._pending += waiter.count
+            waiter.admit()
+
+
+def retry_pushback_metadata(retry_after: float) -> Any:
+    """
+    Returns the trailing metadata asking gRPC clients to retry after
+    `retry_after` seconds, as understood by gRPC's retry policies.
+    """
+    return (("grpc-retry-pushback-ms", str(int(retry_after * 1000))),)
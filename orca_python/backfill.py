@@ -0,0 +1,226 @@
+"""
+Offline backfills of algorithms over historical windows.
+
+`Processor.backfill` generates the windows of a time range itself and runs
+the algorithms they trigger, with their local dependencies, on the processor's
+own executors instead of emitting each window through Orca-core. Results are
+written in bulk, a chunk of windows at a time, to JSON Lines or Parquet.
+
+After each chunk the writer's position is recorded in a checkpoint file. A
+backfill started again with the same arguments resumes after the last chunk
+recorded, discarding anything written after it, so no window is written twice.
+The checkpoint is removed once the backfill completes.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import importlib
+from typing import Any, Dict, List, Mapping, Iterable, Optional, Protocol
+from pathlib import Path
+from dataclasses import dataclass
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class BackfillReport:
+    """
+    The outcome of a backfill.
+
+    Attributes:
+        windows (int): Windows run by this call.
+        skipped (int): Windows already completed by an earlier, interrupted call.
+        results (int): Results written.
+        failures (int): Results written that did not succeed.
+        seconds (float): Time taken by this call.
+    """
+
+    windows: int
+    skipped: int
+    results: int
+    failures: int
+    seconds: float
+
+    @property
+    def windows_per_second(self) -> float:
+        return self.windows / self.seconds if self.seconds > 0 else 0.0
+
+
+class ResultWriter(Protocol):
+    """Writes backfilled results in bulk, durably, from a known position."""
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        """Writes rows, which are stored once this returns."""
+        ...
+
+    def position(self) -> Any:
+        """Returns the JSON serializable position after the last write."""
+        ...
+
+    def restore(self, position: Any) -> None:
+        """Discards everything written after `position`."""
+        ...
+
+    def close(self) -> None: ...
+
+
+class JsonlWriter:
+    """
+    Appends results to a JSON Lines file, one object per line.
+
+    Args:
+        path (str | Path): The file. Its directory is created if needed.
+    """
+
+    def __init__(self, path: "str | Path"):
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._path, "ab")
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        data = "".join(json.dumps(row, default=str) + "\n" for row in rows)
+        self._file.write(data.encode())
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def position(self) -> int:
+        return self._file.tell()
+
+    def restore(self, position: int) -> None:
+        self._file.truncate(position)
+        self._file.seek(position)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetWriter:
+    """
+    Writes results to a directory of Parquet files, one per chunk of windows.
+
+    Args:
+        path (str | Path): The directory. It is created if needed.
+
+    Raises:
+        ImportError: If `pyarrow` is not installed.
+    """
+
+    def __init__(self, path: "str | Path"):
+        try:
+            self._pa = importlib.import_module("pyarrow")
+            self._pq = importlib.import_module("pyarrow.parquet")
+        except ImportError as e:
+            raise ImportError(
+                "Parquet backfills require pyarrow: pip install pyarrow"
+            ) from e
+        self._path = Path(path)
+        self._path.mkdir(parents=True, exist_ok=True)
+        self._parts = len(list(self._path.glob("part-*.parquet")))
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        # metadata and results vary in shape, so are kept as JSON
+        table = self._pa.Table.from_pylist(
+            [
+                {
+                    **row,
+                    "metadata": json.dumps(row["metadata"], default=str),
+                    "result": json.dumps(row["result"], default=str),
+                }
+                for row in rows
+            ]
+        )
+        self._pq.write_table(table, self._path / f"part-{self._parts:05d}.parquet")
+        self._parts += 1
+
+    def position(self) -> int:
+        return self._parts
+
+    def restore(self, position: int) -> None:
+        for part in self._path.glob("part-*.parquet"):
+            if int(part.stem.split("-")[1]) >= position:
+                part.unlink()
+        self._parts = position
+
+    def close(self) -> None:
+        pass
+
+
+class Checkpoint:
+    """
+    The progress of a backfill, saved atomically to a JSON file.
+
+    Args:
+        path (str | Path): The checkpoint file.
+        run (Dict[str, Any]): Describes the backfill, so that a checkpoint of
+            a different one is not resumed.
+    """
+
+    def __init__(self, path: "str | Path", run: Dict[str, Any]):
+        self._path = Path(path)
+        self._run = run
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the saved progress, or `None` if there is none.
+
+        Raises:
+            ValueError: If the checkpoint belongs to a different backfill.
+        """
+        if not self._path.exists():
+            return None
+        state = json.loads(self._path.read_text())
+        if state.get("run") != self._run:
+            raise ValueError(
+                f"Checkpoint {self._path} belongs to a different backfill, "
+                "remove it to start again"
+            )
+        return state
+
+    def save(self, windows: int, position: Any) -> None:
+        """Records that `windows` windows are written, up to `position`."""
+        temporary = self._path.with_name(f"{self._path.name}.tmp")
+        temporary.write_text(
+            json.dumps({"run": self._run, "windows": windows, "position": position})
+        )
+        os.replace(temporary, self._path)
+
+    def remove(self) -> None:
+        """Removes the checkpoint of a completed backfill."""
+        self._path.unlink(missing_ok=True)
+
+
+def metadata_digest(metadatas: Iterable[Mapping[str, Any]]) -> str:
+    """
+    Returns a digest of the metadata of a backfill's windows, in order, so a
+    checkpoint is not resumed with different metadata.
+    """
+    serialized = json.dumps(
+        [dict(m) for m in metadatas], sort_keys=True, default=str
+    ).encode()
+    return hashlib.sha256(serialized).hexdigest()
+
+
+class Throughput:
+    """Logs the progress of a backfill at most every `interval` seconds."""
+
+    def __init__(self, total: int, skipped: int, interval: float = 5.0):
+        self._total = total
+        self._skipped = skipped
+        self._interval = interval
+        self._started = time.perf_counter()
+        self._logged = self._started
+
+    def update(self, done: int, force: bool = False) -> None:
+        now = time.perf_counter()
+        if not force and now - self._logged < self._interval:
+            return
+        self._logged = now
+        elapsed = now - self._started
+        run = done - self._skipped
+        rate = run / elapsed if elapsed > 0 else 0.0
+        LOGGER.info(f"Backfilled {done}/{self._total} windows ({rate:.1f} windows/s)")
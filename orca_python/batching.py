@@ -0,0 +1,228 @@
+"""
+Micro-batching of algorithm executions across DAG parts.
+
+Windows for many assets often arrive in separate `ExecutionRequest`s within
+milliseconds of each other. An algorithm registered with `batch=` is called
+once with the `ExecutionParams` of every execution collected within
+`max_wait` seconds, up to `max_size` of them, and returns a result per
+execution. Each result is routed back to the DAG part it came from, so a
+vectorized algorithm makes one call instead of hundreds.
+"""
+
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Callable, Optional
+from concurrent import futures
+from dataclasses import dataclass
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BatchPolicy:
+    """
+    Limits of an algorithm's batches.
+
+    Attributes:
+        max_size (int): The most executions in one call.
+        max_wait (float): Seconds the first execution of a batch waits for
+            others to join it.
+    """
+
+    max_size: int = 64
+    max_wait: float = 0.005
+
+    def __post_init__(self) -> None:
+        if self.max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if self.max_wait < 0:
+            raise ValueError("max_wait must not be negative")
+
+
+# submits a batch of params, returning a future of `(started, duration, results)`
+SubmitBatch = Callable[[List[Any]], futures.Future]
+# stops a submitted batch, given the executor's future
+StopBatch = Callable[[futures.Future], Any]
+
+
+class _Batch:
+    def __init__(self) -> None:
+        self.params: List[Any] = []
+        self.members: List[futures.Future] = []
+        # the executor's future, once submitted
+        self.future: Optional[futures.Future] = None
+        self.abandoned = 0
+
+
+class MicroBatcher:
+    """
+    Collects executions of one algorithm into batches.
+
+    A batch is submitted once it holds `max_size` executions, or `max_wait`
+    seconds after its first execution arrived, from a background thread. A
+    batch whose executions have all been abandoned is stopped.
+
+    Args:
+        name (str): The algorithm's `name_version`, for logging.
+        policy (BatchPolicy): The batch limits.
+        submit_batch (SubmitBatch): Runs a batch, resolving with the result of
+            `timed_call` on it.
+        stop_batch (StopBatch): Stops a running batch, e.g. by detaching its
+            thread or killing its worker process.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        policy: BatchPolicy,
+        submit_batch: SubmitBatch,
+        stop_batch: StopBatch,
+    ):
+        self._name = name
+        self._policy = policy
+        self._submit_batch = submit_batch
+        self._stop_batch = stop_batch
+        self._lock = threading.Condition()
+        self._open = _Batch()
+        self._opened_at = 0.0
+        # the batch of every execution not yet resolved
+        self._membership: Dict[futures.Future, _Batch] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._batches = 0
+
+    @property
+    def batches(self) -> int:
+        """The number of batches submitted."""
+        return self._batches
+
+    def submit(self, params: Any) -> futures.Future:
+        """
+        Adds an execution to the current batch.
+
+        Returns:
+            futures.Future: Resolves with `(started, duration, result)`, where
+            `started` and `duration` time the call of the whole batch.
+        """
+        future: futures.Future = futures.Future()
+        batch = None
+        with self._lock:
+            self._open.params.append(params)
+            self._open.members.append(future)
+            self._membership[future] = self._open
+            if len(self._open.members) >= self._policy.max_size:
+                batch = self._take()
+            elif len(self._open.members) == 1:
+                self._opened_at = time.monotonic()
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name=f"orca-batcher-{self._name}", daemon=True
+                    )
+                    self._thread.start()
+                self._lock.notify()
+        if batch is not None:
+            self._dispatch(batch)
+        return future
+
+    def abandon(self, future: futures.Future) -> None:
+        """
+        Gives up on an execution, e.g. once it has timed out.
+
+        An execution that is still collecting is removed from its batch. Once
+        every execution of a submitted batch has been abandoned, the batch is
+        stopped.
+        """
+        future.cancel()
+        with self._lock:
+            batch = self._membership.pop(future, None)
+            if batch is None:
+                return
+            if batch is self._open:
+                index = batch.members.index(future)
+                del batch.members[index], batch.params[index]
+                return
+            batch.abandoned += 1
+            # not yet submitted batches are stopped by `_dispatch`
+            batchFuture = batch.future if self._is_abandoned(batch) else None
+        if batchFuture is not None:
+            self._stop(batchFuture)
+
+    def _is_abandoned(self, batch: _Batch) -> bool:
+        return batch.abandoned == len(batch.members)
+
+    def _stop(self, batchFuture: futures.Future) -> None:
+        LOGGER.warning(f"Stopping abandoned batch of algorithm {self._name}")
+        self._stop_batch(batchFuture)
+
+    def _take(self) -> _Batch:
+        batch, self._open = self._open, _Batch()
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._open.members:
+                    self._lock.wait()
+                remaining = self._opened_at + self._policy.max_wait - time.monotonic()
+                if remaining > 0:
+                    # woken early when the batch fills up and is taken
+                    self._lock.wait(remaining)
+                    continue
+                batch = self._take()
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: _Batch) -> None:
+        LOGGER.debug(
+            f"Submitting batch of {len(batch.members)} for algorithm {self._name}"
+        )
+        with self._lock:
+            if self._is_abandoned(batch):
+                return
+        self._batches += 1
+        try:
+            batchFuture = self._submit_batch(batch.params)
+        except BaseException as e:
+            self._settle(batch, e)
+            return
+        with self._lock:
+            batch.future = batchFuture
+            abandoned = self._is_abandoned(batch)
+        batchFuture.add_done_callback(lambda f: self._resolve(batch, f))
+        if abandoned:
+            self._stop(batchFuture)
+
+    def _resolve(self, batch: _Batch, batchFuture: futures.Future) -> None:
+        if batchFuture.cancelled():
+            self._settle(batch, futures.CancelledError())
+            return
+        error = batchFuture.exception()
+        if error is not None:
+            self._settle(batch, error)
+            return
+
+        started, duration, results = batchFuture.result()
+        if not isinstance(results, (list, tuple)) or len(results) != len(batch.members):
+            self._settle(
+                batch,
+                TypeError(
+                    f"Batch algorithm {self._name} must return a list of "
+                    f"{len(batch.members)} results, got {type(results).__name__}"
+                ),
+            )
+            return
+        self._forget(batch)
+        for future, result in zip(batch.members, results):
+            if future.set_running_or_notify_cancel():
+                future.set_result((started, duration, result))
+
+    def _settle(self, batch: _Batch, error: BaseException) -> None:
+        """Fails every execution of a batch that has not been abandoned."""
+        self._forget(batch)
+        for future in batch.members:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(error)
+
+    def _forget(self, batch: _Batch) -> None:
+        with self._lock:
+            for future in batch.members:
+                self._membership.pop(future, None)
@@ -0,0 +1,382 @@
+"""
+Memoization of algorithm results.
+
+Orca-core re-sends the same algorithm for the same window on retries and
+backfills. Algorithms registered with `cache=` keep their encoded results in a
+`ResultCache`, keyed on everything that determines the result: the algorithm's
+`name_version`, the window (bounds, type, origin and metadata) and the results
+of its dependencies. A repeated execution is answered from the cache without
+calling the algorithm.
+
+When the processor has a `DiskResultStore`, results of cached algorithms are
+also kept on local disk, so that a restarted processor can answer re-sent work
+without running the algorithms again. The store's SQLite calls run on a
+thread of its own, so that a slow disk or a compaction does not stall the
+event loop serving requests.
+"""
+
+import time
+import struct
+import asyncio
+import hashlib
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Tuple, Union, Iterable, Optional
+from pathlib import Path
+from concurrent import futures
+from collections import OrderedDict
+from dataclasses import dataclass
+
+if TYPE_CHECKING:
+    import sqlite3
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    Limits of an algorithm's result cache.
+
+    Attributes:
+        max_entries (int): The most results kept. The least recently used result
+            is evicted first.
+        max_bytes (Optional[int]): The most encoded result bytes kept, if set.
+        ttl (Optional[float]): Seconds a result is kept for, if set.
+    """
+
+    max_entries: int = 1024
+    max_bytes: Optional[int] = None
+    ttl: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        if self.max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if self.max_bytes is not None and self.max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        if self.ttl is not None and self.ttl <= 0:
+            raise ValueError("ttl must be positive")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    A point in time snapshot of a result cache.
+
+    Attributes:
+        entries (int): Results currently cached.
+        size_bytes (int): Encoded size of the cached results.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that were not.
+        evictions (int): Results evicted for space or expiry.
+    """
+
+    entries: int
+    size_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+def result_cache_key(
+    full_name: str, window: bytes, dependencies: Iterable[Tuple[str, bytes]]
+) -> bytes:
+    """
+    Derives the cache key of an execution from its inputs.
+
+    Args:
+        full_name (str): The algorithm's `name_version`.
+        window (bytes): The deterministically serialized `pb.Window`.
+        dependencies (Iterable[Tuple[str, bytes]]): The `name_version` and
+            deterministically serialized `pb.Result` of each dependency.
+
+    Returns:
+        bytes: A SHA-256 digest of the inputs.
+    """
+    digest = hashlib.sha256()
+    # length prefixes keep the encoding unambiguous
+    for part in (full_name.encode(), window):
+        digest.update(struct.pack("<Q", len(part)))
+        digest.update(part)
+    for name, result in sorted(dependencies):
+        for part in (name.encode(), result):
+            digest.update(struct.pack("<Q", len(part)))
+            digest.update(part)
+    return digest.digest()
+
+
+class ResultCache:
+    """
+    A thread-safe LRU cache of encoded results, with optional expiry.
+
+    Args:
+        policy (CachePolicy): The cache's limits.
+    """
+
+    def __init__(self, policy: Optional[CachePolicy] = None):
+        self._policy = CachePolicy() if policy is None else policy
+        self._lock = threading.Lock()
+        # key -> (expires at, size, result)
+        self._entries: "OrderedDict[bytes, Tuple[float, int, Any]]" = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def policy(self) -> CachePolicy:
+        return self._policy
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: bytes) -> Optional[Any]:
+        """Returns the cached result for `key`, or `None`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                self._remove(key)
+                self._evictions += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[2]
+
+    def put(self, key: bytes, result: Any, size: int) -> None:
+        """
+        Caches a result, evicting the least recently used results as needed.
+
+        Args:
+            key (bytes): The execution's cache key.
+            result: The encoded `pb.Result`. It must not be modified afterwards.
+            size (int): The encoded size of the result, in bytes.
+        """
+        policy = self._policy
+        if policy.max_bytes is not None and size > policy.max_bytes:
+            return
+        expiresAt = (
+            float("inf") if policy.ttl is None else time.monotonic() + policy.ttl
+        )
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expiresAt, size, result)
+            self._size += size
+            while len(self._entries) > policy.max_entries or (
+                policy.max_bytes is not None and self._size > policy.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> CacheStats:
+        """Returns a snapshot of the cache's counters."""
+        with self._lock:
+            return CacheStats(
+                entries=len(self._entries),
+                size_bytes=self._size,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+            )
+
+    def _remove(self, key: bytes) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+
+class DiskResultStore:
+    """
+    A result cache in a local SQLite database, which survives restarts.
+
+    The database is checked for corruption when it is opened. A corrupt database
+    is moved aside and replaced by an empty one, since it only holds results
+    that can be computed again. Once the stored results exceed `max_bytes`, the
+    least recently read are deleted until they take up 90% of it.
+
+    `get_async` and `put_async` run on a single thread owned by the store, in
+    the order they are called, so a result written back is visible to every
+    later read.
+
+    Args:
+        path (str | Path): The database file. Its directory is created if needed.
+        max_bytes (int): The most result bytes kept (default: 1 GiB).
+    """
+
+    def __init__(self, path: Union[str, Path], max_bytes: int = 1 << 30):
+        # imported here, so the SDK does not load SQLite unless a store is used
+        import sqlite3
+
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+        self._path = Path(path)
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._io = futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="orca-result-store"
+        )
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self._conn = self._open()
+        except sqlite3.DatabaseError as e:
+            corrupt = self._path.with_name(
+                f"{self._path.name}.corrupt-{int(time.time())}"
+            )
+            LOGGER.error(
+                f"Result store {self._path} is corrupt ({e}), moving it to {corrupt}"
+            )
+            self._path.rename(corrupt)
+            for suffix in ("-wal", "-shm"):
+                Path(f"{self._path}{suffix}").unlink(missing_ok=True)
+            self._conn = self._open()
+
+        (self._size,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()
+        LOGGER.info(f"Opened result store {self._path} holding {self._size} bytes")
+
+    def _open(self) -> "sqlite3.Connection":
+        import sqlite3
+
+        conn = sqlite3.connect(
+            self._path, check_same_thread=False, isolation_level=None
+        )
+        try:
+            (status,) = conn.execute("PRAGMA quick_check").fetchone()
+            if status != "ok":
+                raise sqlite3.DatabaseError(status)
+            # incremental vacuuming lets compaction shrink the file; it only
+            # takes effect on a new database
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key BLOB PRIMARY KEY, algorithm TEXT NOT NULL, value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS results_accessed_at "
+                "ON results (accessed_at)"
+            )
+        except sqlite3.DatabaseError:
+            conn.close()
+            raise
+        return conn
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        """Returns the stored result for `key`, or `None`."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE results SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._hits += 1
+            return row[0]
+
+    async def get_async(self, key: bytes) -> Optional[bytes]:
+        """Returns the stored result for `key`, or `None`, off the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io, self.get, key)
+
+    def put_async(self, key: bytes, algorithm: str, value: bytes) -> futures.Future:
+        """
+        Stores a result on the store's thread without waiting for it.
+
+        Returns:
+            futures.Future: Resolves once the result is stored. Errors are
+            logged rather than raised.
+        """
+        return self._io.submit(self._write_back, key, algorithm, value)
+
+    def _write_back(self, key: bytes, algorithm: str, value: bytes) -> None:
+        import sqlite3
+
+        try:
+            self.put(key, algorithm, value)
+        except sqlite3.Error as e:
+            LOGGER.error(f"Failed to store result of {algorithm} in {self._path}: {e}")
+
+    def flush(self) -> None:
+        """Waits for the results written back so far to be stored."""
+        self._io.submit(lambda: None).result()
+
+    def put(self, key: bytes, algorithm: str, value: bytes) -> None:
+        """
+        Stores a result, deleting the least recently read results if the store
+        grows beyond `max_bytes`.
+
+        Args:
+            key (bytes): The execution's cache key.
+            algorithm (str): The algorithm's `name_version`.
+            value (bytes): The serialized `pb.Result`.
+        """
+        size = len(value)
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            previous = self._conn.execute(
+                "SELECT size FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (key, algorithm, value, size, time.time()),
+            )
+            self._size += size - (previous[0] if previous else 0)
+            if self._size > self._max_bytes:
+                self._compact(int(self._max_bytes * 0.9))
+
+    def _compact(self, target: int) -> None:
+        LOGGER.info(f"Compacting result store {self._path} to {target} bytes")
+        rows = self._conn.execute(
+            "SELECT key, size FROM results ORDER BY accessed_at"
+        ).fetchall()
+        evict = []
+        for key, size in rows:
+            if self._size <= target:
+                break
+            evict.append((key,))
+            self._size -= size
+        self._conn.execute("BEGIN")
+        self._conn.executemany("DELETE FROM results WHERE key = ?", evict)
+        self._conn.execute("COMMIT")
+        self._conn.execute("PRAGMA incremental_vacuum")
+        self._evictions += len(evict)
+
+    def stats(self) -> CacheStats:
+        """Returns a snapshot of the store's counters."""
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()
+            return CacheStats(
+                entries=entries,
+                size_bytes=self._size,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+            )
+
+    def close(self) -> None:
+        """Stores the results written back so far and closes the database."""
+        self._io.shutdown(wait=True)
+        with self._lock:
+            self._conn.close()
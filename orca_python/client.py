@@ -0,0 +1,237 @@
+"""
+Long-lived gRPC connection to Orca-core.
+
+Opening a channel per call means a TCP connection, and in production a TLS
+handshake, for every window emitted. `OrcaCoreClient` opens one channel on first
+use and keeps it for the life of the process. gRPC re-establishes the underlying
+connection whenever it drops, and keepalive pings stop idle connections from
+being silently closed by load balancers.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, List, Tuple, Optional
+
+import grpc
+import service_pb2 as pb
+import service_pb2_grpc
+
+from orca_python import envs
+
+LOGGER = logging.getLogger(__name__)
+
+CHANNEL_OPTIONS: List[Tuple[str, Any]] = [
+    ("grpc.keepalive_time_ms", 30_000),
+    ("grpc.keepalive_timeout_ms", 10_000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.initial_reconnect_backoff_ms", 500),
+    ("grpc.max_reconnect_backoff_ms", 10_000),
+    ("grpc.max_send_message_length", 50 * 1024 * 1024),  # 50MB
+    ("grpc.max_receive_message_length", 50 * 1024 * 1024),  # 50MB
+]
+
+
+class OrcaCoreClient:
+    """
+    A reusable connection to the Orca-core service.
+
+    The channel is created on first use and shared by all threads.
+
+    Args:
+        address (Optional[str]): Orca-core address. Defaults to `ORCA_CORE`.
+        secure (Optional[bool]): Connect with TLS. Defaults to true in production.
+        options (Optional[List[Tuple[str, Any]]]): Extra gRPC channel options.
+        timeout (Optional[float]): Default deadline of each call, in seconds.
+        wait_for_ready (bool): Make calls issued while the connection is down wait
+            for it to come back (up to their deadline) instead of failing.
+    """
+
+    def __init__(
+        self,
+        address: Optional[str] = None,
+        secure: Optional[bool] = None,
+        options: Optional[List[Tuple[str, Any]]] = None,
+        timeout: Optional[float] = None,
+        wait_for_ready: bool = False,
+    ):
+        self._address = envs.ORCA_CORE if address is None else address
+        self._secure = envs.is_production if secure is None else secure
+        self._options = CHANNEL_OPTIONS + list(options or [])
+        self._timeout = timeout
+        self._wait_for_ready = wait_for_ready
+        self._lock = threading.Lock()
+        self._channel: Optional[grpc.Channel] = None
+        self._stub: Optional[service_pb2_grpc.OrcaCoreStub] = None
+        self._aio_channel: Optional[grpc.aio.Channel] = None
+        self._aio_stub: Optional[service_pb2_grpc.OrcaCoreStub] = None
+        self._aio_loop: Optional[asyncio.AbstractEventLoop] = None
+        # async channels of loops that are no longer used, still to be closed
+        self._stale_aio_channels: List[grpc.aio.Channel] = []
+
+    @property
+    def address(self) -> str:
+        return self._address
+
+    @property
+    def stub(self) -> service_pb2_grpc.OrcaCoreStub:
+        """The `OrcaCore` stub, connecting on first use."""
+        stub = self._stub
+        if stub is None:
+            with self._lock:
+                if self._stub is None:
+                    self._channel = self._create_channel()
+                    self._stub = service_pb2_grpc.OrcaCoreStub(self._channel)
+                stub = self._stub
+        return stub
+
+    @property
+    def aio_stub(self) -> service_pb2_grpc.OrcaCoreStub:
+        """
+        The `OrcaCore` stub for `grpc.aio`, bound to the running event loop.
+
+        The async channel is replaced when a different loop uses it, e.g. on
+        every `asyncio.run`, which costs a new connection. Keep one loop running
+        to reuse it.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            # grpc.aio channels can only be used from the loop that created them
+            if self._aio_stub is None or self._aio_loop is not loop:
+                if self._aio_channel is not None:
+                    self._stale_aio_channels.append(self._aio_channel)
+                LOGGER.info(f"Opening async channel to Orca Core at {self._address}")
+                if self._secure:
+                    self._aio_channel = grpc.aio.secure_channel(
+                        self._address,
+                        grpc.ssl_channel_credentials(),
+                        options=self._options,
+                    )
+                else:
+                    self._aio_channel = grpc.aio.insecure_channel(
+                        self._address, options=self._options
+                    )
+                self._aio_stub = service_pb2_grpc.OrcaCoreStub(self._aio_channel)
+                self._aio_loop = loop
+            return self._aio_stub
+
+    def _create_channel(self) -> grpc.Channel:
+        LOGGER.info(f"Opening channel to Orca Core at {self._address}")
+        if self._secure:
+            # secure channel with TLS
+            return grpc.secure_channel(
+                self._address, grpc.ssl_channel_credentials(), options=self._options
+            )
+        # insecure channel for local development
+        return grpc.insecure_channel(self._address, options=self._options)
+
+    def EmitWindow(
+        self, window: pb.Window, timeout: Optional[float] = None
+    ) -> pb.WindowEmitStatus:
+        """
+        Emits a window to Orca-core.
+
+        Raises:
+            grpc.RpcError: If the emit fails.
+        """
+        return self.stub.EmitWindow(
+            window,
+            timeout=timeout or self._timeout,
+            wait_for_ready=self._wait_for_ready,
+        )
+
+    def EmitWindowFuture(
+        self, window: pb.Window, timeout: Optional[float] = None
+    ) -> grpc.Future:
+        """
+        Emits a window to Orca-core without waiting for the response.
+
+        Returns:
+            grpc.Future: Resolves with the `WindowEmitStatus`.
+        """
+        return self.stub.EmitWindow.future(
+            window,
+            timeout=timeout or self._timeout,
+            wait_for_ready=self._wait_for_ready,
+        )
+
+    async def EmitWindowAsync(
+        self, window: pb.Window, timeout: Optional[float] = None
+    ) -> pb.WindowEmitStatus:
+        """
+        Emits a window to Orca-core from an event loop.
+
+        Raises:
+            grpc.RpcError: If the emit fails.
+        """
+        stub = self.aio_stub
+        await self._close_stale_aio_channels()
+        return await stub.EmitWindow(
+            window,
+            timeout=timeout or self._timeout,
+            wait_for_ready=self._wait_for_ready,
+        )
+
+    async def _close_stale_aio_channels(self) -> None:
+        with self._lock:
+            stale, self._stale_aio_channels = self._stale_aio_channels, []
+        for channel in stale:
+            await channel.close()
+
+    def RegisterProcessor(
+        self, registration: pb.ProcessorRegistration, timeout: Optional[float] = None
+    ) -> pb.Status:
+        """
+        Registers a processor and its algorithms with Orca-core.
+
+        Raises:
+            grpc.RpcError: If the registration fails.
+        """
+        return self.stub.RegisterProcessor(
+            registration,
+            timeout=timeout or self._timeout,
+            wait_for_ready=self._wait_for_ready,
+        )
+
+    def close(self) -> None:
+        """
+        Closes the channel. The next call opens a new one. Use `aclose` to also
+        close the async channel.
+        """
+        with self._lock:
+            if self._channel is not None:
+                self._channel.close()
+            self._channel = None
+            self._stub = None
+
+    async def aclose(self) -> None:
+        """Closes both the channel and the async channel."""
+        self.close()
+        with self._lock:
+            if self._aio_channel is not None:
+                self._stale_aio_channels.append(self._aio_channel)
+            self._aio_channel = None
+            self._aio_stub = None
+            self._aio_loop = None
+        await self._close_stale_aio_channels()
+
+    def __enter__(self) -> "OrcaCoreClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+_default_client: Optional[OrcaCoreClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> OrcaCoreClient:
+    """Returns the process wide client, created on first use."""
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = OrcaCoreClient()
+    return _default_client
@@ -0,0 +1,131 @@
+"""
+The local dependency graph of a processor's algorithms.
+
+Algorithms registered with `depends_on` on the same processor form a graph
+keyed by `name_version`. Orca-core schedules a DAG part per dependency, so
+every hop between two algorithms of one processor is a round trip through
+Orca-core. A processor serving with `local_dag=True` instead runs the local
+dependencies a DAG part is missing itself, in topological order, passing their
+results to the algorithms that need them as Python objects.
+"""
+
+from typing import Dict, List, Union, Mapping, Iterable, Optional, Sequence, Collection
+
+# `name_version` -> `name_version` of each local dependency
+Graph = Mapping[str, Collection[str]]
+
+
+def find_cycle(graph: Graph, start: str) -> Optional[List[str]]:
+    """
+    Finds a dependency path from `start` back to itself.
+
+    Args:
+        graph (Graph): The dependencies of each algorithm.
+        start (str): The algorithm to start from.
+
+    Returns:
+        Optional[List[str]]: The algorithms on the cycle, starting and ending
+        with `start`, or `None` if there is none.
+    """
+    # iterative depth first search, so deep graphs do not hit the recursion limit
+    path = [start]
+    branches = [iter(graph.get(start, ()))]
+    visited = {start}
+    while branches:
+        dependency = next(branches[-1], None)
+        if dependency is None:
+            branches.pop()
+            path.pop()
+            continue
+        if dependency == start:
+            return path + [start]
+        if dependency in visited:
+            continue
+        visited.add(dependency)
+        path.append(dependency)
+        branches.append(iter(graph.get(dependency, ())))
+    return None
+
+
+def topological_order(graph: Graph) -> List[str]:
+    """
+    Orders algorithms so that each comes after all of its dependencies.
+
+    Algorithms without dependencies between them keep the order of `graph`.
+
+    Args:
+        graph (Graph): The dependencies of each algorithm.
+
+    Returns:
+        List[str]: Every algorithm of the graph, dependencies first.
+
+    Raises:
+        ValueError: If the graph has a cycle.
+    """
+    remaining: Dict[str, int] = {}
+    dependants: Dict[str, List[str]] = {}
+    for name, dependencies in graph.items():
+        remaining.setdefault(name, 0)
+        for dependency in dependencies:
+            remaining[name] += 1
+            remaining.setdefault(dependency, 0)
+            dependants.setdefault(dependency, []).append(name)
+
+    order = [name for name, count in remaining.items() if count == 0]
+    for name in order:
+        for dependant in dependants.get(name, ()):
+            remaining[dependant] -= 1
+            if remaining[dependant] == 0:
+                order.append(dependant)
+    if len(order) != len(remaining):
+        # some of the algorithms left only depend on a cycle
+        for name, count in remaining.items():
+            cycle = find_cycle(graph, name) if count else None
+            if cycle is not None:
+                raise ValueError(f"Dependency graph has a cycle: {' -> '.join(cycle)}")
+    return order
+
+
+def local_plan(
+    graph: Graph,
+    order: Union[Sequence[str], Mapping[str, int]],
+    requested: Iterable[str],
+    known: Collection[str],
+) -> List[str]:
+    """
+    Selects the algorithms to run locally for a DAG part.
+
+    Args:
+        graph (Graph): The dependencies of each algorithm.
+        order (Union[Sequence[str], Mapping[str, int]]): The graph's
+            topological order, or the position of each algorithm in it, so
+            that planning does not visit every algorithm of the graph.
+        requested (Iterable[str]): The algorithms of the DAG part.
+        known (Collection[str]): The dependency results sent with it.
+
+    Returns:
+        List[str]: The requested algorithms and every local dependency they
+        need that was not sent, transitively, dependencies first. Requested
+        algorithms missing from the graph come last.
+    """
+    needed = set()
+    pending = list(requested)
+    while pending:
+        name = pending.pop()
+        if name in needed:
+            continue
+        needed.add(name)
+        pending.extend(
+            dependency
+            for dependency in graph.get(name, ())
+            if dependency not in known and dependency not in needed
+        )
+    positions = (
+        order
+        if isinstance(order, Mapping)
+        else {name: position for position, name in enumerate(order)}
+    )
+    plan = sorted((name for name in needed if name in positions), key=positions.get)
+    if len(plan) != len(needed):
+        plan.extend(sorted(name for name in needed if name not in positions))
+    return plan
@@ -0,0 +1,262 @@
+"""
+Fast conversions between algorithm results and their protobuf form.
+
+`FloatArray.values` is a packed repeated float field, so its wire format is the
+raw little-endian float32 payload behind a short header. Arrays are encoded and
+decoded through that wire format in bulk, rather than element by element.
+
+`Struct` values are converted by a direct recursive walk instead of going
+through `json_format`, which dispatches on field descriptors for every value.
+The walk also accepts NumPy scalars and arrays and datetimes, which
+`json_format` rejects.
+
+NumPy is optional. It is only used when the algorithm has already imported it,
+or when it is installed and float dependency values are read.
+"""
+
+import sys
+import array
+import datetime as dt
+import importlib
+from typing import Any, Dict, List, Union, Mapping, Optional
+
+import google.protobuf.struct_pb2 as struct_pb2
+
+# field 1 (`values`), wire type 2 (length delimited)
+_FLOAT_ARRAY_TAG = 0x0A
+
+_NUMPY_UNSET: Any = object()
+_numpy_module: Any = _NUMPY_UNSET
+
+
+def _numpy() -> Any:
+    """Returns the numpy module, or `None` if it is not installed."""
+    global _numpy_module
+    if _numpy_module is _NUMPY_UNSET:
+        try:
+            _numpy_module = importlib.import_module("numpy")
+        except ImportError:
+            _numpy_module = None
+    return _numpy_module
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        bits = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(bits | 0x80)
+        else:
+            out.append(bits)
+            return bytes(out)
+
+
+def _float32_bytes(values: Any) -> Optional[bytes]:
+    """
+    Returns `values` as little-endian float32 bytes if it is a NumPy array or
+    supports the buffer protocol, otherwise `None`.
+    """
+    # an ndarray can only exist if numpy has been imported already
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(values, (np.ndarray, np.generic)):
+        return np.ascontiguousarray(values, dtype="<f4").reshape(-1).tobytes()
+
+    if isinstance(values, (str, bytes, bytearray)):
+        return None
+    try:
+        view = memoryview(values)
+    except TypeError:
+        return None
+
+    if view.format == "f" and sys.byteorder == "little":
+        return view.tobytes()
+    if view.ndim != 1 or not view.c_contiguous:
+        view = memoryview(view.tobytes()).cast(view.format)
+    floats = array.array("f", view)
+    if sys.byteorder == "big":
+        floats.byteswap()
+    return floats.tobytes()
+
+
+def encode_float_array(target: Any, values: Any) -> None:
+    """
+    Fills a `FloatArray` message with `values`.
+
+    NumPy arrays and buffer protocol objects (e.g. `array.array`, `memoryview`)
+    are copied in bulk as float32. Any other iterable of numbers is extended
+    into the repeated field.
+
+    Args:
+        target: The `FloatArray` message to fill.
+        values: The array result.
+
+    Raises:
+        TypeError: If `values` is not an array or an iterable of numbers.
+    """
+    payload = _float32_bytes(values)
+    if payload is None:
+        if isinstance(values, (str, bytes, bytearray, dict)):
+            raise TypeError(f"Cannot encode {type(values).__name__} as an array")
+        target.values.extend(values)
+        return
+
+    if payload:
+        target.MergeFromString(
+            bytes((_FLOAT_ARRAY_TAG,)) + _varint(len(payload)) + payload
+        )
+    else:
+        # still mark an empty array as set, e.g. within a oneof
+        target.SetInParent()
+
+
+def decode_float_array(float_array: Any) -> Union[Any, memoryview]:
+    """
+    Decodes a `FloatArray` message without building a list of Python floats.
+
+    Returns:
+        A read-only float32 NumPy array if NumPy is installed, otherwise a
+        float32 `memoryview`.
+    """
+    data = float_array.SerializeToString()
+
+    # a packed field is a single tag, the payload length and the payload
+    offset = 0
+    length = 0
+    if data:
+        if data[0] != _FLOAT_ARRAY_TAG:
+            return _decode_fallback(float_array)
+        offset, shift = 1, 0
+        while True:
+            byte = data[offset]
+            length |= (byte & 0x7F) << shift
+            offset += 1
+            shift += 7
+            if not byte & 0x80:
+                break
+        if offset + length != len(data):
+            return _decode_fallback(float_array)
+
+    payload = memoryview(data)[offset : offset + length]
+    np = _numpy()
+    if np is not None:
+        return np.frombuffer(payload, dtype="<f4")
+    if sys.byteorder == "big":
+        return _decode_fallback(float_array)
+    return payload.cast("f")
+
+
+def _decode_fallback(float_array: Any) -> Union[Any, memoryview]:
+    np = _numpy()
+    if np is not None:
+        values = np.array(float_array.values, dtype="<f4")
+        values.flags.writeable = False
+        return values
+    return memoryview(array.array("f", float_array.values)).toreadonly()
+
+
+def encode_struct(target: struct_pb2.Struct, value: Mapping[str, Any]) -> None:
+    """
+    Fills a `Struct` message from a mapping.
+
+    Supports `None`, booleans, numbers, strings, mappings, lists and tuples, as
+    well as NumPy scalars and arrays (as numbers and lists) and datetimes and
+    dates (as ISO 8601 strings). Non-string keys are converted with `str`.
+
+    Args:
+        target: The `Struct` message to fill.
+        value: The mapping to encode.
+
+    Raises:
+        TypeError: If a value cannot be represented in a `Struct`.
+    """
+    if not value:
+        # make sure an empty struct is still set, e.g. within a `Value`
+        target.SetInParent()
+    fields = target.fields
+    for key, item in value.items():
+        if type(key) is not str:
+            key = str(key)
+        _encode_value(fields[key], item)
+
+
+def _encode_value(target: struct_pb2.Value, value: Any) -> None:
+    # exact type checks first, as they cover nearly all values
+    kind = type(value)
+    if kind is float or kind is int:
+        target.number_value = value
+    elif kind is str:
+        target.string_value = value
+    elif kind is bool:
+        target.bool_value = value
+    elif value is None:
+        target.null_value = struct_pb2.NULL_VALUE
+    elif kind is dict:
+        encode_struct(target.struct_value, value)
+    elif kind is list or kind is tuple:
+        _encode_list(target.list_value, value)
+    else:
+        _encode_other(target, value)
+
+
+def _encode_list(target: struct_pb2.ListValue, values: Any) -> None:
+    # make sure an empty list is still set
+    target.SetInParent()
+    add = target.values.add
+    for item in values:
+        _encode_value(add(), item)
+
+
+def _encode_other(target: struct_pb2.Value, value: Any) -> None:
+    np = sys.modules.get("numpy")
+    if np is not None:
+        if isinstance(value, np.ndarray):
+            _encode_list(target.list_value, value.tolist())
+            return
+        if isinstance(value, np.generic):
+            _encode_value(target, value.item())
+            return
+
+    if isinstance(value, bool):
+        target.bool_value = value
+    elif isinstance(value, (int, float)):
+        target.number_value = value
+    elif isinstance(value, str):
+        target.string_value = value
+    elif isinstance(value, (dt.datetime, dt.date, dt.time)):
+        target.string_value = value.isoformat()
+    elif isinstance(value, Mapping):
+        encode_struct(target.struct_value, value)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        _encode_list(target.list_value, value)
+    else:
+        raise TypeError(f"Cannot encode value of type {type(value).__name__}")
+
+
+def decode_struct(struct: struct_pb2.Struct) -> Dict[str, Any]:
+    """
+    Converts a `Struct` message into a dictionary.
+
+    Numbers are returned as floats, matching `json_format.MessageToDict`.
+    """
+    return {key: decode_value(value) for key, value in struct.fields.items()}
+
+
+def decode_value(value: struct_pb2.Value) -> Any:
+    """Converts a `Value` message into the equivalent Python object."""
+    kind = value.WhichOneof("kind")
+    if kind == "number_value":
+        return value.number_value
+    elif kind == "string_value":
+        return value.string_value
+    elif kind == "struct_value":
+        return decode_struct(value.struct_value)
+    elif kind == "list_value":
+        return _decode_list(value.list_value)
+    elif kind == "bool_value":
+        return value.bool_value
+    return None
+
+
+def _decode_list(values: struct_pb2.ListValue) -> List[Any]:
+    return [decode_value(value) for value in values.values]
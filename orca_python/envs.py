@@ -1,9 +1,8 @@
 import os
 import re
-import json
-from typing import Tuple, Optional
+import threading
+from typing import Any, Dict, Tuple, Optional
 from logging import getLogger
-from pathlib import Path
 from dataclasses import dataclass
 
 from orca_python.exceptions import BadEnvVar, BadConfigFile, MissingEnvVar
@@ -45,23 +44,47 @@ class ConfigData:
     orcaConnectionString: str
     processorPort: int
     processorConnectionString: str
+    executorMaxWorkers: Optional[int] = None
+    executorThreadNamePrefix: Optional[str] = None
+    executorMaxQueueSize: Optional[int] = None
+    executorOverloadThreshold: Optional[int] = None
+    admissionMaxPending: Optional[int] = None
 
 
-def parseConfigFile() -> Tuple[bool, str, str, str, int, int]:
-    currentDir = Path.cwd()
-    configFile = currentDir / "orca.json"
-    hasConfig = False
+def _loadConfigFile() -> Optional[ConfigData]:
+    """
+    Load `orca.json` from the current working directory, if present.
+    """
+    # imported here, as settings are only resolved on first use
+    import json
 
-    if configFile.exists():
-        hasConfig = True
-        try:
-            with open(configFile, "r") as f:
-                configData = ConfigData(**json.load(f))
-        except Exception as e:
-            LOGGER.error(f"Could not parse config file: {e}")
-            raise BadConfigFile(f"Could not parse config file: {e}")
-    else:
+    configFile = os.path.join(os.getcwd(), "orca.json")
+    if not os.path.exists(configFile):
+        return None
+
+    try:
+        with open(configFile, "r") as f:
+            return ConfigData(**json.load(f))
+    except Exception as e:
+        LOGGER.error(f"Could not parse config file: {e}")
+        raise BadConfigFile(f"Could not parse config file: {e}")
+
+
+def parseConfigFile(
+    configData: Optional[ConfigData] = None,
+) -> Tuple[bool, str, str, str, int, int]:
+    """
+    Parse the Orca-core and processor settings from `orca.json`.
+
+    Args:
+        configData (Optional[ConfigData]): The parsed config file. Loaded from
+            the current working directory if not given.
+    """
+    if configData is None:
+        configData = _loadConfigFile()
+    if configData is None:
         return (False, "", "", "", 0, 0)
+    hasConfig = True
 
     res = _parse_connection_string(configData.processorConnectionString)
     if res is None:
@@ -80,6 +103,40 @@ def parseConfigFile() -> Tuple[bool, str, str, str, int, int]:
     )
 
 
+def parseExecutorConfig(
+    configData: Optional[ConfigData] = None,
+) -> Tuple[Optional[int], Optional[str], Optional[int], Optional[int], Optional[int]]:
+    """
+    Parse the optional algorithm executor and admission settings from `orca.json`.
+
+    Args:
+        configData (Optional[ConfigData]): The parsed config file. Loaded from
+            the current working directory if not given.
+    """
+    if configData is None:
+        configData = _loadConfigFile()
+    if configData is None:
+        return (None, None, None, None, None)
+
+    for key in (
+        "executorMaxWorkers",
+        "executorMaxQueueSize",
+        "executorOverloadThreshold",
+        "admissionMaxPending",
+    ):
+        value = getattr(configData, key)
+        if value is not None and (not isinstance(value, int) or value < 0):
+            raise BadConfigFile(f"{key} must be a non-negative integer")
+
+    return (
+        configData.executorMaxWorkers,
+        configData.executorThreadNamePrefix,
+        configData.executorMaxQueueSize,
+        configData.executorOverloadThreshold,
+        configData.admissionMaxPending,
+    )
+
+
 def getenvs(strict: bool = False) -> Tuple[bool, str, str, int | None, int | None]:
     orca_core = os.getenv("ORCA_CORE", "")
     if strict and orca_core == "":
@@ -125,52 +182,126 @@ def getenvs(strict: bool = False) -> Tuple[bool, str, str, int | None, int | Non
     )
 
 
-# config file takes priority. Env vars can overwrite. And if config file not
-# present, all the env vars have to be there.
-(
-    hasConfig,
-    PROJECT_NAME,
-    ORCA_CORE,
-    PROCESSOR_HOST,
-    PROCESSOR_PORT,
-    PROCESSOR_EXTERNAL_PORT,
-) = parseConfigFile()
-
-if PROJECT_NAME == "":
-    LOGGER.warning(
-        "Project name could not be found in `orca.json` (or the config is not present). When generating stubs with `orca sync` this may cause algorithm definitions that are present in this repository to be duplicated locally.\nRun `orca init` to generate a `orca.json` config file to avoid this."
-    )
-if hasConfig:
+def _resolve() -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Resolves the settings from `orca.json` and the environment.
+
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, str]]: The settings, and the required
+        environment variable each missing setting is read from.
+    """
+    configData = _loadConfigFile()
+    settings: Dict[str, Any] = {}
+    missing: Dict[str, str] = {}
     (
-        is_production,
-        _ORCA_CORE,
-        _PROCESSOR_HOST,
-        _PROCESSOR_PORT,
-        _PROCESSOR_EXTERNAL_PORT,
-    ) = getenvs()
-    if _ORCA_CORE != "":
-        ORCA_CORE = ORCA_CORE
-    if _PROCESSOR_HOST != "":
-        PROCESSOR_HOST = _PROCESSOR_HOST
-    if _PROCESSOR_PORT is not None:
-        PROCESSOR_PORT = _PROCESSOR_PORT
-    if _PROCESSOR_EXTERNAL_PORT is not None:
-        PROCESSOR_EXTERNAL_PORT = _PROCESSOR_EXTERNAL_PORT
-else:
+        settings["EXECUTOR_MAX_WORKERS"],
+        settings["EXECUTOR_THREAD_NAME_PREFIX"],
+        settings["EXECUTOR_MAX_QUEUE_SIZE"],
+        settings["EXECUTOR_OVERLOAD_THRESHOLD"],
+        settings["ADMISSION_MAX_PENDING"],
+    ) = parseExecutorConfig(configData)
+
+    # config file takes priority. Env vars can overwrite. And if config file not
+    # present, all the env vars have to be there.
     (
-        is_production,
+        hasConfig,
+        PROJECT_NAME,
         ORCA_CORE,
         PROCESSOR_HOST,
-        _PROCESSOR_PORT,
-        _PROCESSOR_EXTERNAL_PORT,
-    ) = getenvs(strict=True)
+        PROCESSOR_PORT,
+        PROCESSOR_EXTERNAL_PORT,
+    ) = parseConfigFile(configData)
 
-    if _PROCESSOR_PORT is None:
-        MissingEnvVar("PROCESSOR_PORT required")
+    if PROJECT_NAME == "":
+        LOGGER.warning(
+            "Project name could not be found in `orca.json` (or the config is not present). When generating stubs with `orca sync` this may cause algorithm definitions that are present in this repository to be duplicated locally.\nRun `orca init` to generate a `orca.json` config file to avoid this."
+        )
+    if hasConfig:
+        (
+            is_production,
+            _ORCA_CORE,
+            _PROCESSOR_HOST,
+            _PROCESSOR_PORT,
+            _PROCESSOR_EXTERNAL_PORT,
+        ) = getenvs()
+        if _ORCA_CORE != "":
+            ORCA_CORE = _ORCA_CORE
+        if _PROCESSOR_HOST != "":
+            PROCESSOR_HOST = _PROCESSOR_HOST
+        if _PROCESSOR_PORT is not None:
+            PROCESSOR_PORT = _PROCESSOR_PORT
+        if _PROCESSOR_EXTERNAL_PORT is not None:
+            PROCESSOR_EXTERNAL_PORT = _PROCESSOR_EXTERNAL_PORT
     else:
-        PROCESSOR_PORT = _PROCESSOR_PORT
+        # a window emitter needs only ORCA_CORE and a processor only
+        # PROCESSOR_ADDRESS, so each is required when its settings are used
+        if os.getenv("ORCA_CORE", "") == "":
+            missing["ORCA_CORE"] = "ORCA_CORE"
+        if os.getenv("PROCESSOR_ADDRESS", "") == "":
+            for name in ("PROCESSOR_HOST", "PROCESSOR_PORT", "PROCESSOR_EXTERNAL_PORT"):
+                missing[name] = "PROCESSOR_ADDRESS"
+        (
+            is_production,
+            ORCA_CORE,
+            PROCESSOR_HOST,
+            _PROCESSOR_PORT,
+            _PROCESSOR_EXTERNAL_PORT,
+        ) = getenvs(strict=not missing)
 
-    if _PROCESSOR_EXTERNAL_PORT is None:
-        MissingEnvVar("PROCESSOR_EXTERNAL_PORT required")
-    else:
-        PROCESSOR_EXTERNAL_PORT = _PROCESSOR_EXTERNAL_PORT
+        if _PROCESSOR_PORT is not None:
+            PROCESSOR_PORT = _PROCESSOR_PORT
+        if _PROCESSOR_EXTERNAL_PORT is not None:
+            PROCESSOR_EXTERNAL_PORT = _PROCESSOR_EXTERNAL_PORT
+
+    settings.update(
+        hasConfig=hasConfig,
+        PROJECT_NAME=PROJECT_NAME,
+        ORCA_CORE=ORCA_CORE,
+        PROCESSOR_HOST=PROCESSOR_HOST,
+        PROCESSOR_PORT=PROCESSOR_PORT,
+        PROCESSOR_EXTERNAL_PORT=PROCESSOR_EXTERNAL_PORT,
+        is_production=is_production,
+    )
+    return settings, missing
+
+
+_SETTINGS = frozenset(
+    (
+        "hasConfig",
+        "is_production",
+        "PROJECT_NAME",
+        "ORCA_CORE",
+        "PROCESSOR_HOST",
+        "PROCESSOR_PORT",
+        "PROCESSOR_EXTERNAL_PORT",
+        "EXECUTOR_MAX_WORKERS",
+        "EXECUTOR_THREAD_NAME_PREFIX",
+        "EXECUTOR_MAX_QUEUE_SIZE",
+        "EXECUTOR_OVERLOAD_THRESHOLD",
+        "ADMISSION_MAX_PENDING",
+    )
+)
+_lock = threading.Lock()
+_resolved: Optional[Tuple[Dict[str, Any], Dict[str, str]]] = None
+
+
+def _reset() -> None:
+    """Forgets the resolved settings, so they are resolved again on next use."""
+    global _resolved
+    with _lock:
+        _resolved = None
+
+
+def __getattr__(name: str) -> Any:
+    # settings are resolved on first use rather than on import, so importing
+    # the SDK neither reads `orca.json` nor requires the environment
+    global _resolved
+    if name not in _SETTINGS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    with _lock:
+        if _resolved is None:
+            _resolved = _resolve()
+        settings, missing = _resolved
+    if name in missing:
+        raise MissingEnvVar(f"{missing[name]} is required")
+    return settings[name]
@@ -36,3 +36,27 @@ class BadConfigFile(BaseOrcaException):
 
 class BrokenRemoteAlgorithmStubs(BaseOrcaException):
     """Raised when remote algorithm stubs cannot be properly parsed and read"""
+
+
+class ExecutorSaturated(BaseOrcaException):
+    """Raised when the algorithm executor queue is full"""
+
+
+class ProcessWorkerError(BaseOrcaException):
+    """Raised when an algorithm fails inside, or crashes, a worker process"""
+
+
+class AlgorithmTimeout(BaseOrcaException):
+    """Raised when an algorithm does not complete within its timeout"""
+
+
+class ProcessorOverloaded(BaseOrcaException):
+    """Raised when a DAG part is rejected by admission control"""
+
+
+class CircularDependency(InvalidDependency):
+    """Raised when a dependency would make the dependency graph cyclic"""
+
+
+class RegistryFrozen(BaseOrcaException):
+    """Raised when an algorithm is registered after the processor has started"""
@@ -0,0 +1,595 @@
+"""
+Algorithm execution pools owned by the `Processor`.
+
+Algorithms are executed on a bounded pool of worker threads that the processor
+creates and owns, instead of asyncio's default executor. The pool keeps track of
+how much work is queued and running so that it can be observed and limited.
+
+Queued work is started by priority. Each priority level counts as
+`priority_aging` seconds of waiting, so low priority work still starts once it
+has waited long enough.
+
+CPU bound algorithms can instead be executed on a pool of worker processes. Each
+worker imports the modules that define those algorithms once when it starts, so
+only the algorithm name, its `ExecutionParams` and its result cross the process
+boundary on every call.
+"""
+
+import time
+import heapq
+import logging
+import importlib
+import threading
+import traceback
+from typing import Any, Dict, List, Tuple, Callable, Iterable, Optional
+from concurrent import futures
+from dataclasses import dataclass
+
+from orca_python.exceptions import ExecutorSaturated, ProcessWorkerError
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_THREAD_NAME_PREFIX = "orca-algorithm"
+DEFAULT_PROCESS_START_METHOD = "spawn"
+# seconds of waiting each priority level is worth
+DEFAULT_PRIORITY_AGING = 1.0
+
+# algorithms that may run in a worker process, by `name_version`. Populated by
+# `Processor.algorithm` in both the serving process and the worker processes.
+_PROCESS_ALGORITHMS: Dict[str, Callable[..., Any]] = {}
+_PROCESS_ALGORITHM_MODULES: Dict[str, str] = {}
+
+
+def register_process_algorithm(
+    full_name: str, fn: Callable[..., Any], module: str
+) -> None:
+    """
+    Makes an algorithm callable from the worker processes.
+
+    Args:
+        full_name (str): The algorithm's `name_version`.
+        fn (Callable): The function to run in the worker.
+        module (str): The module defining the algorithm. Workers import it on
+            start up, which registers the algorithm in the worker.
+    """
+    _PROCESS_ALGORITHMS[full_name] = fn
+    _PROCESS_ALGORITHM_MODULES[full_name] = module
+
+
+def timed_call(fn: Callable[..., Any], *args: Any) -> Tuple[float, float, Any]:
+    """
+    Calls `fn(*args)`, timing it.
+
+    Returns:
+        Tuple[float, float, Any]: The `time.perf_counter` reading when the call
+        started, its duration in seconds and its result.
+    """
+    started = time.perf_counter()
+    result = fn(*args)
+    return started, time.perf_counter() - started, result
+
+
+@dataclass(frozen=True)
+class ExecutorStats:
+    """
+    A point in time snapshot of an executor.
+
+    Attributes:
+        max_workers (int): Maximum number of concurrently running executions.
+        max_queue_size (int): Maximum number of queued executions (0 is unbounded).
+        queue_length (int): Executions waiting for a worker.
+        active_count (int): Executions currently running.
+        submitted_total (int): Executions accepted since the executor was created.
+        completed_total (int): Executions finished since the executor was created.
+        rejected_total (int): Executions rejected because the queue was full.
+        detached_count (int): Timed out or abandoned executions still running
+            on a detached thread, which no longer counts towards `max_workers`.
+        detached_total (int): Executions detached since the executor was created.
+    """
+
+    max_workers: int
+    max_queue_size: int
+    queue_length: int
+    active_count: int
+    submitted_total: int
+    completed_total: int
+    rejected_total: int
+    detached_count: int = 0
+    detached_total: int = 0
+
+
+@dataclass
+class _WorkItem:
+    future: futures.Future
+    fn: Callable[..., Any]
+    args: tuple
+    enqueued_at: float
+    # the order work is started in: lowest first
+    rank: Tuple[float, int] = (0.0, 0)
+
+    def __lt__(self, other: "_WorkItem") -> bool:
+        return self.rank < other.rank
+
+    def run(self) -> None:
+        try:
+            result = self.fn(*self.args)
+        except BaseException as e:
+            self.future.set_exception(e)
+        else:
+            self.future.set_result(result)
+
+
+class ThreadAlgorithmExecutor:
+    """
+    A bounded thread pool for running synchronous algorithms.
+
+    Worker threads are started lazily, up to `max_workers`. Work that cannot be
+    started immediately is queued; once `max_queue_size` executions are queued,
+    further submissions are rejected with `ExecutorSaturated`.
+
+    Queued work starts in order of priority, then submission. Work submitted
+    with a priority `n` levels higher starts before work submitted up to
+    `n * priority_aging` seconds earlier.
+
+    Args:
+        max_workers (int): Maximum number of worker threads.
+        thread_name_prefix (str): Prefix for the worker thread names.
+        max_queue_size (int): Maximum queued executions. 0 means unbounded.
+        priority_aging (float): Seconds of waiting each priority level is worth.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        thread_name_prefix: str = DEFAULT_THREAD_NAME_PREFIX,
+        max_queue_size: int = 0,
+        priority_aging: float = DEFAULT_PRIORITY_AGING,
+    ):
+        if max_workers <= 0:
+            raise ValueError("max_workers must be greater than 0")
+        if max_queue_size < 0:
+            raise ValueError("max_queue_size must not be negative")
+        if priority_aging < 0:
+            raise ValueError("priority_aging must not be negative")
+
+        self._max_workers = max_workers
+        self._thread_name_prefix = thread_name_prefix
+        self._max_queue_size = max_queue_size
+        self._priority_aging = priority_aging
+
+        self._lock = threading.Condition()
+        # a heap ordered by `_WorkItem.rank`
+        self._queue: List[_WorkItem] = []
+        self._threads: List[threading.Thread] = []
+        self._thread_count = 0
+        self._idle = 0
+        self._active = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        # the threads running each execution, so timed out ones can be detached
+        self._running: Dict[futures.Future, threading.Thread] = {}
+        self._detached = 0
+        self._detached_total = 0
+        self._shutdown = False
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    @property
+    def queue_length(self) -> int:
+        """Executions waiting for a worker."""
+        return len(self._queue)
+
+    @property
+    def active_count(self) -> int:
+        """Executions currently running."""
+        return self._active
+
+    def stats(self) -> ExecutorStats:
+        """Returns a snapshot of the executor's counters."""
+        with self._lock:
+            return ExecutorStats(
+                max_workers=self._max_workers,
+                max_queue_size=self._max_queue_size,
+                queue_length=len(self._queue),
+                active_count=self._active,
+                submitted_total=self._submitted,
+                completed_total=self._completed,
+                rejected_total=self._rejected,
+                detached_count=self._detached,
+                detached_total=self._detached_total,
+            )
+
+    def submit(
+        self, fn: Callable[..., Any], *args: Any, priority: int = 0
+    ) -> futures.Future:
+        """
+        Schedules `fn(*args)` on the pool.
+
+        Args:
+            fn (Callable): The function to call.
+            *args: Its arguments.
+            priority (int): Higher priorities start sooner (default: 0).
+
+        Returns:
+            futures.Future: Resolves with the return value of `fn`.
+
+        Raises:
+            ExecutorSaturated: If the queue already holds `max_queue_size` items.
+            RuntimeError: If the executor has been shut down.
+        """
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("Cannot submit to an executor after shutdown")
+
+            if self._max_queue_size and len(self._queue) >= self._max_queue_size:
+                self._rejected += 1
+                raise ExecutorSaturated(
+                    f"Algorithm executor queue is full ({self._max_queue_size} queued)"
+                )
+
+            future: futures.Future = futures.Future()
+            now = time.monotonic()
+            rank = (now - priority * self._priority_aging, self._submitted)
+            heapq.heappush(self._queue, _WorkItem(future, fn, args, now, rank))
+            self._submitted += 1
+
+            # start another worker unless enough idle workers can take the queue
+            if len(self._queue) > self._idle and len(self._threads) < self._max_workers:
+                self._start_worker()
+            else:
+                self._lock.notify()
+            return future
+
+    def detach(self, future: futures.Future) -> bool:
+        """
+        Gives up on an execution, e.g. once it has timed out.
+
+        A queued execution is cancelled. Python threads cannot be killed, so a
+        running execution is left to finish on its thread, but that thread no
+        longer counts towards `max_workers` and exits once it does finish. A
+        replacement thread is started if work is waiting.
+
+        Returns:
+            bool: Whether the execution was still queued or running.
+        """
+        with self._lock:
+            for item in self._queue:
+                if item.future is future:
+                    self._queue.remove(item)
+                    heapq.heapify(self._queue)
+                    future.cancel()
+                    return True
+
+            thread = self._running.pop(future, None)
+            if thread is None:
+                return False
+            self._threads.remove(thread)
+            self._active -= 1
+            self._detached += 1
+            self._detached_total += 1
+            LOGGER.warning(
+                f"Detached algorithm thread {thread.name}, "
+                f"{self._detached} detached threads still running"
+            )
+            if len(self._queue) > self._idle and not self._shutdown:
+                self._start_worker()
+            return True
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stops the worker threads once the queued work has been drained.
+
+        Args:
+            wait (bool): Block until all worker threads have exited.
+        """
+        with self._lock:
+            self._shutdown = True
+            self._lock.notify_all()
+            threads = list(self._threads)
+
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def _start_worker(self) -> None:
+        thread = threading.Thread(
+            target=self._worker,
+            name=f"{self._thread_name_prefix}_{self._thread_count}",
+            daemon=True,
+        )
+        self._thread_count += 1
+        self._threads.append(thread)
+        thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            with self._lock:
+                self._idle += 1
+                while not self._queue and not self._shutdown:
+                    self._lock.wait()
+                self._idle -= 1
+
+                if not self._queue:
+                    # shut down and drained
+                    self._threads.remove(threading.current_thread())
+                    return
+
+                item = heapq.heappop(self._queue)
+                if not item.future.set_running_or_notify_cancel():
+                    continue
+                self._active += 1
+                self._running[item.future] = threading.current_thread()
+
+            item.run()
+
+            with self._lock:
+                if self._running.pop(item.future, None) is None:
+                    # detached while running, and already replaced
+                    self._detached -= 1
+                    return
+                self._active -= 1
+                self._completed += 1
+
+
+def _process_worker_main(conn: Any, modules: Tuple[str, ...]) -> None:
+    """
+    Entry point of an algorithm worker process.
+
+    Imports the algorithm modules once, then serves `(full_name, params)`
+    requests from the pipe until it is closed.
+    """
+    for module in modules:
+        importlib.import_module(module)
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        if request is None:
+            return
+
+        full_name, params = request
+        try:
+            result = _PROCESS_ALGORITHMS[full_name](params)
+        except BaseException as e:
+            conn.send((False, f"{type(e).__name__}: {e}\n{traceback.format_exc()}"))
+        else:
+            conn.send((True, result))
+
+
+class _ProcessWorker:
+    """A worker process and the parent's end of its pipe."""
+
+    def __init__(self, context: Any, modules: Tuple[str, ...], name: str):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_process_worker_main,
+            args=(child_conn, modules),
+            name=name,
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def call(self, full_name: str, params: Any) -> Any:
+        self.conn.send((full_name, params))
+        ok, payload = self.conn.recv()
+        if not ok:
+            raise ProcessWorkerError(f"Algorithm {full_name} failed: {payload}")
+        return payload
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+
+
+@dataclass
+class _Assignment:
+    """The worker process an execution was sent to, once it has been sent."""
+
+    worker: Optional[_ProcessWorker] = None
+    terminated: bool = False
+
+
+class ProcessAlgorithmExecutor:
+    """
+    A bounded pool of worker processes for running CPU bound algorithms.
+
+    Every worker process is paired with a driver thread in this process, which
+    sends it one execution at a time. A worker that dies is replaced by a fresh
+    process, and the execution that was running in it fails with
+    `ProcessWorkerError`. An execution can be stopped with `terminate`, which
+    kills its worker process.
+
+    Args:
+        max_workers (int): Maximum number of worker processes.
+        modules (Iterable[str]): Modules the workers import to register algorithms.
+        start_method (str): The multiprocessing start method for the workers.
+        max_queue_size (int): Maximum queued executions. 0 means unbounded.
+        priority_aging (float): Seconds of waiting each priority level is worth.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        modules: Iterable[str] = (),
+        start_method: str = DEFAULT_PROCESS_START_METHOD,
+        max_queue_size: int = 0,
+        priority_aging: float = DEFAULT_PRIORITY_AGING,
+    ):
+        # imported here, as only process algorithms need it
+        import multiprocessing
+
+        self._context = multiprocessing.get_context(start_method)
+        self._modules = tuple(sorted({m for m in modules if m != "__main__"}))
+        self._drivers = ThreadAlgorithmExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="orca-process-driver",
+            max_queue_size=max_queue_size,
+            priority_aging=priority_aging,
+        )
+        self._local = threading.local()
+        self._workers_lock = threading.Lock()
+        self._workers: List[_ProcessWorker] = []
+        self._assignments: Dict[futures.Future, _Assignment] = {}
+        self._restarts = 0
+        self._terminations = 0
+
+    @property
+    def restarts(self) -> int:
+        """Number of worker processes replaced after crashing."""
+        return self._restarts
+
+    @property
+    def terminations(self) -> int:
+        """Number of worker processes killed by `terminate`."""
+        return self._terminations
+
+    def stats(self) -> ExecutorStats:
+        """Returns a snapshot of the executor's counters."""
+        return self._drivers.stats()
+
+    def submit(self, full_name: str, params: Any, priority: int = 0) -> futures.Future:
+        """
+        Schedules the registered algorithm `full_name` on a worker process.
+
+        Args:
+            full_name (str): The algorithm's `name_version`.
+            params (ExecutionParams): The algorithm's parameters.
+            priority (int): Higher priorities start sooner (default: 0).
+
+        Returns:
+            futures.Future: Resolves with the algorithm's result.
+
+        Raises:
+            ExecutorSaturated: If the queue already holds `max_queue_size` items.
+        """
+        return self._submit(False, full_name, params, priority)
+
+    def submit_timed(
+        self, full_name: str, params: Any, priority: int = 0
+    ) -> futures.Future:
+        """
+        Like `submit`, but resolves with the result of `timed_call`, so the
+        queue wait and the duration of the call can be recorded.
+        """
+        return self._submit(True, full_name, params, priority)
+
+    def _submit(
+        self, timed: bool, full_name: str, params: Any, priority: int
+    ) -> futures.Future:
+        assignment = _Assignment()
+        if timed:
+            future = self._drivers.submit(
+                timed_call,
+                self._call,
+                assignment,
+                full_name,
+                params,
+                priority=priority,
+            )
+        else:
+            future = self._drivers.submit(
+                self._call, assignment, full_name, params, priority=priority
+            )
+        with self._workers_lock:
+            self._assignments[future] = assignment
+        # registered first, so an already finished execution is forgotten now
+        future.add_done_callback(self._forget)
+        return future
+
+    def _forget(self, future: futures.Future) -> None:
+        with self._workers_lock:
+            self._assignments.pop(future, None)
+
+    def terminate(self, future: futures.Future) -> bool:
+        """
+        Stops an execution, e.g. once it has timed out. A queued execution is
+        cancelled, and the worker process of a running one is killed and
+        replaced. The execution fails with `ProcessWorkerError`.
+
+        Returns:
+            bool: Whether the execution was still queued or running.
+        """
+        with self._workers_lock:
+            assignment = self._assignments.get(future)
+            if assignment is None:
+                return False
+            assignment.terminated = True
+            worker = assignment.worker
+
+        if worker is None:
+            # not sent to a worker yet, and `_call` checks `terminated` first
+            future.cancel()
+            return True
+        LOGGER.warning(f"Terminating algorithm worker process {worker.process.pid}")
+        worker.process.terminate()
+        self._terminations += 1
+        return True
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stops the driver threads, then the worker processes."""
+        self._drivers.shutdown(wait=wait)
+        with self._workers_lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.stop()
+
+    def _worker(self) -> _ProcessWorker:
+        worker: Optional[_ProcessWorker] = getattr(self._local, "worker", None)
+        if worker is None or not worker.process.is_alive():
+            if worker is not None:
+                self._replace(worker)
+            worker = _ProcessWorker(
+                self._context,
+                self._modules,
+                name=f"orca-process-worker-{threading.current_thread().name}",
+            )
+            self._local.worker = worker
+            with self._workers_lock:
+                self._workers.append(worker)
+        return worker
+
+    def _replace(self, worker: _ProcessWorker, crashed: bool = True) -> None:
+        if crashed:
+            LOGGER.warning(
+                f"Algorithm worker process {worker.process.pid} died, restarting"
+            )
+            self._restarts += 1
+        with self._workers_lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        worker.conn.close()
+        self._local.worker = None
+
+    def _call(self, assignment: _Assignment, full_name: str, params: Any) -> Any:
+        worker = self._worker()
+        with self._workers_lock:
+            if assignment.terminated:
+                raise ProcessWorkerError(f"Algorithm {full_name} was terminated")
+            assignment.worker = worker
+        try:
+            return worker.call(full_name, params)
+        except (EOFError, OSError) as e:
+            worker.process.join(timeout=1)
+            exitcode = worker.process.exitcode
+            self._replace(worker, crashed=not assignment.terminated)
+            if assignment.terminated:
+                raise ProcessWorkerError(
+                    f"Worker process running algorithm {full_name} was terminated"
+                ) from e
+            raise ProcessWorkerError(
+                f"Worker process running algorithm {full_name} crashed "
+                f"(exit code {exitcode})"
+            ) from e
@@ -0,0 +1,97 @@
+"""
+Live load figures reported by `Processor.HealthCheck`.
+
+Orca-core uses them to tell an idle processor from a busy one, so they are
+cheap to read: memory comes from `/proc/self/statm` where available and CPU use
+is the process CPU time consumed between two health checks.
+"""
+
+import os
+import sys
+import time
+import threading
+from typing import Optional
+
+# CPU use is averaged over at least this many seconds
+DEFAULT_CPU_INTERVAL = 5.0
+
+
+def process_rss_bytes() -> int:
+    """
+    Returns the resident set size of this process, in bytes.
+
+    Falls back to the peak resident set size where `/proc` is not available, and
+    to 0 where neither is.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # reported in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class ProcessorLoad:
+    """
+    Tracks the in-flight algorithm executions, CPU use and uptime of a processor.
+
+    CPU use covers this process only, not the worker processes of process
+    algorithms, and is a percentage of one core.
+
+    Args:
+        cpu_interval (float): The shortest interval CPU use is averaged over, in
+            seconds, so frequent health checks still report a stable figure.
+    """
+
+    def __init__(self, cpu_interval: float = DEFAULT_CPU_INTERVAL):
+        self._cpu_interval = cpu_interval
+        self._lock = threading.Lock()
+        self._active_tasks = 0
+        self._started_at = time.monotonic()
+        self._cpu_sampled_at = self._started_at
+        self._cpu_time = time.process_time()
+        self._cpu_percent: Optional[float] = None
+
+    @property
+    def active_tasks(self) -> int:
+        """The number of algorithm executions in flight."""
+        return self._active_tasks
+
+    def task_started(self) -> None:
+        with self._lock:
+            self._active_tasks += 1
+
+    def task_finished(self) -> None:
+        with self._lock:
+            self._active_tasks -= 1
+
+    def uptime_seconds(self) -> int:
+        return int(time.monotonic() - self._started_at)
+
+    def cpu_percent(self) -> float:
+        """
+        Returns the CPU use of this process since the previous sample, which is
+        taken at most once every `cpu_interval` seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            cpuTime = time.process_time()
+            elapsed = now - self._cpu_sampled_at
+            if self._cpu_percent is not None and elapsed < self._cpu_interval:
+                return self._cpu_percent
+
+            percent = (
+                100.0 * (cpuTime - self._cpu_time) / elapsed if elapsed > 0 else 0.0
+            )
+            if elapsed >= self._cpu_interval:
+                self._cpu_sampled_at = now
+                self._cpu_time = cpuTime
+                self._cpu_percent = percent
+            return percent
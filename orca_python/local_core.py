@@ -0,0 +1,385 @@
+"""
+A stand-in Orca-core for load testing processors without a live deployment.
+
+`LocalOrcaCore` serves the `OrcaCore` service in-process. Processors register
+with it as they would with Orca-core, and every window emitted to it is turned
+into `ExecuteDagPart` calls against the processors whose algorithms the window
+triggers: a DAG part per dependency level and processor, with the results of
+earlier levels passed on. The DAG parts of a level run at once. Windows are dispatched at up to `rate` per second,
+with at most `max_in_flight` at once, and the time from emit to the last result
+of each window is recorded.
+
+It keeps everything in memory and implements only what processors need, so it
+is meant for soak tests and capacity planning on a laptop or in CI.
+
+Usage:
+    python -m orca_python.local_core [--port 50051] [--rate 100] [--max-in-flight 16]
+"""
+
+import time
+import queue
+import logging
+import argparse
+import itertools
+import threading
+from typing import Any, Dict, List, Tuple, Optional
+from concurrent import futures
+from collections import deque
+from dataclasses import dataclass
+
+import grpc
+import service_pb2 as pb
+import service_pb2_grpc
+
+from orca_python.dag import topological_order
+
+LOGGER = logging.getLogger(__name__)
+
+# latencies kept for percentiles, so long soak tests use bounded memory
+DEFAULT_MAX_SAMPLES = 100_000
+
+
+@dataclass(frozen=True)
+class LocalCoreStats:
+    """
+    A point in time snapshot of a `LocalOrcaCore`.
+
+    Attributes:
+        emitted (int): Windows emitted that triggered algorithms.
+        completed (int): Windows whose DAG has completed.
+        queued (int): Windows waiting to be dispatched.
+        in_flight (int): Windows being dispatched.
+        failed_results (int): Algorithm results that did not succeed.
+        failed_calls (int): `ExecuteDagPart` calls that failed.
+        latency_p50 (float): Median seconds from emit to the last result.
+        latency_p99 (float): 99th percentile of the same.
+        latency_p999 (float): 99.9th percentile of the same.
+    """
+
+    emitted: int
+    completed: int
+    queued: int
+    in_flight: int
+    failed_results: int
+    failed_calls: int
+    latency_p50: float
+    latency_p99: float
+    latency_p999: float
+
+
+@dataclass(frozen=True)
+class _Registered:
+    processor: str
+    address: str
+    algorithm: pb.Algorithm
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.algorithm.name}_{self.algorithm.version}"
+
+
+def _percentile(sortedValues: List[float], q: float) -> float:
+    if not sortedValues:
+        return 0.0
+    index = min(len(sortedValues) - 1, max(0, int(q * len(sortedValues) + 0.5) - 1))
+    return sortedValues[index]
+
+
+class LocalOrcaCore(service_pb2_grpc.OrcaCoreServicer):  # type: ignore
+    """
+    An in-memory `OrcaCore` service that dispatches emitted windows.
+
+    Args:
+        rate (Optional[float]): Most windows dispatched per second (default:
+            unlimited).
+        max_in_flight (int): Most windows dispatched at once.
+        max_queue_size (int): Most windows waiting to be dispatched. Windows
+            emitted beyond it are refused with `TRIGGERING_FAILED` (default:
+            0, unbounded).
+        max_samples (int): Most recent latencies kept for percentiles.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        max_in_flight: int = 16,
+        max_queue_size: int = 0,
+        max_samples: int = DEFAULT_MAX_SAMPLES,
+    ):
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive")
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self._rate = rate
+        self._max_in_flight = max_in_flight
+        self._lock = threading.Condition()
+        # window type -> registered algorithms it triggers
+        self._triggers: Dict[str, List[_Registered]] = {}
+        # window type -> its algorithms grouped by dependency level
+        self._levels: Dict[str, List[List[_Registered]]] = {}
+        self._channels: Dict[str, Tuple[grpc.Channel, Any]] = {}
+        self._queue: "queue.Queue[Tuple[float, pb.Window]]" = queue.Queue(
+            max_queue_size
+        )
+        self._slots = threading.Semaphore(max_in_flight)
+        self._pool = futures.ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix="orca-local-core"
+        )
+        self._latencies: "deque[float]" = deque(maxlen=max_samples)
+        # numbers the windows dispatched, for unique `exec_id`s
+        self._windowIds = itertools.count()
+        self._emitted = 0
+        self._completed = 0
+        self._in_flight = 0
+        self._failed_results = 0
+        self._failed_calls = 0
+        self._server: Optional[grpc.Server] = None
+        self._dispatcher: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self, address: str = "localhost:0") -> int:
+        """
+        Starts serving `OrcaCore` and dispatching windows.
+
+        Returns:
+            int: The bound port.
+        """
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=8))
+        service_pb2_grpc.add_OrcaCoreServicer_to_server(self, server)
+        port = server.add_insecure_port(address)
+        if port == 0:
+            raise RuntimeError(f"Failed to bind to address {address}")
+        server.start()
+        self._server = server
+        self._dispatcher = threading.Thread(
+            target=self._dispatch, name="orca-local-core-dispatcher", daemon=True
+        )
+        self._dispatcher.start()
+        LOGGER.info(f"Local Orca-core listening on port {port}")
+        return port
+
+    def stop(self) -> None:
+        """Stops serving, abandoning windows not yet dispatched."""
+        self._stopped.set()
+        if self._server is not None:
+            self._server.stop(grace=None)
+        self._pool.shutdown(wait=True)
+        for channel, _ in self._channels.values():
+            channel.close()
+
+    def RegisterProcessor(
+        self, registration: pb.ProcessorRegistration, context: grpc.ServicerContext
+    ) -> pb.Status:
+        _ = context
+        with self._lock:
+            # a processor registering again replaces its algorithms
+            for windowType, registered in self._triggers.items():
+                self._triggers[windowType] = [
+                    r for r in registered if r.processor != registration.name
+                ]
+            for algorithm in registration.supported_algorithms:
+                windowType = (
+                    f"{algorithm.window_type.name}_{algorithm.window_type.version}"
+                )
+                self._triggers.setdefault(windowType, []).append(
+                    _Registered(
+                        registration.name, registration.connection_str, algorithm
+                    )
+                )
+            self._levels.clear()
+        LOGGER.info(
+            f"Registered processor {registration.name} at "
+            f"{registration.connection_str} with "
+            f"{len(registration.supported_algorithms)} algorithms"
+        )
+        return pb.Status(received=True, message="registered")
+
+    def EmitWindow(
+        self, window: pb.Window, context: grpc.ServicerContext
+    ) -> pb.WindowEmitStatus:
+        _ = context
+        windowType = f"{window.window_type_name}_{window.window_type_version}"
+        with self._lock:
+            triggered = bool(self._triggers.get(windowType))
+        if not triggered:
+            return pb.WindowEmitStatus(
+                status=pb.WindowEmitStatus.NO_TRIGGERED_ALGORITHMS
+            )
+        try:
+            self._queue.put_nowait((time.perf_counter(), window))
+        except queue.Full:
+            LOGGER.warning(f"Refused window of {windowType}, the queue is full")
+            return pb.WindowEmitStatus(status=pb.WindowEmitStatus.TRIGGERING_FAILED)
+        with self._lock:
+            self._emitted += 1
+        return pb.WindowEmitStatus(status=pb.WindowEmitStatus.PROCESSING_TRIGGERED)
+
+    def stats(self) -> LocalCoreStats:
+        """Returns a snapshot of the dispatch counters and latencies."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            return LocalCoreStats(
+                emitted=self._emitted,
+                completed=self._completed,
+                queued=self._queue.qsize(),
+                in_flight=self._in_flight,
+                failed_results=self._failed_results,
+                failed_calls=self._failed_calls,
+                latency_p50=_percentile(latencies, 0.50),
+                latency_p99=_percentile(latencies, 0.99),
+                latency_p999=_percentile(latencies, 0.999),
+            )
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits for every emitted window to complete.
+
+        Returns:
+            bool: Whether they did before `timeout` seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while self._completed < self._emitted:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._lock.wait(remaining)
+        return True
+
+    def _dispatch(self) -> None:
+        nextAt = time.monotonic()
+        while not self._stopped.is_set():
+            try:
+                emittedAt, window = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if self._rate is not None:
+                # windows are spaced evenly, without bursts after an idle spell
+                now = time.monotonic()
+                nextAt = max(nextAt, now)
+                if nextAt > now:
+                    time.sleep(nextAt - now)
+                nextAt += 1 / self._rate
+            self._slots.acquire()
+            with self._lock:
+                self._in_flight += 1
+            try:
+                self._pool.submit(self._run_window, emittedAt, window)
+            except RuntimeError:
+                # stopped
+                return
+
+    def _levels_of(self, windowType: str) -> List[List[_Registered]]:
+        """Groups the algorithms a window type triggers by dependency level."""
+        with self._lock:
+            levels = self._levels.get(windowType)
+            if levels is not None:
+                return levels
+            registered = {r.full_name: r for r in self._triggers.get(windowType, [])}
+            # dependencies on algorithms the window does not trigger are not waited for
+            graph = {
+                name: [
+                    f"{d.name}_{d.version}"
+                    for d in r.algorithm.dependencies
+                    if f"{d.name}_{d.version}" in registered
+                ]
+                for name, r in registered.items()
+            }
+            depth: Dict[str, int] = {}
+            for name in topological_order(graph):
+                depth[name] = 1 + max((depth[d] for d in graph[name]), default=-1)
+            levels = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+            for name, level in depth.items():
+                levels[level].append(registered[name])
+            self._levels[windowType] = levels
+            return levels
+
+    def _stub(self, address: str) -> Any:
+        with self._lock:
+            if address not in self._channels:
+                channel = grpc.insecure_channel(address)
+                self._channels[address] = (
+                    channel,
+                    service_pb2_grpc.OrcaProcessorStub(channel),
+                )
+            return self._channels[address][1]
+
+    def _run_window(self, emittedAt: float, window: pb.Window) -> None:
+        windowType = f"{window.window_type_name}_{window.window_type_version}"
+        failedResults = failedCalls = 0
+        windowId = next(self._windowIds)
+        try:
+            results: List[pb.AlgorithmResult] = []
+            for index, level in enumerate(self._levels_of(windowType)):
+                byProcessor: Dict[str, List[_Registered]] = {}
+                for registered in level:
+                    byProcessor.setdefault(registered.address, []).append(registered)
+                # every call of a level is started before any is read, so the
+                # processors run at once and the level takes as long as the slowest
+                calls = []
+                for address, algorithms in byProcessor.items():
+                    request = pb.ExecutionRequest(
+                        exec_id=f"local-{windowId}-{index}",
+                        window=window,
+                        algorithm_results=results,
+                        algorithms=[
+                            pb.Algorithm(
+                                name=r.algorithm.name, version=r.algorithm.version
+                            )
+                            for r in algorithms
+                        ],
+                    )
+                    calls.append((address, self._stub(address).ExecuteDagPart(request)))
+                levelResults: List[pb.AlgorithmResult] = []
+                for address, call in calls:
+                    try:
+                        for result in call:
+                            levelResults.append(result.algorithm_result)
+                            failedResults += (
+                                result.algorithm_result.result.status
+                                != pb.ResultStatus.RESULT_STATUS_SUCEEDED
+                            )
+                    except grpc.RpcError as e:
+                        failedCalls += 1
+                        LOGGER.error(f"ExecuteDagPart on {address} failed: {e}")
+                results.extend(levelResults)
+        finally:
+            with self._lock:
+                self._latencies.append(time.perf_counter() - emittedAt)
+                self._completed += 1
+                self._in_flight -= 1
+                self._failed_results += failedResults
+                self._failed_calls += failedCalls
+                self._lock.notify_all()
+            self._slots.release()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--port", type=int, default=50051)
+    parser.add_argument("--rate", type=float, default=None)
+    parser.add_argument("--max-in-flight", type=int, default=16)
+    parser.add_argument("--report-every", type=float, default=10.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    core = LocalOrcaCore(rate=args.rate, max_in_flight=args.max_in_flight)
+    core.start(f"localhost:{args.port}")
+    try:
+        while True:
+            time.sleep(args.report_every)
+            stats = core.stats()
+            LOGGER.info(
+                f"{stats.completed}/{stats.emitted} windows completed, "
+                f"{stats.queued} queued, p50 {stats.latency_p50 * 1e3:.1f}ms, "
+                f"p99 {stats.latency_p99 * 1e3:.1f}ms, "
+                f"{stats.failed_results} failed results"
+            )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        core.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,110 +6,146 @@ to register, execute, and manage algorithms defined in Python. Algorithms can ha
 which are managed by Orca-core.
 """
 
+import os
 import re
 import sys
+import time
+import types
+import signal
+import typing
 import asyncio
 import logging
 import datetime as dt
+import threading
 import traceback
-
-from google.protobuf import json_format, timestamp_pb2
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler()],
-)
-
-import time
-import types
-import typing
 from typing import (
     Any,
+    Set,
     Dict,
     List,
+    Tuple,
     Union,
+    Literal,
+    Mapping,
     TypeVar,
     Callable,
     Iterable,
+    Iterator,
     Optional,
     Protocol,
+    Awaitable,
     Generator,
     AsyncGenerator,
 )
-from inspect import signature
+from inspect import signature, iscoroutinefunction
+from pathlib import Path
+from functools import partial
 from concurrent import futures
 from dataclasses import field, dataclass
 
 import grpc
 import service_pb2 as pb
 import service_pb2_grpc
-import google.protobuf.struct_pb2 as struct_pb2
-from google.protobuf import json_format
 from service_pb2_grpc import OrcaProcessorServicer
-from grpc_reflection.v1alpha import reflection
+from google.protobuf.message import DecodeError
 
 from orca_python import envs
+from orca_python.dag import find_cycle, local_plan, topological_order
+from orca_python.cache import (
+    CacheStats,
+    CachePolicy,
+    ResultCache,
+    DiskResultStore,
+    result_cache_key,
+)
+from orca_python.client import OrcaCoreClient, get_default_client
+from orca_python.health import ProcessorLoad, process_rss_bytes
+from orca_python.metrics import (
+    DEFAULT_METRICS_HOST,
+    MetricsServer,
+    AlgorithmMetrics,
+)
+from orca_python.tracing import Span, Tracer, NoOpTracer, perf_counter_to_ns
+from orca_python.windows import (
+    SEMVER_PATTERN,
+    DEFAULT_MAX_IN_FLIGHT,
+    Window,
+    WindowType,
+    _window_to_pb,
+)
+from orca_python.backfill import (
+    DEFAULT_CHUNK_SIZE,
+    Checkpoint,
+    Throughput,
+    JsonlWriter,
+    ResultWriter,
+    ParquetWriter,
+    BackfillReport,
+    metadata_digest,
+)
+from orca_python.batching import BatchPolicy, MicroBatcher
+from orca_python.encoding import (
+    decode_struct,
+    encode_struct,
+    decode_float_array,
+    encode_float_array,
+)
+from orca_python.executor import (
+    DEFAULT_PRIORITY_AGING,
+    _PROCESS_ALGORITHM_MODULES,
+    DEFAULT_THREAD_NAME_PREFIX,
+    DEFAULT_PROCESS_START_METHOD,
+    ExecutorStats,
+    ThreadAlgorithmExecutor,
+    ProcessAlgorithmExecutor,
+    timed_call,
+    register_process_algorithm,
+)
+from orca_python.admission import (
+    AdmissionPolicy,
+    AdmissionController,
+    retry_pushback_metadata,
+)
 from orca_python.exceptions import (
+    RegistryFrozen,
+    AlgorithmTimeout,
     InvalidDependency,
-    InvalidWindowArgument,
+    CircularDependency,
+    ProcessorOverloaded,
     InvalidAlgorithmArgument,
     BrokenRemoteAlgorithmStubs,
     InvalidAlgorithmReturnType,
-    InvalidMetadataFieldArgument,
 )
 
 # Regex patterns for validation
 ALGORITHM_NAME = r"^[A-Z][a-zA-Z0-9]*$"
-SEMVER_PATTERN = r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)$"
-WINDOW_NAME = r"^[A-Z][a-zA-Z0-9]*$"
 
+SERVER_OPTIONS = [
+    ("grpc.max_send_message_length", 50 * 1024 * 1024),  # 50MB
+    ("grpc.max_receive_message_length", 50 * 1024 * 1024),  # 50MB
+]
 
-LOGGER = logging.getLogger(__name__)
-
-
-@dataclass(frozen=True)
-class MetadataField:
-    name: str
-    description: str
+# outcome label of the algorithm result metrics
+_RESULT_OUTCOMES = {
+    pb.ResultStatus.RESULT_STATUS_SUCEEDED: "succeeded",
+    pb.ResultStatus.RESULT_STATUS_HANDLED_FAILED: "handled_failure",
+    pb.ResultStatus.RESULT_STATUS_UNHANDLED_FAILED: "unhandled_failure",
+}
 
-    def __post_init__(self) -> None:
-        if self.name == "":
-            raise InvalidMetadataFieldArgument("Metadata field name cannot be empty")
-
-        if self.description == "":
-            raise InvalidMetadataFieldArgument(
-                "Metadata field description cannot be empty"
-            )
-
-
-@dataclass
-class WindowType:
-    name: str
-    version: str
-    description: str
-    metadataFields: List[MetadataField] = field(default_factory=list)
-
-    def __post_init__(self) -> None:
-        if not re.match(WINDOW_NAME, self.name):
-            raise InvalidWindowArgument(
-                f"Window name '{self.name}' must be in PascalCase"
-            )
+LOGGER = logging.getLogger(__name__)
 
-        if not re.match(SEMVER_PATTERN, self.version):
-            raise InvalidWindowArgument(
-                f"Window version '{self.version}' must follow basic semantic "
-                "versioning (e.g., '1.0.0') without release portions"
-            )
 
-        _seenFields = set()
-        for field in self.metadataFields:
-            if field in _seenFields:
-                raise InvalidWindowArgument(
-                    f"Two or more metadata fields provided with the same name:'{field.name}' and description@ '{field.description}"
-                )
-            else:
-                _seenFields.add(field)
+def _configure_logging() -> None:
+    """
+    Logs to stderr at INFO level once a processor registers or starts, unless
+    the application has configured logging itself. The SDK does not configure
+    logging on import, so window emitters and other applications keep theirs.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler()],
+    )
 
 
 @dataclass
@@ -149,7 +185,9 @@ class ArrayResult:
         Produce an array result
 
         Args:
-            value: The result to produce. E.g. [1, 2, 3, 4, 5]
+            value: The result to produce. E.g. [1, 2, 3, 4, 5]. NumPy arrays and
+                buffer protocol objects (e.g. `array.array`) are encoded in bulk.
+                Values are sent as 32 bit floats.
         """
         self.value = value
 
@@ -165,38 +203,168 @@ class NoneResult:
 returnResult = StructResult | ArrayResult | ValueResult | NoneResult
 
 
-@dataclass
-class Window:
-    time_from: dt.datetime
-    time_to: dt.datetime
-    name: str
-    version: str
-    origin: str
-    metadata: Dict[str, Any] = field(default_factory=dict)
+def _decode_result(result: pb.Result) -> Any:
+    """Converts the value held by a result into a Python object."""
+    which = result.WhichOneof("result_data")
+    if which == "single_value":
+        return result.single_value
+    elif which == "float_values":
+        return decode_float_array(result.float_values)
+    elif which == "struct_value":
+        return decode_struct(result.struct_value)
+    return None
+
+
+# marks a dependency result that has not been decoded yet
+_UNDECODED = object()
+
+
+class DependencyResults(Mapping[str, Any]):
+    """
+    Read-only mapping of dependency results, keyed by `name_version`.
+
+    Values are decoded from their protobuf form the first time they are read
+    and then shared by every algorithm of the `ExecutionRequest`, so they should
+    be treated as read-only. Array results are read-only float32 NumPy arrays,
+    or float32 `memoryview`s when NumPy is not installed. Results of
+    dependencies run on the processor itself, with `local_dag=True`, are the
+    values their algorithms returned instead.
+    """
+
+    def __init__(self, dependencies: Iterable[pb.AlgorithmResult] = ()):
+        self._results: Dict[str, pb.Result] = {
+            f"{dep.algorithm.name}_{dep.algorithm.version}": dep.result
+            for dep in dependencies
+        }
+        self._decoded: Dict[str, Any] = {}
+        self._serialized: Dict[str, bytes] = {}
+        self._tracer: Optional[Tracer] = None
+        self._span: Optional[Span] = None
+        # the request's mapping, when extended with results run during it
+        self._base: Optional[DependencyResults] = None
+
+    def _trace(self, tracer: Tracer, span: Span) -> None:
+        """Reports every decode to `tracer`, as a child span of `span`."""
+        self._tracer = tracer
+        self._span = span
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._decoded[key]
+        except KeyError:
+            pass
+        if (
+            self._base is not None
+            and self._base._results.get(key) is self._results[key]
+        ):
+            # decoded once for the whole request
+            return self._base[key]
+        if self._tracer is None:
+            value = _decode_result(self._results[key])
+        else:
+            started = time.perf_counter()
+            value = _decode_result(self._results[key])
+            # decodes may run on a worker thread, so are reported after the fact
+            self._tracer.start_span(
+                "orca.decode_dependency",
+                parent=self._span,
+                attributes={"orca.dependency": key},
+                start_time=perf_counter_to_ns(started),
+            ).end(end_time=perf_counter_to_ns(time.perf_counter()))
+        self._decoded[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._results)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def __repr__(self) -> str:
+        return f"DependencyResults({list(self._results)})"
+
+    def _extend(
+        self, results: Iterable[Tuple[str, pb.Result, Any]]
+    ) -> "DependencyResults":
+        """
+        Returns a copy with the results of dependencies run during the request
+        added, for a single algorithm. The request's own results are still
+        decoded once, by this mapping.
+
+        Args:
+            results (Iterable[Tuple[str, pb.Result, Any]]): The key, result and
+                returned value, or `_UNDECODED`, of each dependency.
+        """
+        extended = DependencyResults()
+        extended._results = dict(self._results)
+        extended._tracer = self._tracer
+        extended._span = self._span
+        extended._base = self
+        for key, result, value in results:
+            extended._results[key] = result
+            if value is not _UNDECODED:
+                extended._decoded[key] = value
+        return extended
+
+    def _serialize(self, key: str) -> bytes:
+        """Returns a result deterministically serialized, for cache keys."""
+        if (
+            self._base is not None
+            and self._base._results.get(key) is self._results[key]
+        ):
+            return self._base._serialize(key)
+        serialized = self._serialized.get(key)
+        if serialized is None:
+            serialized = self._results[key].SerializeToString(deterministic=True)
+            self._serialized[key] = serialized
+        return serialized
 
 
 @dataclass
 class ExecutionParams:
     window: Window
     dependencies: Optional[Iterable[pb.AlgorithmResult]] = None
+    dependency_values: DependencyResults = field(default_factory=DependencyResults)
 
     def __init__(
         self,
         window: Window | pb.Window,
         dependencies: Optional[Iterable[pb.AlgorithmResult]] = None,
+        dependency_values: Optional[DependencyResults] = None,
     ):
+        """
+        Args:
+            window: The window that triggered the algorithm. Shared between the
+                algorithms of a request, so it should be treated as read-only.
+            dependencies: The raw results of the algorithm's dependencies.
+            dependency_values: The decoded dependency results, shared between the
+                algorithms of a request. Built from `dependencies` if not given.
+        """
         if isinstance(window, Window):
             self.window = window
         elif isinstance(window, pb.Window):
-            self.window = Window(
-                time_from=window.time_from.ToDatetime(),
-                time_to=window.time_to.ToDatetime(),
-                name=window.window_type_name,
-                version=window.window_type_version,
-                origin=window.origin,
-                metadata=json_format.MessageToDict(window.metadata),
-            )
+            self.window = Window.from_pb(window)
         self.dependencies = dependencies
+        if dependency_values is None:
+            dependency_values = DependencyResults(dependencies or ())
+        self.dependency_values = dependency_values
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # repeated protobuf containers cannot be pickled, so dependency results
+        # cross process boundaries in their wire format
+        dependencies = None
+        if self.dependencies is not None:
+            dependencies = [dep.SerializeToString() for dep in self.dependencies]
+        return {"window": self.window, "dependencies": dependencies}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.window = state["window"]
+        self.dependencies = None
+        if state["dependencies"] is not None:
+            self.dependencies = [
+                pb.AlgorithmResult.FromString(dep) for dep in state["dependencies"]
+            ]
+        self.dependency_values = DependencyResults(self.dependencies or ())
 
 
 class AlgorithmFn(Protocol):
@@ -205,6 +373,12 @@ class AlgorithmFn(Protocol):
     ) -> returnResult: ...
 
 
+class AsyncAlgorithmFn(Protocol):
+    def __call__(
+        self, params: ExecutionParams, *args: Any, **kwargs: Any
+    ) -> Awaitable[returnResult]: ...
+
+
 @dataclass
 class RemoteAlgorithm:
     ProcessorName: str
@@ -213,50 +387,66 @@ class RemoteAlgorithm:
     Version: str
 
 
-T = TypeVar("T", bound=AlgorithmFn)
+T = TypeVar("T", bound=Union[AlgorithmFn, AsyncAlgorithmFn])
+ExecutorKind = Literal["thread", "process"]
+V = TypeVar("V")
 
 
-def EmitWindow(window: Window) -> None:
-    """
-    Emits a window to Orca-core.
+def _encode_struct_result(value: Any, algo: "Algorithm") -> pb.Result:
+    resultPb = pb.Result(status=pb.ResultStatus.RESULT_STATUS_SUCEEDED)
+    encode_struct(resultPb.struct_value, value)
+    return resultPb
 
-    Raises:
-        grpc.RpcError: If the emit fails.
-    """
-    LOGGER.info(f"Emitting window: {window}")
-
-    _time_from = timestamp_pb2.Timestamp()
-    _time_from.FromDatetime(window.time_from)
-
-    _time_to = timestamp_pb2.Timestamp()
-    _time_to.FromDatetime(window.time_to)
-
-    window_pb = pb.Window()
-    window_pb.time_to.CopyFrom(_time_to)
-    window_pb.time_from.CopyFrom(_time_from)
-    window_pb.window_type_name = window.name
-    window_pb.window_type_version = window.version
-    window_pb.origin = window.origin
-
-    # parse out the metadata
-    struct_value = struct_pb2.Struct()
-    json_format.ParseDict(window.metadata, struct_value)
-    window_pb.metadata = struct_value
-
-    if envs.is_production:
-        # secure channel with TLS
-        with grpc.secure_channel(
-            envs.ORCA_CORE, grpc.ssl_channel_credentials()
-        ) as channel:
-            stub = service_pb2_grpc.OrcaCoreStub(channel)
-            response = stub.EmitWindow(window_pb)
-            LOGGER.info(f"Window emitted: {response}")
-    else:
-        # insecure channel for local development
-        with grpc.insecure_channel(envs.ORCA_CORE) as channel:
-            stub = service_pb2_grpc.OrcaCoreStub(channel)
-            response = stub.EmitWindow(window_pb)
-            LOGGER.info(f"Window emitted: {response}")
+
+def _encode_value_result(value: Any, algo: "Algorithm") -> pb.Result:
+    if isinstance(value, (float, int)):
+        # for single numeric values
+        return pb.Result(
+            status=pb.ResultStatus.RESULT_STATUS_SUCEEDED, single_value=value
+        )
+    LOGGER.error(
+        f"Algorithm {algo.name} {algo.version} produced result that was neither a float or an int {algo.result_type}. Failing algorithm."
+    )
+    # create a handled failure result
+    return pb.Result(status=pb.ResultStatus.RESULT_STATUS_HANDLED_FAILED)
+
+
+def _encode_array_result(value: Any, algo: "Algorithm") -> pb.Result:
+    resultPb = pb.Result(status=pb.ResultStatus.RESULT_STATUS_SUCEEDED)
+    try:
+        # lists, numpy arrays and buffers of numeric values
+        encode_float_array(resultPb.float_values, value)
+    except TypeError:
+        LOGGER.error(
+            f"Algorithm {algo.name} {algo.version} produced result that was not an array of numbers. Failing algorithm."
+        )
+        # create a handled failure result
+        return pb.Result(status=pb.ResultStatus.RESULT_STATUS_HANDLED_FAILED)
+    return resultPb
+
+
+def _encode_unhandled_result(value: Any, algo: "Algorithm") -> pb.Result:
+    _ = value
+    LOGGER.error(
+        f"Algorithm {algo.name} {algo.version} has unhandled return type {algo.result_type}"
+    )
+    # create a handled failure result
+    return pb.Result(status=pb.ResultStatus.RESULT_STATUS_HANDLED_FAILED)
+
+
+# encodes the value of an algorithm's result, by its result type
+ResultEncoder = Callable[[Any, "Algorithm"], pb.Result]
+_RESULT_ENCODERS: Dict[Any, ResultEncoder] = {
+    StructResult: _encode_struct_result,
+    ValueResult: _encode_value_result,
+    ArrayResult: _encode_array_result,
+}
+_RESULT_TYPES: Dict[Any, "pb.ResultType"] = {
+    ValueResult: pb.ResultType.VALUE,
+    StructResult: pb.ResultType.STRUCT,
+    ArrayResult: pb.ResultType.ARRAY,
+    NoneResult: pb.ResultType.NONE,
+}
 
 
 @dataclass
@@ -269,34 +459,58 @@ class Algorithm:
         version (str): Semantic version of the algorithm (e.g., "1.0.0").
         description (str): A description of the algorithm.
         window_type (WindowType): The window type triggers the algorithm.
-        exec_fn (AlgorithmFn): The execution function for the algorithm.
+        exec_fn (AlgorithmFn | AsyncAlgorithmFn): The execution function for the algorithm.
         processor (str): Name of the processor where it's registered.
         runtime (str): Python runtime used for execution.
+        result_type (returnResult): The result type the algorithm returns.
+        executor (str): Where the algorithm runs, `"thread"` or `"process"`.
+        is_async (bool): Whether `exec_fn` is a coroutine function, awaited on the
+            serving event loop instead of being run on an executor.
+        cache (Optional[ResultCache]): Cache of the algorithm's results, if enabled.
+        timeout (Optional[float]): Seconds the algorithm may take, if limited.
+        priority (int): Scheduling priority on the executor. Higher priorities
+            start sooner.
+        batch (Optional[BatchPolicy]): How executions are batched, if the
+            algorithm takes a list of `ExecutionParams`.
+        full_name (str): The full name as `name_version`.
+        full_window_name (str): The full window name as
+            `window_name_window_version`.
+        encoder (ResultEncoder): Encodes the value of the algorithm's results.
     """
 
     name: str
     version: str
     description: str
     window_type: WindowType
-    exec_fn: AlgorithmFn
+    exec_fn: Union[AlgorithmFn, AsyncAlgorithmFn]
     processor: str
     runtime: str
     result_type: returnResult
+    executor: ExecutorKind = "thread"
+    is_async: bool = False
+    cache: Optional[ResultCache] = None
+    timeout: Optional[float] = None
+    priority: int = 0
+    batch: Optional[BatchPolicy] = None
+    # derived once, rather than on every execution
+    full_name: str = field(init=False, repr=False, compare=False)
+    full_window_name: str = field(init=False, repr=False, compare=False)
+    encoder: ResultEncoder = field(init=False, repr=False, compare=False)
 
-    @property
-    def full_name(self) -> str:
-        """Returns the full name as `name_version`."""
-        return f"{self.name}_{self.version}"
-
-    @property
-    def full_window_name(self) -> str:
-        """Returns the full window name as `window_name_window_version`."""
-        return f"{self.window_type.name}_{self.window_type.version}"
+    def __post_init__(self) -> None:
+        self.full_name = f"{self.name}_{self.version}"
+        self.full_window_name = f"{self.window_type.name}_{self.window_type.version}"
+        self.encoder = _RESULT_ENCODERS.get(self.result_type, _encode_unhandled_result)
 
 
 class Algorithms:
     """
     Internal singleton managing all registered algorithms and their dependencies.
+
+    Algorithms are indexed by full name and by function, and the local
+    dependency graph is kept up to date as they are added, so registering
+    many algorithms takes linear time. The registry is frozen once the
+    processor registers with Orca-core or starts serving.
     """
 
     def __init__(self) -> None:
@@ -306,10 +520,52 @@ class Algorithms:
         """Clears all registered algorithms and dependencies."""
         LOGGER.debug("Flushing all algorithm registrations and dependencies")
         self._algorithms: Dict[str, Algorithm] = {}
+        # id of `exec_fn` -> its algorithm. The algorithm keeps the function
+        # alive, so its id is not reused while registered
+        self._algorithmsByFn: Dict[int, Algorithm] = {}
         self._dependencies: Dict[str, List[Algorithm]] = {}
         self._dependencyFns: Dict[str, List[AlgorithmFn]] = {}
         self._remoteDependencies: Dict[str, List[RemoteAlgorithm]] = {}
         self._window_triggers: Dict[str, List[Algorithm]] = {}
+        # full name -> full names of its dependencies on this processor
+        self._localGraph: Dict[str, List[str]] = {}
+        # full names of the algorithms other algorithms depend on locally
+        self._dependedOn: Set[str] = set()
+        # remote dependencies on algorithms not registered (yet), by full name
+        self._unresolved: Dict[str, List[Tuple[str, RemoteAlgorithm]]] = {}
+        # full name -> `name_version` of every dependency, once computed
+        self._dependencyKeys: Dict[str, List[str]] = {}
+        # topological order of the local dependency graph, and the position
+        # of each algorithm in it, once computed
+        self._order: Optional[List[str]] = None
+        self._positions: Optional[Dict[str, int]] = None
+        self._frozen = False
+
+    def _freeze(self) -> None:
+        """
+        Stops further registrations, e.g. once the algorithms have been
+        registered with Orca-core, and computes what executions look up.
+        """
+        if self._frozen:
+            return
+        self._topological_order()
+        for name in self._algorithms:
+            self._dependency_keys(name)
+        self._frozen = True
+        LOGGER.debug(f"Froze registry of {len(self._algorithms)} algorithms")
+
+    def _check_not_frozen(self, name: str) -> None:
+        if self._frozen:
+            raise RegistryFrozen(
+                f"Cannot register {name}, algorithms must be registered before "
+                "the processor registers with Orca-core or starts serving"
+            )
+
+    def _changed(self) -> None:
+        """Discards everything computed from the dependencies."""
+        self._order = None
+        self._positions = None
+        self._dependencyKeys.clear()
 
     def _add_algorithm(self, name: str, algorithm: Algorithm) -> None:
         """
@@ -321,7 +577,9 @@ class Algorithms:
 
         Raises:
             ValueError: If the algorithm name is already registered.
+            RegistryFrozen: If the registry is frozen.
         """
+        self._check_not_frozen(name)
         if name in self._algorithms:
             LOGGER.error(f"Attempted to register duplicate algorithm: {name}")
             raise ValueError(f"Algorithm {name} already exists")
@@ -329,6 +587,15 @@ class Algorithms:
             f"Registering algorithm: {name} (window: {algorithm.window_type.name}_{algorithm.window_type.version})"
         )
         self._algorithms[name] = algorithm
+        self._algorithmsByFn[id(algorithm.exec_fn)] = algorithm
+        self._localGraph.setdefault(name, [])
+        # remote stubs registered earlier may refer to this algorithm. It has
+        # no dependencies yet, so they cannot form a cycle
+        for dependant, remote in self._unresolved.pop(name, []):
+            if self._local_name(dependant, remote) is not None:
+                self._localGraph.setdefault(dependant, []).append(name)
+                self._dependedOn.add(name)
+        self._changed()
 
     def _add_dependency(
         self, algorithm: str, dependency: AlgorithmFn, remote: bool = False
@@ -343,8 +610,11 @@ class Algorithms:
 
         Raises:
             ValueError: If the dependency function is not registered.
+            CircularDependency: If the algorithm would depend on itself.
+            RegistryFrozen: If the registry is frozen.
         """
         LOGGER.debug(f"Adding dependency for algorithm: {algorithm}")
+        self._check_not_frozen(algorithm)
         if remote:
             remoteDepMetadata = getattr(dependency, "__orca_metadata__", None)
             if remoteDepMetadata is None:
@@ -358,33 +628,111 @@ class Algorithms:
                     f"Could not parse metadata from Orca stubs: {e} Rerun stub generation: `orca sync`"
                 )
 
+            local = self._local_name(algorithm, remoteAlgo)
+            if local is not None:
+                self._add_local_dependency(algorithm, local)
+            elif f"{remoteAlgo.Name}_{remoteAlgo.Version}" not in self._algorithms:
+                self._unresolved.setdefault(
+                    f"{remoteAlgo.Name}_{remoteAlgo.Version}", []
+                ).append((algorithm, remoteAlgo))
             if algorithm not in self._remoteDependencies:
                 self._remoteDependencies[algorithm] = [remoteAlgo]
             else:
                 self._remoteDependencies[algorithm].append(remoteAlgo)
-
+            self._changed()
             return
 
-        dependencyAlgo = None
-        for algo in self._algorithms.values():
-            if algo.exec_fn == dependency:
-                dependencyAlgo = algo
-                break
+        dependencyAlgo = self._algorithmsByFn.get(id(dependency))
         if not dependencyAlgo:
             dep_name = getattr(dependency, "__name__", "<unknown>")
             LOGGER.error(
                 f"Failed to find registered algorithm for dependency: {dep_name}"
             )
             raise ValueError(f"Dependency {dep_name} not found")
+        self._add_local_dependency(algorithm, dependencyAlgo.full_name)
         if algorithm not in self._dependencyFns:
             self._dependencyFns[algorithm] = [dependency]
             self._dependencies[algorithm] = [dependencyAlgo]
         else:
             self._dependencyFns[algorithm].append(dependency)
             self._dependencies[algorithm].append(dependencyAlgo)
+        self._changed()
+
+    def _local_name(self, algorithm: str, remote: RemoteAlgorithm) -> Optional[str]:
+        """
+        Returns the full name of the algorithm a remote dependency refers to, if
+        it is registered on the same processor as `algorithm`.
+        """
+        name = f"{remote.Name}_{remote.Version}"
+        target = self._algorithms.get(name)
+        if target is None or target.processor != remote.ProcessorName:
+            return None
+        dependant = self._algorithms.get(algorithm)
+        if dependant is None or dependant.processor != remote.ProcessorName:
+            return None
+        return name
+
+    def _local_dependencies(self, algorithm: str) -> List[str]:
+        """Returns the full names of an algorithm's dependencies on this processor."""
+        return self._localGraph.get(algorithm, [])
+
+    def _local_graph(self) -> Dict[str, List[str]]:
+        """Returns the local dependencies of every registered algorithm."""
+        return self._localGraph
+
+    def _add_local_dependency(self, algorithm: str, dependency: str) -> None:
+        """
+        Adds `dependency` to the local dependencies of `algorithm`, checking
+        that they do not form a cycle.
+
+        Raises:
+            CircularDependency: If `dependency` already depends on `algorithm`.
+        """
+        dependencies = self._localGraph.setdefault(algorithm, [])
+        dependencies.append(dependency)
+        # a cycle needs a path back to `algorithm`, so there is none while
+        # nothing depends on it, as when it has just been registered
+        if algorithm in self._dependedOn or algorithm == dependency:
+            cycle = find_cycle(self._localGraph, algorithm)
+            if cycle is not None:
+                dependencies.pop()
+                LOGGER.error(f"Rejected circular dependency: {' -> '.join(cycle)}")
+                raise CircularDependency(
+                    f"Algorithm {algorithm} cannot depend on {dependency}, which "
+                    f"depends on it: {' -> '.join(cycle)}"
+                )
+        self._dependedOn.add(dependency)
+
+    def _topological_order(self) -> List[str]:
+        """Returns every algorithm, after all of its local dependencies."""
+        if self._order is None:
+            self._order = topological_order(self._localGraph)
+        return self._order
+
+    def _topological_positions(self) -> Dict[str, int]:
+        """Returns the position of every algorithm in the topological order."""
+        if self._positions is None:
+            self._positions = {
+                name: position
+                for position, name in enumerate(self._topological_order())
+            }
+        return self._positions
+
+    def _dependency_keys(self, algorithm: str) -> List[str]:
+        """Returns the `name_version` of every dependency of an algorithm."""
+        keys = self._dependencyKeys.get(algorithm)
+        if keys is None:
+            keys = [dep.full_name for dep in self._dependencies.get(algorithm, [])]
+            keys.extend(
+                f"{dep.Name}_{dep.Version}"
+                for dep in self._remoteDependencies.get(algorithm, [])
+            )
+            self._dependencyKeys[algorithm] = keys
+        return keys
 
     def _add_window_trigger(self, window: str, algorithm: Algorithm) -> None:
         """Associates an algorithm with a triggering window."""
+        self._check_not_frozen(algorithm.full_name)
         if window not in self._window_triggers:
             self._window_triggers[window] = [algorithm]
         else:
@@ -400,10 +748,7 @@ class Algorithms:
         Returns:
             bool: True if the function is registered.
         """
-        for algorithm in self._algorithms.values():
-            if algorithm.exec_fn == algorithm_fn:
-                return True
-        return False
+        return id(algorithm_fn) in self._algorithmsByFn
 
 
 # the orca processor
@@ -416,10 +761,69 @@ class Processor(OrcaProcessorServicer):  # type: ignore
 
     Args:
         name (str): Unique name of the processor.
-        max_workers (int): Max worker threads for execution (default: 10).
+        max_workers (int): Max gRPC worker threads when serving (default: 10).
+        executor_max_workers (Optional[int]): Max threads executing algorithms.
+            Falls back to `executorMaxWorkers` in `orca.json`, then `max_workers`.
+        executor_thread_name_prefix (Optional[str]): Name prefix of the algorithm
+            threads. Falls back to `executorThreadNamePrefix` in `orca.json`.
+        executor_max_queue_size (Optional[int]): Max algorithm executions waiting
+            for a thread before new ones fail fast. Falls back to
+            `executorMaxQueueSize` in `orca.json`, then 0 (unbounded).
+        process_max_workers (Optional[int]): Max worker processes executing
+            algorithms registered with `executor="process"` (default: CPU count).
+        process_start_method (str): Multiprocessing start method of the worker
+            processes (default: `"spawn"`).
+        overload_threshold (Optional[int]): Number of queued algorithm executions
+            at which `HealthCheck` reports the processor as not serving. Falls
+            back to `executorOverloadThreshold` in `orca.json`, then to
+            `executor_max_queue_size` if the queue is bounded.
+        metrics_port (Optional[int]): Port to serve per-algorithm metrics on, at
+            `/metrics` in the Prometheus text format, while the processor runs.
+        metrics_host (str): Interface to serve metrics on (default: localhost
+            only). Use `"0.0.0.0"` to let other hosts scrape them.
+        tracer (Optional[Tracer]): Receives a span per DAG part and per algorithm
+            phase, e.g. an `OpenTelemetryTracer`. Defaults to a no-op tracer.
+        result_store (Optional[DiskResultStore]): On-disk store of the results of
+            algorithms registered with `cache`, checked after their in-memory
+            cache, so results survive restarts.
+        algorithm_timeout (Optional[float]): Default timeout of every algorithm,
+            in seconds, for algorithms registered without a `timeout`.
+        priority_aging (float): Seconds of waiting each priority level is worth,
+            so queued low priority algorithms still start once they have waited
+            long enough (default: 1.0).
+        admission (Optional[AdmissionPolicy]): Limits the algorithm executions
+            queued or running at once. DAG parts beyond the limit wait briefly
+            or are rejected with `RESOURCE_EXHAUSTED`. Falls back to
+            `admissionMaxPending` in `orca.json`, then no limit.
+        local_dag (bool): Run the dependencies of a DAG part's algorithms that
+            are registered on this processor, and whose results were not sent,
+            on the processor itself in topological order, instead of waiting
+            for Orca-core to schedule them. Their results are passed on as
+            Python objects, and only the requested results are streamed back.
+        client (Optional[OrcaCoreClient]): Connection used to register with
+            Orca-core. Defaults to the process wide client.
     """
 
-    def __init__(self, name: str, max_workers: int = 10):
+    def __init__(
+        self,
+        name: str,
+        max_workers: int = 10,
+        executor_max_workers: Optional[int] = None,
+        executor_thread_name_prefix: Optional[str] = None,
+        executor_max_queue_size: Optional[int] = None,
+        process_max_workers: Optional[int] = None,
+        process_start_method: str = DEFAULT_PROCESS_START_METHOD,
+        overload_threshold: Optional[int] = None,
+        metrics_port: Optional[int] = None,
+        metrics_host: str = DEFAULT_METRICS_HOST,
+        tracer: Optional[Tracer] = None,
+        result_store: Optional[DiskResultStore] = None,
+        algorithm_timeout: Optional[float] = None,
+        priority_aging: float = DEFAULT_PRIORITY_AGING,
+        admission: Optional[AdmissionPolicy] = None,
+        local_dag: bool = False,
+        client: Optional[OrcaCoreClient] = None,
+    ):
         super().__init__()
         self._name = name
         self._processorConnStr = f"[::]:{envs.PROCESSOR_PORT}"  # attach the processor to all network interfaces when launching the gRPC service.
@@ -427,12 +831,235 @@ class Processor(OrcaProcessorServicer):  # type: ignore
         self._runtime = sys.version
         self._max_workers = max_workers
         self._algorithmsSingleton: Algorithms = Algorithms()
+        self._client = get_default_client() if client is None else client
+        self._executor = ThreadAlgorithmExecutor(
+            max_workers=_first_set(
+                executor_max_workers, envs.EXECUTOR_MAX_WORKERS, max_workers
+            ),
+            thread_name_prefix=_first_set(
+                executor_thread_name_prefix,
+                envs.EXECUTOR_THREAD_NAME_PREFIX,
+                DEFAULT_THREAD_NAME_PREFIX,
+            ),
+            max_queue_size=_first_set(
+                executor_max_queue_size, envs.EXECUTOR_MAX_QUEUE_SIZE, 0
+            ),
+            priority_aging=priority_aging,
+        )
+        self._priority_aging = priority_aging
+        self._process_max_workers = _first_set(process_max_workers, os.cpu_count(), 1)
+        self._process_start_method = process_start_method
+        self._process_executor: Optional[ProcessAlgorithmExecutor] = None
+        self._process_executor_lock = threading.Lock()
+        self._batchers: Dict[str, MicroBatcher] = {}
+        self._batchers_lock = threading.Lock()
+        # 0 disables the overload status
+        self._overload_threshold = _first_set(
+            overload_threshold,
+            envs.EXECUTOR_OVERLOAD_THRESHOLD,
+            self._executor.stats().max_queue_size,
+        )
+        self._load = ProcessorLoad()
+        self._metrics = AlgorithmMetrics()
+        self._tracer: Tracer = NoOpTracer() if tracer is None else tracer
+        self._result_store = result_store
+        if algorithm_timeout is not None and algorithm_timeout <= 0:
+            raise ValueError("algorithm_timeout must be positive")
+        self._algorithm_timeout = algorithm_timeout
+        self._metrics_port = metrics_port
+        self._metrics_host = metrics_host
+        self._local_dag = local_dag
+        if admission is None and envs.ADMISSION_MAX_PENDING:
+            admission = AdmissionPolicy(max_pending=envs.ADMISSION_MAX_PENDING)
+        self._admission: Optional[AdmissionController] = None
+        self._retry_after = 0.0
+        if admission is not None:
+            controller = AdmissionController(admission)
+            self._metrics.admission_pending.set_function(lambda: controller.pending)
+            self._metrics.admission_waiting.set_function(lambda: controller.waiting)
+            self._admission = controller
+            self._retry_after = admission.retry_after
+
+    def _get_process_executor(self) -> ProcessAlgorithmExecutor:
+        """Returns the worker process pool, starting it on first use."""
+        with self._process_executor_lock:
+            if self._process_executor is None:
+                modules = [
+                    _PROCESS_ALGORITHM_MODULES[algo.full_name]
+                    for algo in self._algorithmsSingleton._algorithms.values()
+                    if algo.executor == "process"
+                ]
+                LOGGER.info(
+                    f"Starting {self._process_max_workers} algorithm worker processes"
+                )
+                self._process_executor = ProcessAlgorithmExecutor(
+                    max_workers=self._process_max_workers,
+                    modules=modules,
+                    start_method=self._process_start_method,
+                    max_queue_size=self._executor.stats().max_queue_size,
+                    priority_aging=self._priority_aging,
+                )
+            return self._process_executor
+
+    def _batcher(self, algo: Algorithm) -> MicroBatcher:
+        """Returns the batcher of an algorithm registered with `batch`."""
+        with self._batchers_lock:
+            batcher = self._batchers.get(algo.full_name)
+            if batcher is None:
+                if algo.executor == "process":
+                    processExecutor = self._get_process_executor()
+                    submitBatch = partial(
+                        processExecutor.submit_timed,
+                        algo.full_name,
+                        priority=algo.priority,
+                    )
+                    stopBatch: Callable[[futures.Future], Any] = (
+                        processExecutor.terminate
+                    )
+                else:
+                    submitBatch = partial(
+                        self._executor.submit,
+                        timed_call,
+                        algo.exec_fn,
+                        priority=algo.priority,
+                    )
+                    stopBatch = self._executor.detach
+                batcher = MicroBatcher(
+                    algo.full_name,
+                    algo.batch,  # type: ignore[arg-type]
+                    submitBatch,
+                    stopBatch,
+                )
+                self._batchers[algo.full_name] = batcher
+            return batcher
+
+    def executor_stats(self) -> ExecutorStats:
+        """
+        Returns a snapshot of the algorithm executor, e.g. its queue length and
+        the number of algorithms currently running.
+        """
+        return self._executor.stats()
+
+    @property
+    def metrics(self) -> AlgorithmMetrics:
+        """The latency, size and outcome metrics of every algorithm."""
+        return self._metrics
+
+    def queue_length(self) -> int:
+        """Returns the number of algorithm executions waiting for a worker."""
+        queued = self._executor.queue_length
+        if self._process_executor is not None:
+            queued += self._process_executor.stats().queue_length
+        return queued
 
     async def execute_algorithm(
         self,
         exec_id: str,
         algorithm: pb.Algorithm,
         params: ExecutionParams,
+        parent_span: Optional[Span] = None,
+        window_bytes: Optional[bytes] = None,
+        local_values: Optional[Dict[str, Any]] = None,
+    ) -> pb.ExecutionResult:
+        """
+        Executes a single algorithm with resolved dependencies, counting it as
+        an active task until it completes.
+
+        Args:
+            exec_id (str): Unique execution ID.
+            algorithm (pb.Algorithm): The algorithm to execute.
+            params (ExecutionParams): The execution params object, which contains the triggering window and dependency results.
+            parent_span (Optional[Span]): The span of the DAG part, if any.
+            window_bytes (Optional[bytes]): The window serialized for result
+                cache keys, if already done for the request.
+            local_values (Optional[Dict[str, Any]]): Receives the value of a
+                successful result, keyed by `name_version`, for algorithms
+                that depend on it locally.
+
+        Returns:
+            pb.ExecutionResult: The result of the execution.
+        """
+        self._load.task_started()
+        algoName = f"{algorithm.name}_{algorithm.version}"
+        span = self._tracer.start_span(
+            "orca.algorithm",
+            parent=parent_span,
+            attributes={"orca.exec_id": exec_id, "orca.algorithm": algoName},
+        )
+        try:
+            return await self._execute_algorithm(
+                exec_id, algorithm, algoName, params, span, window_bytes, local_values
+            )
+        finally:
+            span.end()
+            self._load.task_finished()
+
+    def _timed_out(self, algoName: str, timeout: Optional[float]) -> AlgorithmTimeout:
+        LOGGER.error(f"Algorithm {algoName} timed out after {timeout}s")
+        self._metrics.timeouts.inc(algoName)
+        return AlgorithmTimeout(f"Algorithm {algoName} timed out after {timeout}s")
+
+    def cache_stats(self) -> Dict[str, CacheStats]:
+        """Returns the result cache counters of every cached algorithm."""
+        return {
+            name: algo.cache.stats()
+            for name, algo in self._algorithmsSingleton._algorithms.items()
+            if algo.cache is not None
+        }
+
+    async def _cached_result(
+        self, cache: ResultCache, key: bytes
+    ) -> Tuple[Optional[pb.Result], str]:
+        """
+        Looks a result up in memory, then in the result store.
+
+        Returns:
+            Tuple[Optional[pb.Result], str]: The result, if found, and where:
+            `"hit"`, `"disk_hit"` or `"miss"`.
+        """
+        cached = cache.get(key)
+        if cached is not None:
+            return cached, "hit"
+        if self._result_store is None:
+            return None, "miss"
+
+        data = await self._result_store.get_async(key)
+        if data is None:
+            return None, "miss"
+        try:
+            cached = pb.Result.FromString(data)
+        except DecodeError:
+            LOGGER.warning("Discarding undecodable result from the result store")
+            return None, "miss"
+        cache.put(key, cached, len(data))
+        return cached, "disk_hit"
+
+    def _result_cache_key(
+        self, algo: Algorithm, params: ExecutionParams, windowBytes: Optional[bytes]
+    ) -> bytes:
+        """Derives the result cache key of an execution from its inputs."""
+        if windowBytes is None:
+            windowBytes = _window_bytes(params.window)
+        dependencyValues = params.dependency_values
+        return result_cache_key(
+            algo.full_name,
+            windowBytes,
+            (
+                (key, dependencyValues._serialize(key))
+                for key in self._algorithmsSingleton._dependency_keys(algo.full_name)
+                if key in dependencyValues
+            ),
+        )
+
+    async def _execute_algorithm(
+        self,
+        exec_id: str,
+        algorithm: pb.Algorithm,
+        algoName: str,
+        params: ExecutionParams,
+        span: Span,
+        windowBytes: Optional[bytes] = None,
+        localValues: Optional[Dict[str, Any]] = None,
     ) -> pb.ExecutionResult:
         """
         Executes a single algorithm with resolved dependencies.
@@ -440,7 +1067,12 @@ class Processor(OrcaProcessorServicer):  # type: ignore
         Args:
             exec_id (str): Unique execution ID.
             algorithm (pb.Algorithm): The algorithm to execute.
+            algoName (str): Its full name, `name_version`.
             params (ExecutionParams): The execution params object, which contains the triggering window and dependency results.
+            span (Span): The algorithm's span, parent of a span per phase.
+            windowBytes (Optional[bytes]): The serialized window, if known.
+            localValues (Optional[Dict[str, Any]]): Receives the value of a
+                successful result.
 
         Returns:
             pb.ExecutionResult: The result of the execution.
@@ -448,78 +1080,120 @@ class Processor(OrcaProcessorServicer):  # type: ignore
         Raises:
             Exception: On algorithm execution or serialization error.
         """
+        tracer = self._tracer
+        encodeSpan: Optional[Span] = None
         try:
-            LOGGER.debug(f"Processing algorithm: {algorithm.name}_{algorithm.version}")
-            algoName = f"{algorithm.name}_{algorithm.version}"
+            LOGGER.debug(f"Processing algorithm: {algoName}")
             algo = self._algorithmsSingleton._algorithms[algoName]
+            span.set_attribute(
+                "orca.executor", "async" if algo.is_async else algo.executor
+            )
 
-            # convert dependency results into a dict of name -> value
-            dependency_values = {}
-            if params.dependencies:
-                for dep_result in params.dependencies:
-                    # extract value based on which oneof field is set
-                    dep_value = None
-                    if dep_result.result.HasField("single_value"):
-                        dep_value = dep_result.result.single_value
-                    elif dep_result.result.HasField("float_values"):
-                        dep_value = list(dep_result.result.float_values.values)
-                    elif dep_result.result.HasField("struct_value"):
-                        dep_value = json_format.MessageToDict(
-                            dep_result.result.struct_value
-                        )
-
-                    dep_name = (
-                        f"{dep_result.algorithm.name}_{dep_result.algorithm.version}"
+            cacheKey: Optional[bytes] = None
+            if algo.cache is not None:
+                cacheKey = self._result_cache_key(algo, params, windowBytes)
+                cached, lookup = await self._cached_result(algo.cache, cacheKey)
+                self._metrics.cache_lookups.inc(algoName, lookup)
+                span.set_attribute("orca.cache", lookup)
+                if cached is not None:
+                    LOGGER.debug(f"Algorithm {algoName} answered from its cache")
+                    self._metrics.results.inc(algoName, "succeeded")
+                    span.set_attribute("orca.outcome", "succeeded")
+                    return pb.ExecutionResult(
+                        exec_id=exec_id,
+                        algorithm_result=pb.AlgorithmResult(
+                            algorithm=algorithm, result=cached
+                        ),
                     )
-                    dependency_values[dep_name] = dep_value
-
-            # execute in thread pool since algo.exec_fn is synchronous
-            loop = asyncio.get_event_loop()
-
-            algoResult = await loop.run_in_executor(None, algo.exec_fn, params)
 
-            # depending on algo result type, map to whatever instance
-            if algo.result_type == StructResult:  # type: ignore
-                struct_value = struct_pb2.Struct()
-                json_format.ParseDict(algoResult.value, struct_value)
-
-                resultPb = pb.Result(
-                    status=pb.ResultStatus.RESULT_STATUS_SUCEEDED,
-                    struct_value=struct_value,
-                )
-
-            elif algo.result_type == ValueResult:  # type: ignore
-                if isinstance(algoResult.value, (float, int)):
-                    # for single numeric values
-                    resultPb = pb.Result(
-                        status=pb.ResultStatus.RESULT_STATUS_SUCEEDED,
-                        single_value=algoResult.value,
+            timeout = self._algorithm_timeout if algo.timeout is None else algo.timeout
+            submittedAt = time.perf_counter()
+            if algo.is_async:
+                # coroutine algorithms are awaited directly on the serving loop
+                phase = tracer.start_span("orca.execute", parent=span)
+                try:
+                    algoResult = await asyncio.wait_for(
+                        algo.exec_fn(params),  # type: ignore[arg-type]
+                        timeout,
+                    )
+                except asyncio.TimeoutError:
+                    # the coroutine has been cancelled
+                    raise self._timed_out(algoName, timeout)
+                finally:
+                    phase.end()
+                encodeStartedAt = time.perf_counter()
+                self._metrics.execution.observe(encodeStartedAt - submittedAt, algoName)
+            else:
+                # execute in the processor's pools since algo.exec_fn is synchronous
+                if algo.batch is not None:
+                    future = self._batcher(algo).submit(params)
+                elif algo.executor == "process":
+                    future = self._get_process_executor().submit_timed(
+                        algo.full_name, params, priority=algo.priority
                     )
                 else:
-                    LOGGER.error(
-                        f"Algorithm {algo.name} {algo.version} produced result that was neither a float or an int {algo.result_type}. Failing algorithm."
+                    future = self._executor.submit(
+                        timed_call, algo.exec_fn, params, priority=algo.priority
                     )
-                    # create a handled failure result
-                    resultPb = pb.Result(
-                        status=pb.ResultStatus.RESULT_STATUS_HANDLED_FAILED,
+                try:
+                    startedAt, duration, algoResult = await asyncio.wait_for(
+                        asyncio.wrap_future(future), timeout
                     )
+                except asyncio.TimeoutError:
+                    self._abandon(algo, future)
+                    raise self._timed_out(algoName, timeout)
+                except asyncio.CancelledError:
+                    # the DAG part was given up on, e.g. by a cancelled call
+                    self._abandon(algo, future)
+                    raise
+                encodeStartedAt = time.perf_counter()
+                self._metrics.queue_wait.observe(startedAt - submittedAt, algoName)
+                self._metrics.execution.observe(duration, algoName)
+
+                # both phases ran on a worker, so are reported after the fact
+                tracer.start_span(
+                    "orca.queue_wait",
+                    parent=span,
+                    start_time=perf_counter_to_ns(submittedAt),
+                ).end(end_time=perf_counter_to_ns(startedAt))
+                tracer.start_span(
+                    "orca.execute",
+                    parent=span,
+                    start_time=perf_counter_to_ns(startedAt),
+                ).end(end_time=perf_counter_to_ns(startedAt + duration))
+
+            encodeSpan = tracer.start_span(
+                "orca.encode",
+                parent=span,
+                start_time=perf_counter_to_ns(encodeStartedAt),
+            )
 
-            elif algo.result_type == ArrayResult:  # type: ignore
-                if isinstance(algoResult, List):
-                    # for lists of numeric values
-                    float_array = pb.FloatArray(values=algoResult)
-                    resultPb = pb.Result(
-                        status=pb.ResultStatus.RESULT_STATUS_SUCEEDED,
-                        float_values=float_array,
+            resultPb = algo.encoder(algoResult.value, algo)
+            encodeSpan.end()
+            self._metrics.encode.observe(
+                time.perf_counter() - encodeStartedAt, algoName
+            )
+            resultBytes = resultPb.ByteSize()
+            self._metrics.result_bytes.observe(resultBytes, algoName)
+            self._metrics.results.inc(algoName, _RESULT_OUTCOMES[resultPb.status])
+            span.set_attribute("orca.outcome", _RESULT_OUTCOMES[resultPb.status])
+            span.set_attribute("orca.result_bytes", resultBytes)
+            if (
+                cacheKey is not None
+                and algo.cache is not None
+                and resultPb.status == pb.ResultStatus.RESULT_STATUS_SUCEEDED
+            ):
+                algo.cache.put(cacheKey, resultPb, resultBytes)
+                if self._result_store is not None:
+                    # written back off the event loop, without delaying the reply
+                    self._result_store.put_async(
+                        cacheKey, algoName, resultPb.SerializeToString()
                     )
-            else:
-                LOGGER.error(
-                    f"Algorithm {algo.name} {algo.version} has unhandled return type {algo.result_type}"
-                )
-                # create a handled failure result
-                resultPb = pb.Result(
-                    status=pb.ResultStatus.RESULT_STATUS_HANDLED_FAILED,
-                )
+            if (
+                localValues is not None
+                and resultPb.status == pb.ResultStatus.RESULT_STATUS_SUCEEDED
+            ):
+                localValues[algoName] = algoResult.value
 
             # create the algorithm result
             algoResultPb = pb.AlgorithmResult(
@@ -541,28 +1215,277 @@ class Processor(OrcaProcessorServicer):  # type: ignore
                 exc_info=True,
             )
 
-            # create a failure result
-            current_time = int(time.time())
+            self._metrics.results.inc(algoName, "unhandled_failure")
+            if encodeSpan is not None:
+                encodeSpan.end()
+            span.set_attribute("orca.outcome", "unhandled_failure")
+            span.record_exception(algo_error)
+
+            return _failed_result(
+                exec_id, algorithm, str(algo_error), traceback.format_exc()
+            )
+
+    def _abandon(self, algo: Algorithm, future: futures.Future) -> None:
+        """
+        Frees the worker of an execution that is no longer waited for: kills
+        its process, or detaches its thread. Batches are stopped once all their
+        executions are abandoned.
+        """
+        if algo.batch is not None:
+            self._batcher(algo).abandon(future)
+        elif algo.executor == "process":
+            self._get_process_executor().terminate(future)
+        else:
+            self._executor.detach(future)
 
-            # create an error struct value with details
-            error_struct = struct_pb2.Struct()
-            json_format.ParseDict(
-                {"error": str(algo_error), "stack_trace": traceback.format_exc()},
-                error_struct,
+    async def _execute_after_dependencies(
+        self,
+        exec_id: str,
+        algorithm: pb.Algorithm,
+        localDependencies: Dict[str, "asyncio.Task[pb.ExecutionResult]"],
+        executionRequest: pb.ExecutionRequest,
+        params: ExecutionParams,
+        localValues: Dict[str, Any],
+        span: Span,
+        windowBytes: Optional[bytes],
+    ) -> pb.ExecutionResult:
+        """
+        Executes an algorithm once the dependencies run for it locally have
+        completed, passing their results on. The algorithm fails without
+        running if any of them failed.
+        """
+        if localDependencies:
+            dependencies = list(executionRequest.algorithm_results)
+            # per algorithm, so none sees local results it does not depend on
+            added: List[Tuple[str, pb.Result, Any]] = []
+            for name, task in localDependencies.items():
+                dependency = (await task).algorithm_result
+                if dependency.result.status != pb.ResultStatus.RESULT_STATUS_SUCEEDED:
+                    algoName = f"{algorithm.name}_{algorithm.version}"
+                    LOGGER.error(
+                        f"Algorithm {algoName} skipped, dependency {name} failed"
+                    )
+                    self._metrics.results.inc(algoName, "unhandled_failure")
+                    return _failed_result(
+                        exec_id, algorithm, f"Dependency {name} failed", ""
+                    )
+                added.append(
+                    (name, dependency.result, localValues.get(name, _UNDECODED))
+                )
+                dependencies.append(dependency)
+            params = ExecutionParams(
+                window=params.window,
+                dependencies=dependencies,
+                dependency_values=params.dependency_values._extend(added),
             )
+        return await self.execute_algorithm(
+            exec_id,
+            algorithm,
+            params,
+            parent_span=span,
+            window_bytes=windowBytes,
+            local_values=localValues,
+        )
 
-            # create the result with unhandled failed status and error info
-            error_result = pb.Result(
-                status=pb.ResultStatus.RESULT_STATUS_UNHANDLED_FAILED,
-                struct_value=error_struct,
-                timestamp=current_time,
+    def _local_plan(self, executionRequest: pb.ExecutionRequest) -> List[str]:
+        """
+        Returns the algorithms to run for a DAG part with `local_dag`: those
+        requested and the local dependencies whose results were not sent,
+        dependencies first.
+        """
+        registry = self._algorithmsSingleton
+        return local_plan(
+            registry._local_graph(),
+            registry._topological_positions(),
+            (f"{a.name}_{a.version}" for a in executionRequest.algorithms),
+            {
+                f"{r.algorithm.name}_{r.algorithm.version}"
+                for r in executionRequest.algorithm_results
+            },
+        )
+
+    async def _execute_dag_part(
+        self,
+        executionRequest: pb.ExecutionRequest,
+        localDag: bool = False,
+        admit: bool = True,
+    ) -> AsyncGenerator[pb.ExecutionResult, None]:
+        """
+        Schedules every algorithm of a DAG part on the running event loop, once
+        admission control lets it in.
+
+        Args:
+            executionRequest (pb.ExecutionRequest): The DAG execution request.
+            localDag (bool): Run missing local dependencies, even without
+                `local_dag`.
+            admit (bool): Whether the DAG part goes through admission control,
+                rather than being limited by its caller.
+
+        Yields:
+            pb.ExecutionResult: Execution results as they complete.
+
+        Raises:
+            ProcessorOverloaded: If admission control rejects the DAG part.
+        """
+        requested: Dict[str, List[pb.Algorithm]] = {}
+        for algorithm in executionRequest.algorithms:
+            requested.setdefault(f"{algorithm.name}_{algorithm.version}", []).append(
+                algorithm
             )
+        plan = None
+        if self._local_dag or localDag:
+            plan = self._local_plan(executionRequest)
+        count = len(executionRequest.algorithms)
+        if plan is not None:
+            # local dependencies are admitted along with the requested algorithms
+            count += sum(1 for name in plan if name not in requested)
+        released = count
+        admission = self._admission if admit else None
+        if admission is not None:
+            rejected = await admission.admit(count)
+            if rejected is not None:
+                self._metrics.admission_rejections.inc(rejected)
+                LOGGER.warning(
+                    f"Rejected DAG part {executionRequest.exec_id} ({rejected}), "
+                    f"{admission.pending} algorithm executions pending"
+                )
+                raise ProcessorOverloaded(
+                    f"Processor is overloaded: {admission.pending} "
+                    "algorithm executions pending"
+                )
+            released = 0
+
+        tasks: List["asyncio.Task[pb.ExecutionResult]"] = []
+        windowPb = executionRequest.window
+        span = self._tracer.start_span(
+            "orca.execute_dag_part",
+            attributes={
+                "orca.exec_id": executionRequest.exec_id,
+                "orca.window_type": (
+                    f"{windowPb.window_type_name}_{windowPb.window_type_version}"
+                ),
+                "orca.algorithm_count": len(executionRequest.algorithms),
+            },
+        )
+        try:
+            # the window and dependency results are converted once per request
+            # and decoded on demand
+            phase = self._tracer.start_span("orca.decode_request", parent=span)
+            window = Window.from_pb(windowPb)
+            dependency_values = DependencyResults(executionRequest.algorithm_results)
+            if not isinstance(self._tracer, NoOpTracer):
+                dependency_values._trace(self._tracer, span)
+            # result cache keys of every cached algorithm share the window
+            registered = self._algorithmsSingleton._algorithms
+            windowBytes = None
+            if any(
+                getattr(registered.get(name), "cache", None) is not None
+                for name in (requested if plan is None else plan)
+            ):
+                windowBytes = _window_bytes(window)
+            phase.end()
+
+            params = ExecutionParams(
+                window=window,
+                dependencies=executionRequest.algorithm_results,
+                dependency_values=dependency_values,
+            )
+            if plan is None:
+                # create tasks for all algorithms
+                tasks = [
+                    asyncio.ensure_future(
+                        self.execute_algorithm(
+                            executionRequest.exec_id,
+                            algorithm,
+                            params,
+                            parent_span=span,
+                            window_bytes=windowBytes,
+                        )
+                    )
+                    for algorithm in executionRequest.algorithms
+                ]
+                reported = set(tasks)
+            else:
+                tasks, reported = self._schedule_local_dag(
+                    executionRequest, plan, requested, params, span, windowBytes
+                )
 
-            # create the algorithm result
-            algo_result = pb.AlgorithmResult(algorithm=algorithm, result=error_result)
+            # execute all tasks concurrently and yield results as they complete
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    result = task.result()
+                    if admission is not None:
+                        admission.release()
+                        released += 1
+                    if task in reported:
+                        yield result
+        finally:
+            # when the DAG part is closed early, its remaining algorithms are
+            # cancelled before their admission slots are given back
+            outstanding = [task for task in tasks if not task.done()]
+            for task in outstanding:
+                task.cancel()
+            if outstanding:
+                await asyncio.gather(*outstanding, return_exceptions=True)
+            if admission is not None and released < count:
+                admission.release(count - released)
+            span.end()
+
+    def _schedule_local_dag(
+        self,
+        executionRequest: pb.ExecutionRequest,
+        plan: List[str],
+        requested: Dict[str, List[pb.Algorithm]],
+        params: ExecutionParams,
+        span: Span,
+        windowBytes: Optional[bytes],
+    ) -> Tuple[List["asyncio.Task[pb.ExecutionResult]"], Set[asyncio.Task]]:
+        """
+        Creates a task per algorithm of a local plan, each waiting for the tasks
+        of its local dependencies, so independent branches run in parallel.
 
-            # create the execution result
-            return pb.ExecutionResult(exec_id=exec_id, algorithm_result=algo_result)
+        Returns:
+            Tuple[List[asyncio.Task], Set[asyncio.Task]]: Every task, and those
+            of the requested algorithms, whose results are streamed back.
+        """
+        registry = self._algorithmsSingleton
+        localValues: Dict[str, Any] = {}
+        nodes: Dict[str, "asyncio.Task[pb.ExecutionResult]"] = {}
+        tasks: List["asyncio.Task[pb.ExecutionResult]"] = []
+        reported: Set[asyncio.Task] = set()
+        for name in plan:
+            localDependencies = {
+                dependency: nodes[dependency]
+                for dependency in registry._local_dependencies(name)
+                if dependency in nodes
+            }
+            if name in requested:
+                algorithms = requested[name]
+            else:
+                algo = registry._algorithms[name]
+                algorithms = [pb.Algorithm(name=algo.name, version=algo.version)]
+            for algorithm in algorithms:
+                task = asyncio.ensure_future(
+                    self._execute_after_dependencies(
+                        executionRequest.exec_id,
+                        algorithm,
+                        localDependencies,
+                        executionRequest,
+                        params,
+                        localValues,
+                        span,
+                        windowBytes,
+                    )
+                )
+                nodes.setdefault(name, task)
+                tasks.append(task)
+                if name in requested:
+                    reported.add(task)
+        return tasks, reported
 
     def ExecuteDagPart(
         self, executionRequest: pb.ExecutionRequest, context: grpc.ServicerContext
@@ -596,33 +1519,23 @@ class Processor(OrcaProcessorServicer):  # type: ignore
                 loop = asyncio.new_event_loop()
                 asyncio.set_event_loop(loop)
 
-            # create tasks for all algorithms
-            tasks = [
-                self.execute_algorithm(
-                    executionRequest.exec_id,
-                    algorithm,
-                    ExecutionParams(
-                        window=executionRequest.window,
-                        dependencies=executionRequest.algorithm_results,
-                    ),
-                )
-                for algorithm in executionRequest.algorithms
-            ]
-
-            # execute all tasks concurrently and yield results as they complete
-            async def process_results() -> AsyncGenerator[pb.ExecutionResult, None]:
-                for completed_task in asyncio.as_completed(tasks):
-                    result = await completed_task
-                    yield result
-
             # run async generator in the event loop
-            async_gen = process_results()
-            while True:
-                try:
-                    result = loop.run_until_complete(async_gen.__anext__())
-                    yield result
-                except StopAsyncIteration:
-                    break
+            async_gen = self._execute_dag_part(executionRequest)
+            try:
+                while True:
+                    try:
+                        result = loop.run_until_complete(async_gen.__anext__())
+                        yield result
+                    except StopAsyncIteration:
+                        break
+            finally:
+                # closed here when the client cancels, rather than whenever this
+                # thread's loop next runs, so admission slots are freed at once
+                loop.run_until_complete(async_gen.aclose())
+
+        except ProcessorOverloaded as e:
+            context.set_trailing_metadata(retry_pushback_metadata(self._retry_after))
+            context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
 
         # capture exceptions
         except Exception as e:
@@ -637,23 +1550,244 @@ class Processor(OrcaProcessorServicer):  # type: ignore
         """
         Returns health status for the processor.
 
+        The processor reports `STATUS_NOT_SERVING` while at least
+        `overload_threshold` algorithm executions are queued, or admission
+        control is at its limit, so Orca-core can back off or route DAG parts
+        elsewhere.
+
         Args:
             HealthCheckRequest (pb.HealthCheckRequest): Incoming request.
             context (grpc.ServicerContext): gRPC context.
 
         Returns:
-            pb.HealthCheckResponse: Health status and optional metrics.
+            pb.HealthCheckResponse: Health status and load metrics.
         """
         _ = HealthCheckRequest
         _ = context
 
         LOGGER.debug("Received health check request")
+        metrics = pb.ProcessorMetrics(
+            active_tasks=self._load.active_tasks,
+            memory_bytes=process_rss_bytes(),
+            cpu_percent=self._load.cpu_percent(),
+            uptime_seconds=self._load.uptime_seconds(),
+        )
+
+        queued = self.queue_length()
+        if self._overload_threshold and queued >= self._overload_threshold:
+            LOGGER.warning(f"Processor is overloaded with {queued} queued executions")
+            return pb.HealthCheckResponse(
+                status=pb.HealthCheckResponse.STATUS_NOT_SERVING,
+                message=f"Processor is overloaded: {queued} executions queued",
+                metrics=metrics,
+            )
+        admission = self._admission
+        if admission is not None and (
+            admission.waiting or admission.pending >= admission.policy.max_pending
+        ):
+            return pb.HealthCheckResponse(
+                status=pb.HealthCheckResponse.STATUS_NOT_SERVING,
+                message=(
+                    f"Processor is overloaded: {admission.pending} executions admitted"
+                ),
+                metrics=metrics,
+            )
+
         return pb.HealthCheckResponse(
             status=pb.HealthCheckResponse.STATUS_SERVING,
             message="Processor is healthy",
-            metrics=pb.ProcessorMetrics(
-                active_tasks=0, memory_bytes=0, cpu_percent=0.0, uptime_seconds=0
-            ),
+            metrics=metrics,
+        )
+
+    def backfill(
+        self,
+        window_type: WindowType,
+        start: dt.datetime,
+        end: dt.datetime,
+        step: dt.timedelta,
+        output: Union[str, Path],
+        metadata_iter: Optional[Iterable[Mapping[str, Any]]] = None,
+        algorithms: Optional[Iterable[str]] = None,
+        output_format: Literal["jsonl", "parquet"] = "jsonl",
+        origin: str = "backfill",
+        checkpoint: Optional[Union[str, Path]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    ) -> BackfillReport:
+        """
+        Runs algorithms over historical windows locally, without Orca-core.
+
+        A window of length `step` is generated every `step` from `start` until
+        `end`, once per metadata of `metadata_iter`. The algorithms the window
+        type triggers run on the processor's executors, with any local
+        dependencies they need, up to `max_in_flight` windows at once, and
+        their results are written to `output` a chunk of windows at a time.
+        Admission control does not apply, as `max_in_flight` limits the load.
+
+        Progress is saved to a checkpoint after every chunk. Calling `backfill`
+        again with the same arguments after an interruption resumes after the
+        last chunk saved. The checkpoint is removed once the backfill
+        completes, so otherwise `output` is overwritten. This runs its own
+        event loop, so it cannot be called from a coroutine.
+
+        Args:
+            window_type (WindowType): The type of the windows to generate.
+            start (dt.datetime): Start of the first window.
+            end (dt.datetime): Time by which the last window starts.
+            step (dt.timedelta): Length of, and interval between, windows.
+            output (str | Path): A JSON Lines file, or a directory of Parquet
+                files.
+            metadata_iter (Optional[Iterable[Mapping[str, Any]]]): Metadata of
+                the windows, e.g. one per asset. Each window is generated once
+                per metadata, in this order (default: one window without
+                metadata).
+            algorithms (Optional[Iterable[str]]): The `name_version` of the
+                algorithms whose results to write, e.g. only a new version.
+                Defaults to every algorithm the window type triggers.
+            output_format (str): `"jsonl"` or `"parquet"`, which requires
+                `pyarrow`.
+            origin (str): Origin of the generated windows.
+            checkpoint (Optional[str | Path]): The checkpoint file. Defaults to
+                `output` with a `.checkpoint.json` suffix.
+            chunk_size (int): Windows written, and checkpointed, at a time.
+            max_in_flight (int): Windows run at once.
+
+        Returns:
+            BackfillReport: Counts and timing of the backfill.
+
+        Raises:
+            ValueError: If the arguments are invalid, or the checkpoint belongs
+                to a different backfill.
+        """
+        if step <= dt.timedelta(0):
+            raise ValueError("step must be positive")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+
+        registry = self._algorithmsSingleton
+        windowName = f"{window_type.name}_{window_type.version}"
+        triggered = [a.full_name for a in registry._window_triggers.get(windowName, [])]
+        names = triggered if algorithms is None else list(algorithms)
+        unknown = [name for name in names if name not in triggered]
+        if unknown:
+            raise ValueError(f"Algorithms {unknown} are not triggered by {windowName}")
+        if not names:
+            raise ValueError(f"No algorithms are triggered by {windowName}")
+        requested = [
+            pb.Algorithm(name=algo.name, version=algo.version)
+            for algo in (registry._algorithms[name] for name in names)
+        ]
+
+        metadatas = [{}] if metadata_iter is None else [dict(m) for m in metadata_iter]
+        steps = max(0, -((start - end) // step))
+        total = steps * len(metadatas)
+
+        writer: ResultWriter
+        if output_format == "jsonl":
+            writer = JsonlWriter(output)
+        elif output_format == "parquet":
+            writer = ParquetWriter(output)
+        else:
+            raise ValueError(
+                f"output_format must be 'jsonl' or 'parquet', not {output_format!r}"
+            )
+        progress = Checkpoint(
+            f"{output}.checkpoint.json" if checkpoint is None else checkpoint,
+            {
+                "window_type": windowName,
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "step": step.total_seconds(),
+                "metadata": metadata_digest(metadatas),
+                "algorithms": names,
+                "origin": origin,
+            },
+        )
+        try:
+            state = progress.load()
+        except BaseException:
+            writer.close()
+            raise
+        skipped = 0 if state is None else state["windows"]
+        writer.restore(0 if state is None else state["position"])
+        if skipped:
+            LOGGER.info(f"Resuming backfill of {windowName} after {skipped} windows")
+
+        def window(index: int) -> Window:
+            time_from = start + (index // len(metadatas)) * step
+            return Window(
+                time_from=time_from,
+                time_to=time_from + step,
+                name=window_type.name,
+                version=window_type.version,
+                origin=origin,
+                metadata=metadatas[index % len(metadatas)],
+            )
+
+        async def run_window(
+            index: int, slots: asyncio.Semaphore
+        ) -> List[pb.ExecutionResult]:
+            async with slots:
+                request = pb.ExecutionRequest(
+                    exec_id=f"backfill-{index}",
+                    window=_window_to_pb(window(index)),
+                    algorithms=requested,
+                )
+                # limited by `max_in_flight` rather than admission control, so
+                # no window is rejected
+                return [
+                    r async for r in self._execute_dag_part(request, True, admit=False)
+                ]
+
+        async def run() -> Tuple[int, int, int]:
+            slots = asyncio.Semaphore(max_in_flight)
+            throughput = Throughput(total, skipped)
+            results = failures = 0
+            done = skipped
+            while done < total:
+                last = min(done + chunk_size, total)
+                chunk = await asyncio.gather(
+                    *(run_window(index, slots) for index in range(done, last))
+                )
+                rows = []
+                for index, executions in zip(range(done, last), chunk):
+                    row = _backfill_window_row(window(index))
+                    for execution in executions:
+                        result = execution.algorithm_result
+                        status = _RESULT_OUTCOMES[result.result.status]
+                        failures += status != "succeeded"
+                        rows.append(
+                            {
+                                **row,
+                                "algorithm": result.algorithm.name,
+                                "version": result.algorithm.version,
+                                "status": status,
+                                "result": _result_value(result.result),
+                            }
+                        )
+                writer.write(rows)
+                results += len(rows)
+                done = last
+                progress.save(done, writer.position())
+                throughput.update(done)
+            throughput.update(done, force=True)
+            return done - skipped, results, failures
+
+        startedAt = time.perf_counter()
+        try:
+            windows, results, failures = asyncio.run(run())
+        finally:
+            writer.close()
+        # complete, so running it again starts over rather than resuming
+        progress.remove()
+        return BackfillReport(
+            windows=windows,
+            skipped=skipped,
+            results=results,
+            failures=failures,
+            seconds=time.perf_counter() - startedAt,
         )
 
     def Register(self) -> None:
@@ -663,7 +1797,9 @@ class Processor(OrcaProcessorServicer):  # type: ignore
         Raises:
             grpc.RpcError: If registration fails.
         """
+        _configure_logging()
         LOGGER.info(f"Preparing to register processor '{self._name}' with Orca Core")
+        self._algorithmsSingleton._freeze()
         LOGGER.debug(
             f"Building registration request with {len(self._algorithmsSingleton._algorithms)} algorithms"
         )
@@ -685,15 +1821,8 @@ class Processor(OrcaProcessorServicer):  # type: ignore
             algo_msg.description = algorithm.description
 
             # manage the return type of the algorithm
-            if algorithm.result_type == ValueResult:  # type: ignore
-                result_type_pb = pb.ResultType.VALUE
-            elif algorithm.result_type == StructResult:  # type: ignore
-                result_type_pb = pb.ResultType.STRUCT
-            elif algorithm.result_type == ArrayResult:  # type: ignore
-                result_type_pb = pb.ResultType.ARRAY
-            elif algorithm.result_type == NoneResult:  # type: ignore
-                result_type_pb = pb.ResultType.NONE
-            else:
+            result_type_pb = _RESULT_TYPES.get(algorithm.result_type)
+            if result_type_pb is None:
                 raise InvalidAlgorithmReturnType(
                     f"Algorithm has return type {algorithm.result_type}, but expected one of `StructResult`, `ValueResult`, `ArrayResult`, `NoneResult`"
                 )
@@ -733,57 +1862,67 @@ class Processor(OrcaProcessorServicer):  # type: ignore
                     dep_msg.processor_name = remote_dep.ProcessorName
                     dep_msg.processor_runtime = remote_dep.ProcessorRuntime
         try:
-            if envs.is_production:
-                # secure channel with TLS
-                with grpc.secure_channel(
-                    envs.ORCA_CORE, grpc.ssl_channel_credentials()
-                ) as channel:
-                    stub = service_pb2_grpc.OrcaCoreStub(channel)
-                    response = stub.RegisterProcessor(registration_request)
-                    LOGGER.info(f"Algorithm registration response received: {response}")
-            else:
-                # insecure channel for local development
-                with grpc.insecure_channel(envs.ORCA_CORE) as channel:
-                    stub = service_pb2_grpc.OrcaCoreStub(channel)
-                    response = stub.RegisterProcessor(registration_request)
-                    LOGGER.info(f"Algorithm registration response received: {response}")
+            response = self._client.RegisterProcessor(registration_request)
+            LOGGER.info(f"Algorithm registration response received: {response}")
         except Exception as e:
             print()
             print(e)
             sys.exit(1)
 
-    def Start(self) -> None:
+    def _enable_reflection(self, server: Union[grpc.Server, grpc.aio.Server]) -> None:
+        """Enables server reflection for service discovery."""
+        # only servers need reflection, so it is not imported with the SDK
+        from grpc_reflection.v1alpha import reflection
+
+        SERVICE_NAMES = (
+            pb.DESCRIPTOR.services_by_name["OrcaProcessor"].full_name,
+            reflection.SERVICE_NAME,
+        )
+        reflection.enable_server_reflection(SERVICE_NAMES, server)
+
+    def Start(self, mode: Literal["sync", "aio"] = "sync") -> None:
         """
         Starts the gRPC server and begins serving algorithm requests.
 
         This includes signal handling for graceful shutdown.
 
+        Args:
+            mode (str): `"sync"` serves from a pool of `max_workers` gRPC threads.
+                `"aio"` serves from a single `grpc.aio` event loop, so the number of
+                concurrent DAG parts is not bound by gRPC threads.
+
         Raises:
             Exception: On server startup failure.
         """
+        if mode not in ("sync", "aio"):
+            raise ValueError(f"Unknown serving mode '{mode}', expected 'sync' or 'aio'")
+        _configure_logging()
+        self._algorithmsSingleton._freeze()
+
+        metricsServer: Optional[MetricsServer] = None
         try:
+            if self._metrics_port is not None:
+                metricsServer = MetricsServer(
+                    self._metrics, self._metrics_port, self._metrics_host
+                )
+                metricsServer.start()
             LOGGER.info(
                 f"Starting Orca Processor '{self._name}' with Python {self._runtime}"
             )
+            if mode == "aio":
+                asyncio.run(self._serve_aio())
+                return
+
             LOGGER.info(f"Initialising gRPC server with {self._max_workers} workers")
 
             server = grpc.server(
                 futures.ThreadPoolExecutor(max_workers=self._max_workers),
-                options=[
-                    ("grpc.max_send_message_length", 50 * 1024 * 1024),  # 50MB
-                    ("grpc.max_receive_message_length", 50 * 1024 * 1024),  # 50MB
-                ],
+                options=SERVER_OPTIONS,
             )
 
             # add our servicer to the server
             service_pb2_grpc.add_OrcaProcessorServicer_to_server(self, server)
-
-            # Enable reflection for service discovery
-            SERVICE_NAMES = (
-                pb.DESCRIPTOR.services_by_name["OrcaProcessor"].full_name,
-                reflection.SERVICE_NAME,
-            )
-            reflection.enable_server_reflection(SERVICE_NAMES, server)
+            self._enable_reflection(server)
 
             # add the server port
             port = server.add_insecure_port(self._processorConnStr)
@@ -797,9 +1936,6 @@ class Processor(OrcaProcessorServicer):  # type: ignore
 
             LOGGER.info("Server started successfully")
 
-            # setup graceful shutdown
-            import signal
-
             def handle_shutdown(signum: int, frame: Any) -> None:
                 _, _ = signum, frame
                 LOGGER.info("Received shutdown signal, stopping server...")
@@ -816,8 +1952,59 @@ class Processor(OrcaProcessorServicer):  # type: ignore
             LOGGER.error(f"Failed to start server: {str(e)}", exc_info=True)
             raise
         finally:
+            if metricsServer is not None:
+                metricsServer.stop()
+            self._executor.shutdown(wait=False)
+            if self._process_executor is not None:
+                self._process_executor.shutdown(wait=False)
             LOGGER.info("Server shutdown complete")
 
+    async def _start_aio_server(
+        self, address: Optional[str] = None
+    ) -> Tuple[grpc.aio.Server, int]:
+        """
+        Builds and starts a `grpc.aio` server for this processor.
+
+        Args:
+            address (Optional[str]): Address to bind. Defaults to the processor address.
+
+        Returns:
+            Tuple[grpc.aio.Server, int]: The started server and its bound port.
+        """
+        address = self._processorConnStr if address is None else address
+        LOGGER.info("Initialising grpc.aio server")
+
+        server = grpc.aio.server(options=SERVER_OPTIONS)
+        service_pb2_grpc.add_OrcaProcessorServicer_to_server(
+            _AioProcessorServicer(self), server
+        )
+        self._enable_reflection(server)
+
+        port = server.add_insecure_port(address)
+        if port == 0:
+            raise RuntimeError(f"Failed to bind to address {address}")
+        LOGGER.info(f"Server listening on address {address}")
+
+        await server.start()
+        LOGGER.info("Server started successfully")
+        return server, port
+
+    async def _serve_aio(self) -> None:
+        """Serves the processor on the running event loop until shutdown."""
+        server, _ = await self._start_aio_server()
+
+        loop = asyncio.get_running_loop()
+
+        def handle_shutdown() -> None:
+            LOGGER.info("Received shutdown signal, stopping server...")
+            loop.create_task(server.stop(grace=5))  # 5 seconds grace period
+
+        loop.add_signal_handler(signal.SIGTERM, handle_shutdown)
+        loop.add_signal_handler(signal.SIGINT, handle_shutdown)
+
+        LOGGER.info("Server is ready for requests")
+        await server.wait_for_termination()
+
     def algorithm(
         self,
         name: str,
@@ -825,6 +2012,11 @@ class Processor(OrcaProcessorServicer):  # type: ignore
         window_type: WindowType,
         description: Optional[str] = None,
         depends_on: List[Callable[..., Any]] = [],
+        executor: ExecutorKind = "thread",
+        cache: Union[bool, CachePolicy] = False,
+        timeout: Optional[float] = None,
+        priority: Optional[int] = None,
+        batch: Union[bool, BatchPolicy] = False,
     ) -> Callable[[T], T]:
         """
         Decorator for registering a function as an Orca algorithm.
@@ -835,6 +2027,31 @@ class Processor(OrcaProcessorServicer):  # type: ignore
             window_type (WindowType): Triggering window type
             depends_on (List[Callable]): List of dependent algorithm functions.
             dscription: The description of the algorithm
+            executor (str): `"thread"` (default) runs the algorithm on the processor's
+                thread pool. `"process"` runs it on a pool of worker processes, for
+                CPU bound algorithms that hold the GIL. The algorithm must be defined
+                at the top level of a module for the workers to import it.
+                `async def` algorithms are awaited on the serving event loop
+                instead, and cannot use `"process"`.
+            cache (bool | CachePolicy): Cache the algorithm's successful results,
+                keyed on the window and its dependency results, so repeated
+                executions are answered without running it. `True` uses the
+                default `CachePolicy`.
+            timeout (Optional[float]): Seconds the algorithm may take, including
+                any wait for a worker, before it fails as timed out. Process
+                algorithms that time out have their worker process killed.
+                Threads cannot be killed, so a timed out thread algorithm is
+                left to finish on a detached thread, which is replaced in the
+                pool. Defaults to the processor's `algorithm_timeout`.
+            priority (Optional[int]): Scheduling priority of the algorithm when
+                executions are queued for a worker. Higher priorities start
+                sooner, e.g. for latency critical alerting algorithms competing
+                with backfills. Defaults to the window type's `priority`.
+            batch (bool | BatchPolicy): Call the algorithm with a list of the
+                `ExecutionParams` of executions collected across DAG parts, and
+                route each result in the list it returns back to its own DAG
+                part. The algorithm must be annotated to return a list of
+                results. `True` uses the default `BatchPolicy`.
         Returns:
             Callable[[T], T]: The decorated function.
 
@@ -853,6 +2070,24 @@ class Processor(OrcaProcessorServicer):  # type: ignore
                 "versioning (e.g., '1.0.0') without release portions"
             )
 
+        if executor not in ("thread", "process"):
+            raise InvalidAlgorithmArgument(
+                f"Executor '{executor}' must be one of 'thread' or 'process'"
+            )
+
+        if not isinstance(cache, (bool, CachePolicy)):
+            raise InvalidAlgorithmArgument(
+                f"cache must be a bool or a CachePolicy, not {type(cache).__name__}"
+            )
+
+        if timeout is not None and timeout <= 0:
+            raise InvalidAlgorithmArgument("timeout must be positive")
+
+        if not isinstance(batch, (bool, BatchPolicy)):
+            raise InvalidAlgorithmArgument(
+                f"batch must be a bool or a BatchPolicy, not {type(batch).__name__}"
+            )
+
         def inner(algo: T) -> T:
             def wrapper(
                 params: ExecutionParams,
@@ -873,6 +2108,25 @@ class Processor(OrcaProcessorServicer):  # type: ignore
 
                     # tear down
                     # TODO
+                    return result  # type: ignore[return-value]
+                except Exception as e:
+                    LOGGER.error(
+                        f"Algorithm {name}_{version} failed: {str(e)}", exc_info=True
+                    )
+                    raise
+
+            async def async_wrapper(
+                params: ExecutionParams,
+                *args: Any,
+                **kwargs: Any,
+            ) -> returnResult:
+                LOGGER.debug(f"Executing async algorithm {name}_{version}")
+                try:
+                    kwargs["params"] = params
+
+                    LOGGER.info(f"Running algorithm {name}_{version}")
+                    result = await algo(*args, **kwargs)  # type: ignore[misc]
+                    LOGGER.debug(f"Algorithm {name}_{version} execution complete")
                     return result
                 except Exception as e:
                     LOGGER.error(
@@ -880,8 +2134,28 @@ class Processor(OrcaProcessorServicer):  # type: ignore
                     )
                     raise
 
+            is_async = iscoroutinefunction(algo)
+            if is_async and executor == "process":
+                raise InvalidAlgorithmArgument(
+                    f"Algorithm '{name}' is a coroutine function and cannot run with "
+                    "executor 'process'"
+                )
+            if is_async and batch is not False:
+                raise InvalidAlgorithmArgument(
+                    f"Algorithm '{name}' is a coroutine function and cannot be batched"
+                )
+            exec_fn = async_wrapper if is_async else wrapper
+
             sig = signature(algo)
             returnType = sig.return_annotation
+            if batch is not False:
+                # batched algorithms return a result per execution
+                if typing.get_origin(returnType) not in (list, List):
+                    raise InvalidAlgorithmReturnType(
+                        f"Batched algorithm has return type {returnType}, but expected "
+                        "a list of results, e.g. `List[ValueResult]`"
+                    )
+                (returnType,) = typing.get_args(returnType) or (None,)
             if not is_type_in_union(returnType, returnResult):  # type: ignore
                 raise InvalidAlgorithmReturnType(
                     f"Algorithm has return type {sig.return_annotation}, but expected one of `StructResult`, `ValueResult`, `ArrayResult`, `NoneResult`"
@@ -896,13 +2170,23 @@ class Processor(OrcaProcessorServicer):  # type: ignore
                 version=version,
                 description=_description,
                 window_type=window_type,
-                exec_fn=wrapper,
+                exec_fn=exec_fn,
                 processor=self._name,
                 runtime=sys.version,
                 result_type=returnType,
+                executor=executor,
+                is_async=is_async,
+                cache=_build_cache(cache),
+                timeout=timeout,
+                priority=window_type.priority if priority is None else priority,
+                batch=(BatchPolicy() if batch is True else batch) or None,
             )
 
             self._algorithmsSingleton._add_algorithm(algorithm.full_name, algorithm)
+            if executor == "process":
+                register_process_algorithm(
+                    algorithm.full_name, wrapper, algo.__module__
+                )
             self._algorithmsSingleton._add_window_trigger(
                 algorithm.full_window_name, algorithm
             )
@@ -922,15 +2206,110 @@ class Processor(OrcaProcessorServicer):  # type: ignore
                     getattr(dependency, "__orca_is_remote__", False),
                 )
 
-            # TODO: check for circular dependencies. It's not easy to create one in python as the function
-            # needs to be defined before a dependency can be created, and you can only register depencenies
-            # once. But when dependencies are grabbed from a server, circular dependencies will be possible
-
-            return wrapper  # type: ignore[return-value]
+            return exec_fn  # type: ignore[return-value]
 
         return inner
 
 
+class _AioProcessorServicer(OrcaProcessorServicer):  # type: ignore
+    """
+    Adapts a `Processor` to the `grpc.aio` servicer interface.
+
+    `ExecuteDagPart` becomes a native async streaming handler so that every DAG
+    part is driven by the server's event loop rather than a dedicated thread.
+    """
+
+    def __init__(self, processor: Processor):
+        super().__init__()
+        self._processor = processor
+
+    async def ExecuteDagPart(
+        self, executionRequest: pb.ExecutionRequest, context: grpc.aio.ServicerContext
+    ) -> AsyncGenerator[pb.ExecutionResult, None]:
+        LOGGER.info(
+            (
+                f"Received DAG execution request with {len(executionRequest.algorithms)} "
+                f"algorithms and ExecId: {executionRequest.exec_id}"
+            )
+        )
+        try:
+            async for result in self._processor._execute_dag_part(executionRequest):
+                yield result
+        except ProcessorOverloaded as e:
+            context.set_trailing_metadata(
+                retry_pushback_metadata(self._processor._retry_after)
+            )
+            await context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, str(e))
+        except Exception as e:
+            LOGGER.error(f"DAG execution failed: {str(e)}", exc_info=True)
+            context.set_code(grpc.StatusCode.INTERNAL)
+            context.set_details(f"DAG execution failed: {str(e)}")
+            raise
+
+    async def HealthCheck(
+        self,
+        HealthCheckRequest: pb.HealthCheckRequest,
+        context: grpc.aio.ServicerContext,
+    ) -> pb.HealthCheckResponse:
+        return self._processor.HealthCheck(HealthCheckRequest, context)
+
+
+def _failed_result(
+    exec_id: str, algorithm: pb.Algorithm, error: str, stackTrace: str
+) -> pb.ExecutionResult:
+    """Builds the unhandled failure result of an algorithm."""
+    error_result = pb.Result(
+        status=pb.ResultStatus.RESULT_STATUS_UNHANDLED_FAILED,
+        timestamp=int(time.time()),
+    )
+    encode_struct(
+        error_result.struct_value, {"error": error, "stack_trace": stackTrace}
+    )
+    return pb.ExecutionResult(
+        exec_id=exec_id,
+        algorithm_result=pb.AlgorithmResult(algorithm=algorithm, result=error_result),
+    )
+
+
+def _backfill_window_row(window: Window) -> Dict[str, Any]:
+    """Returns the columns describing a window in backfill output."""
+    return {
+        "time_from": window.time_from.isoformat(),
+        "time_to": window.time_to.isoformat(),
+        "window_type": f"{window.name}_{window.version}",
+        "origin": window.origin,
+        "metadata": dict(window.metadata),
+    }
+
+
+def _result_value(result: pb.Result) -> Any:
+    """Converts the value held by a result into plain Python, for output."""
+    which = result.WhichOneof("result_data")
+    if which == "float_values":
+        return list(result.float_values.values)
+    return _decode_result(result)
+
+
+def _window_bytes(window: Window) -> bytes:
+    """Serializes a window deterministically, for result cache keys."""
+    return _window_to_pb(window).SerializeToString(deterministic=True)
+
+
+def _build_cache(cache: Union[bool, CachePolicy]) -> Optional[ResultCache]:
+    """Returns the result cache of an algorithm's `cache` option."""
+    if cache is False:
+        return None
+    return ResultCache(None if cache is True else cache)
+
+
+def _first_set(*values: Optional[V]) -> V:
+    """Returns the first value that is not `None`."""
+    for value in values:
+        if value is not None:
+            return value
+    raise ValueError("No value set")
+
+
 def is_type_in_union(target_type, union_type):  # type: ignore
     """
     Check if target_type is contained within union_type.
@@ -0,0 +1,350 @@
+"""
+Per-algorithm latency and throughput metrics.
+
+The processor records how long each execution waited for a worker, ran and took
+to encode, the size of its result and its outcome, labelled by `name_version`.
+Recording an observation is a bucket lookup and a few additions under a lock, so
+metrics are always on. They can be scraped in the Prometheus text format from an
+optional local HTTP endpoint.
+"""
+
+import bisect
+import logging
+import threading
+from typing import TYPE_CHECKING, Dict, List, Tuple, Callable, Optional, Sequence
+
+if TYPE_CHECKING:
+    from http.server import HTTPServer
+
+LOGGER = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_METRICS_HOST = "127.0.0.1"
+
+# seconds
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+# bytes
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class Counter:
+    """
+    A monotonically increasing count per label set.
+
+    Args:
+        name (str): The metric name.
+        documentation (str): The metric's help text.
+        label_names (Sequence[str]): The names of the metric's labels.
+    """
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            lines.append(
+                f"{self.name}{_format_labels(self.label_names, labels)} "
+                f"{_format_number(value)}"
+            )
+        return lines
+
+
+class Gauge:
+    """
+    A value that goes up and down, read from a function when rendered.
+
+    Args:
+        name (str): The metric name.
+        documentation (str): The metric's help text.
+    """
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._function: Callable[[], float] = lambda: 0.0
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._function = function
+
+    def value(self) -> float:
+        return self._function()
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} gauge",
+            f"{self.name} {_format_number(self.value())}",
+        ]
+
+
+class Histogram:
+    """
+    Observations counted into cumulative buckets per label set.
+
+    Args:
+        name (str): The metric name.
+        documentation (str): The metric's help text.
+        label_names (Sequence[str]): The names of the metric's labels.
+        buckets (Sequence[float]): The upper bounds of the buckets, ascending.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str],
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # per label set: a count per bucket (and one for +Inf), then the sum
+        self._values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def count(self, *labels: str) -> int:
+        entry = self._values.get(labels)
+        return sum(entry[0]) if entry else 0
+
+    def sum(self, *labels: str) -> float:
+        entry = self._values.get(labels)
+        return entry[1][0] if entry else 0.0
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            values = sorted(
+                (labels, list(counts), total[0])
+                for labels, (counts, total) in self._values.items()
+            )
+        names = self.label_names + ("le",)
+        for labels, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                bucketLabels = _format_labels(names, labels + (_format_number(bound),))
+                lines.append(f"{self.name}_bucket{bucketLabels} {cumulative}")
+            formatted = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{formatted} {_format_number(total)}")
+            lines.append(f"{self.name}_count{formatted} {cumulative}")
+        return lines
+
+
+class AlgorithmMetrics:
+    """
+    The metrics a `Processor` records for every algorithm execution.
+
+    Attributes:
+        queue_wait (Histogram): Seconds an execution waited for a worker.
+        execution (Histogram): Seconds an algorithm ran for.
+        encode (Histogram): Seconds spent encoding a result.
+        result_bytes (Histogram): Size of the encoded results, in bytes.
+        results (Counter): Executions by outcome: `succeeded`,
+            `handled_failure` or `unhandled_failure`.
+        timeouts (Counter): Executions that timed out.
+        cache_lookups (Counter): Result cache lookups by result: `hit`,
+            `disk_hit` (from the result store) or `miss`.
+        admission_pending (Gauge): Admitted algorithm executions not yet
+            completed.
+        admission_waiting (Gauge): DAG parts waiting to be admitted.
+        admission_rejections (Counter): DAG parts rejected by admission control,
+            by reason: `full` or `timeout`.
+    """
+
+    def __init__(self) -> None:
+        self.queue_wait = Histogram(
+            "orca_algorithm_queue_wait_seconds",
+            "Time algorithm executions waited for a worker.",
+            ("algorithm",),
+        )
+        self.execution = Histogram(
+            "orca_algorithm_execution_seconds",
+            "Time spent executing algorithms.",
+            ("algorithm",),
+        )
+        self.encode = Histogram(
+            "orca_algorithm_encode_seconds",
+            "Time spent encoding algorithm results.",
+            ("algorithm",),
+        )
+        self.result_bytes = Histogram(
+            "orca_algorithm_result_bytes",
+            "Size of encoded algorithm results.",
+            ("algorithm",),
+            buckets=SIZE_BUCKETS,
+        )
+        self.results = Counter(
+            "orca_algorithm_results_total",
+            "Algorithm executions by outcome.",
+            ("algorithm", "outcome"),
+        )
+        self.timeouts = Counter(
+            "orca_algorithm_timeouts_total",
+            "Algorithm executions that timed out.",
+            ("algorithm",),
+        )
+        self.cache_lookups = Counter(
+            "orca_algorithm_cache_lookups_total",
+            "Result cache lookups of cached algorithms.",
+            ("algorithm", "result"),
+        )
+        self.admission_pending = Gauge(
+            "orca_admission_pending_executions",
+            "Admitted algorithm executions not yet completed.",
+        )
+        self.admission_waiting = Gauge(
+            "orca_admission_waiting_dag_parts",
+            "DAG parts waiting to be admitted.",
+        )
+        self.admission_rejections = Counter(
+            "orca_admission_rejections_total",
+            "DAG parts rejected by admission control.",
+            ("reason",),
+        )
+
+    def render(self) -> str:
+        """Returns every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in (
+            self.queue_wait,
+            self.execution,
+            self.encode,
+            self.result_bytes,
+            self.results,
+            self.timeouts,
+            self.cache_lookups,
+            self.admission_pending,
+            self.admission_waiting,
+            self.admission_rejections,
+        ):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    Serves metrics at `/metrics` from a background thread.
+
+    Args:
+        metrics (AlgorithmMetrics): The metrics to serve.
+        port (int): The port to listen on. 0 picks a free port.
+        host (str): The interface to listen on (default: localhost only).
+    """
+
+    def __init__(
+        self, metrics: AlgorithmMetrics, port: int, host: str = DEFAULT_METRICS_HOST
+    ):
+        # imported here, as only processors serving metrics need it
+        from http.server import ThreadingHTTPServer
+
+        self._metrics = metrics
+        self._server: "HTTPServer" = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def _handler(self) -> type:
+        from http.server import BaseHTTPRequestHandler
+
+        metrics = self._metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                LOGGER.debug(format % args)
+
+        return Handler
+
+    def start(self) -> None:
+        LOGGER.info(f"Serving metrics on port {self.port}")
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="orca-metrics", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
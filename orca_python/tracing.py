@@ -0,0 +1,141 @@
+"""
+Tracing hooks for DAG part execution.
+
+A `Processor` opens a span per `ExecuteDagPart` call with a child span for
+every dependency result decoded, which happens the first time an algorithm
+reads it, and a child span per algorithm with spans for waiting for a worker,
+running the algorithm and encoding its result. Spans go to the processor's
+`Tracer`, which does nothing by default. `OpenTelemetryTracer` forwards them to
+OpenTelemetry when `opentelemetry-api` is installed.
+
+Span times are nanoseconds since the epoch, as in OpenTelemetry. Phases timed
+on a worker thread are reported after the fact with explicit start and end
+times.
+"""
+
+import time
+import importlib
+from typing import Any, Dict, Mapping, Optional, Protocol
+
+# converts `time.perf_counter` readings into nanoseconds since the epoch
+_EPOCH_OFFSET_NS = time.time_ns() - time.perf_counter_ns()
+
+
+def perf_counter_to_ns(value: float) -> int:
+    """Converts a `time.perf_counter` reading into nanoseconds since the epoch."""
+    return _EPOCH_OFFSET_NS + int(value * 1e9)
+
+
+class Span(Protocol):
+    def set_attribute(self, key: str, value: Any) -> None: ...
+
+    def record_exception(self, exception: BaseException) -> None: ...
+
+    def end(self, end_time: Optional[int] = None) -> None: ...
+
+
+class Tracer(Protocol):
+    def start_span(
+        self,
+        name: str,
+        parent: Optional[Span] = None,
+        attributes: Optional[Mapping[str, Any]] = None,
+        start_time: Optional[int] = None,
+    ) -> Span:
+        """
+        Starts a span.
+
+        Args:
+            name (str): The span name.
+            parent (Optional[Span]): The parent span, or `None` for a root span.
+            attributes (Optional[Mapping[str, Any]]): Initial span attributes.
+            start_time (Optional[int]): Start in nanoseconds since the epoch.
+                Defaults to now.
+        """
+        ...
+
+
+class _NoOpSpan:
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        pass
+
+    def end(self, end_time: Optional[int] = None) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoOpSpan()
+
+
+class NoOpTracer:
+    """The default tracer, which records nothing."""
+
+    def start_span(
+        self,
+        name: str,
+        parent: Optional[Span] = None,
+        attributes: Optional[Mapping[str, Any]] = None,
+        start_time: Optional[int] = None,
+    ) -> Span:
+        return _NOOP_SPAN
+
+
+class _OpenTelemetrySpan:
+    def __init__(self, span: Any, otel_trace: Any):
+        self._span = span
+        self._otel_trace = otel_trace
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self._span.set_attribute(key, value)
+
+    def record_exception(self, exception: BaseException) -> None:
+        self._span.record_exception(exception)
+        self._span.set_status(
+            self._otel_trace.Status(self._otel_trace.StatusCode.ERROR, str(exception))
+        )
+
+    def end(self, end_time: Optional[int] = None) -> None:
+        self._span.end(end_time=end_time)
+
+
+class OpenTelemetryTracer:
+    """
+    Forwards spans to OpenTelemetry.
+
+    Args:
+        tracer (Optional[Any]): The `opentelemetry.trace.Tracer` to use. Defaults
+            to the global tracer provider's tracer for `orca_python`.
+
+    Raises:
+        ImportError: If `opentelemetry-api` is not installed.
+    """
+
+    def __init__(self, tracer: Optional[Any] = None):
+        try:
+            self._otel_trace = importlib.import_module("opentelemetry.trace")
+        except ImportError as e:
+            raise ImportError(
+                "OpenTelemetryTracer requires opentelemetry-api: "
+                "pip install opentelemetry-api"
+            ) from e
+        self._tracer = tracer or self._otel_trace.get_tracer("orca_python")
+
+    def start_span(
+        self,
+        name: str,
+        parent: Optional[Span] = None,
+        attributes: Optional[Mapping[str, Any]] = None,
+        start_time: Optional[int] = None,
+    ) -> Span:
+        context = None
+        if isinstance(parent, _OpenTelemetrySpan):
+            context = self._otel_trace.set_span_in_context(parent._span)
+        otelAttributes: Optional[Dict[str, Any]] = (
+            dict(attributes) if attributes else None
+        )
+        span = self._tracer.start_span(
+            name, context=context, attributes=otelAttributes, start_time=start_time
+        )
+        return _OpenTelemetrySpan(span, self._otel_trace)
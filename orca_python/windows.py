@@ -0,0 +1,479 @@
+"""
+Windows, and emitting them to Orca-core.
+
+Everything a window emitter needs lives here rather than with the `Processor`,
+so emitters load the gRPC client without the server, executors, caches and
+metrics a processor needs.
+"""
+
+import re
+import time
+import asyncio
+import logging
+import datetime as dt
+import threading
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+    Mapping,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+)
+from dataclasses import field, dataclass
+
+import grpc
+import service_pb2 as pb
+import google.protobuf.struct_pb2 as struct_pb2
+
+from orca_python.client import OrcaCoreClient, get_default_client
+from orca_python.encoding import decode_value, encode_struct
+from orca_python.exceptions import InvalidWindowArgument, InvalidMetadataFieldArgument
+
+# Regex patterns for validation
+SEMVER_PATTERN = r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)$"
+WINDOW_NAME = r"^[A-Z][a-zA-Z0-9]*$"
+
+# default number of emits awaiting a response at once
+DEFAULT_MAX_IN_FLIGHT = 64
+
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MetadataField:
+    name: str
+    description: str
+
+    def __post_init__(self) -> None:
+        if self.name == "":
+            raise InvalidMetadataFieldArgument("Metadata field name cannot be empty")
+
+        if self.description == "":
+            raise InvalidMetadataFieldArgument(
+                "Metadata field description cannot be empty"
+            )
+
+
+@dataclass
+class WindowType:
+    name: str
+    version: str
+    description: str
+    metadataFields: List[MetadataField] = field(default_factory=list)
+    # scheduling priority of the algorithms it triggers, unless they set one
+    priority: int = 0
+
+    def __post_init__(self) -> None:
+        if not re.match(WINDOW_NAME, self.name):
+            raise InvalidWindowArgument(
+                f"Window name '{self.name}' must be in PascalCase"
+            )
+
+        if not re.match(SEMVER_PATTERN, self.version):
+            raise InvalidWindowArgument(
+                f"Window version '{self.version}' must follow basic semantic "
+                "versioning (e.g., '1.0.0') without release portions"
+            )
+
+        _seenFields = set()
+        for field in self.metadataFields:
+            if field in _seenFields:
+                raise InvalidWindowArgument(
+                    f"Two or more metadata fields provided with the same name:'{field.name}' and description@ '{field.description}"
+                )
+            else:
+                _seenFields.add(field)
+
+
+class WindowMetadata(Mapping[str, Any]):
+    """
+    Read-only view of a window's protobuf metadata.
+
+    Each field is decoded into a Python object the first time it is read, and
+    the decoded value is cached. A single instance is shared by every algorithm
+    of an `ExecutionRequest`.
+    """
+
+    def __init__(self, metadata: struct_pb2.Struct):
+        self._struct = metadata
+        self._decoded: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._decoded[key]
+        except KeyError:
+            pass
+        # indexing a protobuf map inserts missing keys, so check first
+        if key not in self._struct.fields:
+            raise KeyError(key)
+        value = decode_value(self._struct.fields[key])
+        self._decoded[key] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._struct.fields)
+
+    def __len__(self) -> int:
+        return len(self._struct.fields)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._struct.fields
+
+    def __repr__(self) -> str:
+        return f"WindowMetadata({self.to_dict()})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (dict, (self.to_dict(),))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a decoded, mutable copy of the metadata."""
+        return {key: self[key] for key in self}
+
+
+@dataclass
+class Window:
+    time_from: dt.datetime
+    time_to: dt.datetime
+    name: str
+    version: str
+    origin: str
+    metadata: Mapping[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_pb(cls, window: pb.Window) -> "Window":
+        """
+        Converts a protobuf window. The metadata is wrapped in a lazily decoded,
+        read-only `WindowMetadata` rather than being decoded up front.
+        """
+        return cls(
+            time_from=window.time_from.ToDatetime(),
+            time_to=window.time_to.ToDatetime(),
+            name=window.window_type_name,
+            version=window.window_type_version,
+            origin=window.origin,
+            metadata=WindowMetadata(window.metadata),
+        )
+
+
+def _window_to_pb(window: Window) -> pb.Window:
+    """Converts a `Window` into its protobuf form."""
+    window_pb = pb.Window(
+        window_type_name=window.name,
+        window_type_version=window.version,
+        origin=window.origin,
+    )
+    window_pb.time_from.FromDatetime(window.time_from)
+    window_pb.time_to.FromDatetime(window.time_to)
+
+    # parse out the metadata
+    if isinstance(window.metadata, WindowMetadata):
+        # still in its protobuf form
+        window_pb.metadata.CopyFrom(window.metadata._struct)
+    else:
+        encode_struct(window_pb.metadata, window.metadata)
+    return window_pb
+
+
+def EmitWindow(window: Window, client: Optional[OrcaCoreClient] = None) -> None:
+    """
+    Emits a window to Orca-core.
+
+    Args:
+        window (Window): The window to emit.
+        client (Optional[OrcaCoreClient]): The connection to use. Defaults to the
+            process wide client, so the connection is reused between windows.
+
+    Raises:
+        grpc.RpcError: If the emit fails.
+    """
+    LOGGER.debug(f"Emitting window: {window}")
+
+    client = get_default_client() if client is None else client
+    response = client.EmitWindow(_window_to_pb(window))
+    LOGGER.debug(f"Window emitted: {response}")
+
+
+@dataclass
+class EmitResult:
+    """
+    The outcome of emitting one window with `EmitWindows`.
+
+    Attributes:
+        window (Window): The emitted window.
+        response (Optional[pb.WindowEmitStatus]): Orca-core's response, if the
+            emit succeeded.
+        error (Optional[Exception]): Why the emit failed, if it did.
+    """
+
+    window: Window
+    response: Optional[pb.WindowEmitStatus] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def EmitWindows(
+    windows: Iterable[Window],
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    client: Optional[OrcaCoreClient] = None,
+) -> List[EmitResult]:
+    """
+    Emits many windows to Orca-core, keeping up to `max_in_flight` requests in
+    flight on one connection instead of waiting for each response in turn.
+
+    Failures are reported per window rather than raised.
+
+    Args:
+        windows (Iterable[Window]): The windows to emit.
+        max_in_flight (int): The most emits awaiting a response at once.
+        client (Optional[OrcaCoreClient]): The connection to use. Defaults to the
+            process wide client.
+
+    Returns:
+        List[EmitResult]: One result per window, in the order given.
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+
+    client = get_default_client() if client is None else client
+    slots = threading.BoundedSemaphore(max_in_flight)
+    results: List[EmitResult] = []
+
+    def on_done(future: grpc.Future, result: EmitResult) -> None:
+        try:
+            result.response = future.result()
+        except Exception as e:
+            result.error = e
+        finally:
+            slots.release()
+
+    for window in windows:
+        result = EmitResult(window=window)
+        results.append(result)
+        try:
+            window_pb = _window_to_pb(window)
+        except Exception as e:
+            result.error = e
+            continue
+
+        slots.acquire()
+        try:
+            future = client.EmitWindowFuture(window_pb)
+        except Exception as e:
+            result.error = e
+            slots.release()
+            continue
+        future.add_done_callback(lambda f, r=result: on_done(f, r))
+
+    # every slot is free again once the last response has arrived
+    for _ in range(max_in_flight):
+        slots.acquire()
+
+    LOGGER.debug(
+        f"Emitted {len(results)} windows, {sum(not r.ok for r in results)} failed"
+    )
+    return results
+
+
+async def EmitWindowsAsync(
+    windows: Iterable[Window],
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    client: Optional[OrcaCoreClient] = None,
+) -> List[EmitResult]:
+    """
+    Emits many windows to Orca-core from an event loop, keeping up to
+    `max_in_flight` requests in flight.
+
+    Failures are reported per window rather than raised.
+
+    Args:
+        windows (Iterable[Window]): The windows to emit.
+        max_in_flight (int): The most emits awaiting a response at once.
+        client (Optional[OrcaCoreClient]): The connection to use. Defaults to the
+            process wide client.
+
+    Returns:
+        List[EmitResult]: One result per window, in the order given.
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+
+    client = get_default_client() if client is None else client
+    slots = asyncio.Semaphore(max_in_flight)
+
+    async def emit(result: EmitResult) -> None:
+        async with slots:
+            try:
+                result.response = await client.EmitWindowAsync(
+                    _window_to_pb(result.window)
+                )
+            except Exception as e:
+                result.error = e
+
+    results = [EmitResult(window=window) for window in windows]
+    await asyncio.gather(*(emit(result) for result in results))
+    return results
+
+
+class WindowEmitter:
+    """
+    Emits windows from a background thread, so producers never wait on
+    Orca-core.
+
+    Windows are buffered and flushed with `EmitWindows` once `flush_size`
+    windows are waiting, or `flush_interval` seconds after the oldest arrived.
+    When `max_buffer_size` windows are waiting, `emit` blocks until the next
+    flush frees up space.
+
+    Args:
+        flush_size (int): Flush once this many windows are buffered.
+        flush_interval (float): The longest a window is buffered, in seconds.
+        max_in_flight (int): The most emits awaiting a response at once.
+        max_buffer_size (Optional[int]): The most windows buffered at once.
+            Defaults to ten times `flush_size`.
+        on_result (Optional[Callable[[EmitResult], None]]): Called with the
+            result of every window. Failures are logged when it is not set.
+        client (Optional[OrcaCoreClient]): The connection to use. Defaults to the
+            process wide client.
+    """
+
+    def __init__(
+        self,
+        flush_size: int = 500,
+        flush_interval: float = 1.0,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        max_buffer_size: Optional[int] = None,
+        on_result: Optional[Callable[[EmitResult], None]] = None,
+        client: Optional[OrcaCoreClient] = None,
+    ):
+        if flush_size < 1:
+            raise ValueError("flush_size must be at least 1")
+        self._flush_size = flush_size
+        self._flush_interval = flush_interval
+        self._max_in_flight = max_in_flight
+        self._max_buffer_size = max(flush_size, max_buffer_size or flush_size * 10)
+        self._on_result = on_result
+        self._client = client
+        self._buffer: List[Window] = []
+        self._oldest: Optional[float] = None
+        self._flush_requested = False
+        self._flushing = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._emitted_total = 0
+        self._failed_total = 0
+        self._thread = threading.Thread(
+            target=self._run, name="orca-window-emitter", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def emitted_total(self) -> int:
+        """The number of windows emitted successfully."""
+        return self._emitted_total
+
+    @property
+    def failed_total(self) -> int:
+        """The number of windows that failed to emit."""
+        return self._failed_total
+
+    def emit(self, window: Window) -> None:
+        """
+        Buffers a window to be emitted.
+
+        Raises:
+            RuntimeError: If the emitter is closed.
+        """
+        with self._condition:
+            while len(self._buffer) >= self._max_buffer_size and not self._closed:
+                self._condition.wait()
+            if self._closed:
+                raise RuntimeError("Cannot emit to a closed WindowEmitter")
+            self._buffer.append(window)
+            # wake the emitter to start the flush timer, or to flush a full batch
+            if len(self._buffer) == 1:
+                self._oldest = time.monotonic()
+                self._condition.notify_all()
+            elif len(self._buffer) >= self._flush_size:
+                self._condition.notify_all()
+
+    def flush(self) -> None:
+        """Blocks until every window buffered so far has been emitted."""
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            while self._buffer or self._flushing:
+                self._condition.wait()
+
+    def close(self) -> None:
+        """Emits the buffered windows and stops the background thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def __enter__(self) -> "WindowEmitter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _take_batch(self) -> Optional[List[Window]]:
+        with self._condition:
+            while True:
+                if self._buffer and (
+                    self._closed
+                    or self._flush_requested
+                    or len(self._buffer) >= self._flush_size
+                ):
+                    break
+                if self._closed:
+                    return None
+                if self._oldest is None or not self._buffer:
+                    self._condition.wait()
+                    continue
+                remaining = self._oldest + self._flush_interval - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(timeout=remaining)
+
+            batch = self._buffer[: self._flush_size]
+            del self._buffer[: self._flush_size]
+            self._oldest = time.monotonic() if self._buffer else None
+            self._flush_requested = self._flush_requested and bool(self._buffer)
+            self._flushing += 1
+            self._condition.notify_all()
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            try:
+                results = EmitWindows(
+                    batch, max_in_flight=self._max_in_flight, client=self._client
+                )
+                for result in results:
+                    if result.ok:
+                        self._emitted_total += 1
+                    else:
+                        self._failed_total += 1
+                    if self._on_result is not None:
+                        self._on_result(result)
+                    elif not result.ok:
+                        LOGGER.warning(
+                            f"Failed to emit window {result.window}: {result.error}"
+                        )
+            except Exception as e:
+                LOGGER.error(f"Window emitter failed to flush: {e}", exc_info=True)
+            finally:
+                with self._condition:
+                    self._flushing -= 1
+                    self._condition.notify_all()
@@ -0,0 +1,198 @@
+import asyncio
+import threading
+
+import grpc
+import pytest
+import service_pb2 as pb
+import service_pb2_grpc
+from google.protobuf import timestamp_pb2
+
+from orca_python import (
+    Processor,
+    WindowType,
+    ValueResult,
+    AdmissionPolicy,
+    ExecutionParams,
+)
+from orca_python.admission import AdmissionController
+
+WindowA = WindowType(name="WindowA", version="1.0.0", description="Test")
+
+
+def test_admits_up_to_the_limit():
+    """DAG parts are admitted while they fit and rejected once full."""
+    controller = AdmissionController(AdmissionPolicy(max_pending=3))
+
+    async def run() -> None:
+        assert await controller.admit(2) is None
+        assert await controller.admit(2) == "full"
+        assert await controller.admit(1) is None
+        controller.release(3)
+        # larger than the limit, but admitted on an idle processor
+        assert await controller.admit(5) is None
+        assert controller.pending == 5
+
+    asyncio.run(run())
+
+
+def test_waiting_dag_parts_are_admitted_in_order():
+    """Waiting DAG parts are admitted in arrival order as room frees up."""
+    controller = AdmissionController(
+        AdmissionPolicy(max_pending=2, max_waiting=2, max_wait=5)
+    )
+    admitted = []
+
+    async def wait(name: str, count: int) -> None:
+        assert await controller.admit(count) is None
+        admitted.append(name)
+
+    async def run() -> None:
+        assert await controller.admit(2) is None
+        first = asyncio.create_task(wait("first", 2))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(wait("second", 1))
+        await asyncio.sleep(0)
+        assert controller.waiting == 2
+        assert await controller.admit(1) == "full"
+
+        controller.release(1)
+        await asyncio.sleep(0.01)
+        # the second DAG part would fit, but queues behind the first
+        assert admitted == []
+        controller.release(1)
+        await first
+        controller.release(2)
+        await second
+        assert admitted == ["first", "second"]
+        assert (controller.pending, controller.waiting) == (1, 0)
+
+    asyncio.run(run())
+
+
+def test_waiting_times_out():
+    """A DAG part is rejected once it has waited for `max_wait`."""
+    controller = AdmissionController(
+        AdmissionPolicy(max_pending=1, max_waiting=1, max_wait=0.05)
+    )
+
+    async def run() -> None:
+        assert await controller.admit(1) is None
+        assert await controller.admit(1) == "timeout"
+        assert (controller.pending, controller.waiting) == (1, 0)
+
+    asyncio.run(run())
+
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        AdmissionPolicy(max_pending=0)
+    with pytest.raises(ValueError):
+        AdmissionPolicy(max_pending=1, max_wait=0)
+
+
+def test_overloaded_processor_rejects_dag_parts():
+    """DAG parts beyond the limit fail with RESOURCE_EXHAUSTED and a retry hint."""
+    proc = Processor("admission", admission=AdmissionPolicy(2, retry_after=0.5))
+    proc._algorithmsSingleton._flush()
+    release = threading.Event()
+
+    @proc.algorithm("Blocking", "1.0.0", WindowA)
+    def blocking(params: ExecutionParams) -> ValueResult:
+        _ = params
+        release.wait(timeout=5)
+        return ValueResult(1.0)
+
+    def request(exec_id: str) -> pb.ExecutionRequest:
+        return pb.ExecutionRequest(
+            exec_id=exec_id,
+            window=pb.Window(
+                time_from=timestamp_pb2.Timestamp(seconds=0),
+                time_to=timestamp_pb2.Timestamp(seconds=1),
+                window_type_name=WindowA.name,
+                window_type_version=WindowA.version,
+                origin="test",
+            ),
+            algorithms=[pb.Algorithm(name="Blocking", version="1.0.0")] * 2,
+        )
+
+    async def run() -> None:
+        server, port = await proc._start_aio_server("localhost:0")
+        try:
+            async with grpc.aio.insecure_channel(f"localhost:{port}") as channel:
+                stub = service_pb2_grpc.OrcaProcessorStub(channel)
+
+                async def collect(exec_id: str) -> list:
+                    return [r async for r in stub.ExecuteDagPart(request(exec_id))]
+
+                first = asyncio.create_task(collect("first"))
+                while proc._admission.pending < 2:  # type: ignore[union-attr]
+                    await asyncio.sleep(0.01)
+
+                call = stub.ExecuteDagPart(request("second"))
+                with pytest.raises(grpc.aio.AioRpcError) as e:
+                    _ = [r async for r in call]
+                assert e.value.code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+                trailers = dict(await call.trailing_metadata())
+                assert trailers["grpc-retry-pushback-ms"] == "500"
+
+                health = proc.HealthCheck(pb.HealthCheckRequest(), context=None)  # type: ignore[arg-type]
+                assert health.status == pb.HealthCheckResponse.STATUS_NOT_SERVING
+
+                release.set()
+                assert len(await first) == 2
+                assert len(await collect("third")) == 2
+        finally:
+            await server.stop(grace=None)
+
+    asyncio.run(run())
+    assert proc.metrics.admission_rejections.value("full") == 1
+    assert proc.metrics.admission_pending.value() == 0
+    assert "orca_admission_rejections_total" in proc.metrics.render()
+
+
+def test_cancelled_dag_part_frees_its_admission_slots():
+    """Closing the sync stream, as gRPC does on cancel, cancels its algorithms."""
+    proc = Processor("admission", admission=AdmissionPolicy(4))
+    proc._algorithmsSingleton._flush()
+    started = threading.Event()
+    release = threading.Event()
+
+    @proc.algorithm("Fast", "1.0.0", WindowA)
+    def fast(params: ExecutionParams) -> ValueResult:
+        _ = params
+        return ValueResult(1.0)
+
+    @proc.algorithm("Blocking", "1.0.0", WindowA)
+    def blocking(params: ExecutionParams) -> ValueResult:
+        _ = params
+        started.set()
+        release.wait(timeout=5)
+        return ValueResult(1.0)
+
+    request = pb.ExecutionRequest(
+        exec_id="cancelled",
+        window=pb.Window(
+            time_from=timestamp_pb2.Timestamp(seconds=0),
+            time_to=timestamp_pb2.Timestamp(seconds=1),
+            window_type_name=WindowA.name,
+            window_type_version=WindowA.version,
+            origin="test",
+        ),
+        algorithms=[
+            pb.Algorithm(name="Fast", version="1.0.0"),
+            pb.Algorithm(name="Blocking", version="1.0.0"),
+        ],
+    )
+    results = proc.ExecuteDagPart(request, context=None)  # type: ignore[arg-type]
+    try:
+        assert next(results).algorithm_result.algorithm.name == "Fast"
+        assert started.wait(timeout=5)
+        assert proc._admission.pending == 1  # type: ignore[union-attr]
+
+        results.close()
+        assert proc._admission.pending == 0  # type: ignore[union-attr]
+        # the running algorithm no longer holds a worker either
+        stats = proc.executor_stats()
+        assert (stats.active_count, stats.detached_count) == (0, 1)
+    finally:
+        release.set()
@@ -13,7 +13,11 @@ from orca_python import (
     ExecutionParams,
 )
 from orca_python.main import Window
-from orca_python.exceptions import InvalidDependency, InvalidAlgorithmArgument
+from orca_python.exceptions import (
+    RegistryFrozen,
+    InvalidDependency,
+    InvalidAlgorithmArgument,
+)
 
 proc = Processor("ml")
 
@@ -190,3 +194,70 @@ def test_registration_works():
     _ = test_algorithm_3
 
     proc.Register()
+
+
+class _RecordingClient:
+    def __init__(self) -> None:
+        self.registrations = []
+
+    def RegisterProcessor(self, registration):
+        self.registrations.append(registration)
+        return pb.Status(received=True)
+
+
+def test_registry_is_frozen_once_registered():
+    """Algorithms can no longer be added once registered with Orca-core."""
+    client = _RecordingClient()
+    frozen = Processor("ml", client=client)  # type: ignore[arg-type]
+    WindowA = WindowType("WindowA", "1.0.0", "Test")
+
+    @frozen.algorithm("First", "1.0.0", WindowA)
+    def first(params: ExecutionParams) -> ValueResult:
+        return ValueResult(1)
+
+    @frozen.algorithm("Second", "1.0.0", WindowA, depends_on=[first])
+    def second(params: ExecutionParams) -> NoneResult:
+        return NoneResult()
+
+    frozen.Register()
+    (registration,) = client.registrations
+    assert [a.result_type for a in registration.supported_algorithms] == [
+        pb.ResultType.VALUE,
+        pb.ResultType.NONE,
+    ]
+    assert registration.supported_algorithms[1].dependencies[0].name == "First"
+
+    with pytest.raises(RegistryFrozen):
+
+        @frozen.algorithm("Third", "1.0.0", WindowA)
+        def third(params: ExecutionParams) -> ValueResult:
+            return ValueResult(1)
+
+    assert "Third_1.0.0" not in frozen._algorithmsSingleton._algorithms
+
+
+def test_remote_stub_registered_before_its_algorithm_is_local():
+    """A stub of an algorithm of the same processor registered later is local."""
+    local = Processor("ml")
+    WindowA = WindowType("WindowA", "1.0.0", "Test")
+    stub = lambda params: None  # noqa: E731
+    stub.__orca_is_remote__ = True  # type: ignore[attr-defined]
+    stub.__orca_metadata__ = {  # type: ignore[attr-defined]
+        "ProcessorName": "ml",
+        "ProcessorRuntime": "",
+        "Name": "Later",
+        "Version": "1.0.0",
+    }
+
+    @local.algorithm("Earlier", "1.0.0", WindowA, depends_on=[stub])
+    def earlier(params: ExecutionParams) -> ValueResult:
+        return ValueResult(1)
+
+    @local.algorithm("Later", "1.0.0", WindowA)
+    def later(params: ExecutionParams) -> ValueResult:
+        return ValueResult(1)
+
+    registry = local._algorithmsSingleton
+    assert registry._local_dependencies("Earlier_1.0.0") == ["Later_1.0.0"]
+    assert registry._topological_order() == ["Later_1.0.0", "Earlier_1.0.0"]
+    assert registry._has_algorithm_fn(earlier) and not registry._has_algorithm_fn(stub)
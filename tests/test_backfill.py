@@ -0,0 +1,205 @@
+import json
+import datetime as dt
+import importlib.util
+from typing import Any, List
+
+import pytest
+
+from orca_python import (
+    Processor,
+    WindowType,
+    ValueResult,
+    StructResult,
+    AdmissionPolicy,
+    ExecutionParams,
+)
+from orca_python.backfill import JsonlWriter
+
+Hourly = WindowType(name="Hourly", version="1.0.0", description="Test")
+START = dt.datetime(2024, 1, 1)
+
+
+def _processor(calls: List[str], **kwargs: Any) -> Processor:
+    proc = Processor("ml", **kwargs)
+    proc._algorithmsSingleton._flush()
+
+    @proc.algorithm("Load", "1.0.0", Hourly)
+    def load(params: ExecutionParams) -> ValueResult:
+        calls.append(f"{params.window.metadata['asset']}@{params.window.time_from}")
+        return ValueResult(params.window.time_from.hour)
+
+    @proc.algorithm("Summary", "1.0.0", Hourly, depends_on=[load])
+    def summary(params: ExecutionParams) -> StructResult:
+        return StructResult(
+            {
+                "asset": params.window.metadata["asset"],
+                "load": params.dependency_values["Load_1.0.0"] * 2,
+            }
+        )
+
+    return proc
+
+
+def _rows(path) -> List[dict]:
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_backfill_writes_every_window(tmp_path):
+    """Each window of the range, per metadata, has a row per algorithm."""
+    calls: List[str] = []
+    output = tmp_path / "out.jsonl"
+    report = _processor(calls).backfill(
+        Hourly,
+        START,
+        START + dt.timedelta(hours=3),
+        dt.timedelta(hours=1),
+        output,
+        metadata_iter=[{"asset": "a"}, {"asset": "b"}],
+    )
+
+    rows = _rows(output)
+    assert (report.windows, report.results, report.failures) == (6, 12, 0)
+    assert len(calls) == 6
+    summaries = [row for row in rows if row["algorithm"] == "Summary"]
+    assert [(r["result"]["asset"], r["result"]["load"]) for r in summaries] == [
+        ("a", 0),
+        ("b", 0),
+        ("a", 2),
+        ("b", 2),
+        ("a", 4),
+        ("b", 4),
+    ]
+    assert summaries[-1]["time_from"] == "2024-01-01T02:00:00"
+    assert summaries[-1]["time_to"] == "2024-01-01T03:00:00"
+
+
+def test_backfill_of_one_algorithm_runs_its_dependencies(tmp_path):
+    """Only the requested results are written, though dependencies still run."""
+    calls: List[str] = []
+    output = tmp_path / "out.jsonl"
+    report = _processor(calls).backfill(
+        Hourly,
+        START,
+        START + dt.timedelta(hours=2),
+        dt.timedelta(hours=1),
+        output,
+        metadata_iter=[{"asset": "a"}],
+        algorithms=["Summary_1.0.0"],
+    )
+
+    assert report.results == 2
+    assert {row["algorithm"] for row in _rows(output)} == {"Summary"}
+    assert len(calls) == 2
+
+    with pytest.raises(ValueError):
+        _processor(calls).backfill(
+            Hourly, START, START, dt.timedelta(hours=1), output, algorithms=["Nope"]
+        )
+
+
+def test_backfill_is_not_limited_by_admission_control(tmp_path):
+    """Windows beyond the admission limit run rather than being rejected."""
+    calls: List[str] = []
+    proc = _processor(calls, admission=AdmissionPolicy(max_pending=4))
+    report = proc.backfill(
+        Hourly,
+        START,
+        START + dt.timedelta(hours=24),
+        dt.timedelta(hours=1),
+        tmp_path / "out.jsonl",
+        metadata_iter=[{"asset": "a"}],
+    )
+
+    assert (report.windows, report.results, report.failures) == (24, 48, 0)
+    assert proc.metrics.admission_rejections.value("full") == 0
+
+
+def test_interrupted_backfill_resumes(tmp_path, monkeypatch):
+    """A backfill run again resumes after its last checkpoint, without duplicates."""
+    calls: List[str] = []
+    output = tmp_path / "out.jsonl"
+    write = JsonlWriter.write
+    writes = []
+
+    def failing_write(self, rows):
+        writes.append(len(rows))
+        if len(writes) == 2:
+            # interrupted part way through writing the second chunk
+            self._file.write(b'{"partial": ')
+            raise KeyboardInterrupt
+        write(self, rows)
+
+    def run(asset: str = "a"):
+        return _processor(calls).backfill(
+            Hourly,
+            START,
+            START + dt.timedelta(hours=5),
+            dt.timedelta(hours=1),
+            output,
+            metadata_iter=[{"asset": asset}],
+            chunk_size=2,
+        )
+
+    monkeypatch.setattr(JsonlWriter, "write", failing_write)
+    with pytest.raises(KeyboardInterrupt):
+        run()
+    monkeypatch.setattr(JsonlWriter, "write", write)
+    calls.clear()
+
+    # a different backfill does not pick up the checkpoint, even with the same
+    # number of metadata
+    with pytest.raises(ValueError, match="different backfill"):
+        _processor(calls).backfill(
+            Hourly, START, START, dt.timedelta(minutes=1), output
+        )
+    with pytest.raises(ValueError, match="different backfill"):
+        run(asset="b")
+
+    report = run()
+    assert (report.skipped, report.windows) == (2, 3)
+    assert len(calls) == 3
+    rows = _rows(output)
+    assert len(rows) == 10
+    assert len({(row["time_from"], row["algorithm"]) for row in rows}) == 10
+
+    # once complete, running it again starts over
+    assert not (tmp_path / "out.jsonl.checkpoint.json").exists()
+    report = run()
+    assert (report.skipped, report.windows) == (0, 5)
+    assert len(_rows(output)) == 10
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("pyarrow") is not None, reason="pyarrow is installed"
+)
+def test_parquet_requires_pyarrow(tmp_path):
+    with pytest.raises(ImportError, match="pyarrow"):
+        _processor([]).backfill(
+            Hourly,
+            START,
+            START + dt.timedelta(hours=1),
+            dt.timedelta(hours=1),
+            tmp_path / "out",
+            output_format="parquet",
+        )
+
+
+def test_parquet_output(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    output = tmp_path / "out"
+    _processor([]).backfill(
+        Hourly,
+        START,
+        START + dt.timedelta(hours=4),
+        dt.timedelta(hours=1),
+        output,
+        metadata_iter=[{"asset": "a"}],
+        output_format="parquet",
+        chunk_size=2,
+    )
+
+    parts = sorted(output.glob("part-*.parquet"))
+    assert len(parts) == 2
+    rows = [row for part in parts for row in pq.read_table(part).to_pylist()]
+    assert len(rows) == 8
+    assert json.loads(rows[-1]["result"]) == {"asset": "a", "load": 6}
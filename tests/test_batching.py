@@ -0,0 +1,203 @@
+import os
+import time
+import asyncio
+import threading
+from typing import List
+
+import pytest
+import service_pb2 as pb
+from google.protobuf import timestamp_pb2
+
+from orca_python import (
+    Processor,
+    WindowType,
+    BatchPolicy,
+    ValueResult,
+    StructResult,
+    ExecutionParams,
+)
+from orca_python.exceptions import (
+    InvalidAlgorithmArgument,
+    InvalidAlgorithmReturnType,
+)
+
+WindowA = WindowType(name="WindowA", version="1.0.0", description="Test")
+
+# algorithms run in worker processes must be importable, so they are registered
+# at module level. The workers import this module to register them.
+processProc = Processor("batching-process", process_max_workers=1)
+
+
+@processProc.algorithm(
+    "BusAlgorithm",
+    "1.0.0",
+    WindowA,
+    executor="process",
+    batch=BatchPolicy(max_size=8, max_wait=0.2),
+)
+def bus_algorithm(params: List[ExecutionParams]) -> List[StructResult]:
+    return [StructResult({"bus": p.window.origin, "pid": os.getpid()}) for p in params]
+
+
+@processProc.algorithm(
+    "HangingBatch",
+    "1.0.0",
+    WindowA,
+    executor="process",
+    batch=BatchPolicy(max_size=8, max_wait=0.05),
+    timeout=1.0,
+)
+def hanging_batch(params: List[ExecutionParams]) -> List[ValueResult]:
+    time.sleep(60)
+    return [ValueResult(0.0) for _ in params]
+
+
+def _request(bus: int, algorithm: str = "Vectorized") -> pb.ExecutionRequest:
+    return pb.ExecutionRequest(
+        exec_id=f"exec-{bus}",
+        window=pb.Window(
+            time_from=timestamp_pb2.Timestamp(seconds=0),
+            time_to=timestamp_pb2.Timestamp(seconds=bus),
+            window_type_name=WindowA.name,
+            window_type_version=WindowA.version,
+            origin=f"bus-{bus}",
+        ),
+        algorithms=[pb.Algorithm(name=algorithm, version="1.0.0")],
+    )
+
+
+def _run_concurrently(proc: Processor, requests: List[pb.ExecutionRequest]) -> list:
+    async def collect(request: pb.ExecutionRequest) -> list:
+        return [result async for result in proc._execute_dag_part(request)]
+
+    async def run() -> list:
+        return await asyncio.gather(*(collect(r) for r in requests))
+
+    return [results[0] for results in asyncio.run(run())]
+
+
+def test_executions_are_batched_across_requests():
+    """Concurrent DAG parts share one call, and get their own results back."""
+    proc = Processor("batching")
+    proc._algorithmsSingleton._flush()
+    calls: List[int] = []
+
+    @proc.algorithm(
+        "Vectorized", "1.0.0", WindowA, batch=BatchPolicy(max_size=8, max_wait=0.2)
+    )
+    def vectorized(params: List[ExecutionParams]) -> List[ValueResult]:
+        calls.append(len(params))
+        return [ValueResult(p.window.time_to.timestamp()) for p in params]
+
+    results = _run_concurrently(proc, [_request(bus) for bus in range(1, 6)])
+
+    assert calls == [5]
+    for bus, result in enumerate(results, start=1):
+        assert result.exec_id == f"exec-{bus}"
+        assert result.algorithm_result.result.single_value == bus
+
+
+def test_full_batches_do_not_wait():
+    """A batch is submitted as soon as it reaches `max_size`."""
+    proc = Processor("batching")
+    proc._algorithmsSingleton._flush()
+    calls: List[int] = []
+
+    @proc.algorithm(
+        "Vectorized", "1.0.0", WindowA, batch=BatchPolicy(max_size=2, max_wait=30)
+    )
+    def vectorized(params: List[ExecutionParams]) -> List[ValueResult]:
+        calls.append(len(params))
+        return [ValueResult(1.0)] * len(params)
+
+    results = _run_concurrently(proc, [_request(bus) for bus in range(4)])
+    assert calls == [2, 2]
+    assert len(results) == 4
+
+
+def test_wrong_number_of_results_fails_the_batch():
+    """Every execution fails when a batch returns the wrong number of results."""
+    proc = Processor("batching")
+    proc._algorithmsSingleton._flush()
+
+    @proc.algorithm("Vectorized", "1.0.0", WindowA, batch=True)
+    def vectorized(params: List[ExecutionParams]) -> List[ValueResult]:
+        return [ValueResult(1.0)]
+
+    results = _run_concurrently(proc, [_request(bus) for bus in range(3)])
+    for result in results:
+        assert (
+            result.algorithm_result.result.status
+            == pb.ResultStatus.RESULT_STATUS_UNHANDLED_FAILED
+        )
+
+
+def test_batched_algorithms_must_return_lists():
+    proc = Processor("batching")
+    proc._algorithmsSingleton._flush()
+
+    with pytest.raises(InvalidAlgorithmReturnType):
+
+        @proc.algorithm("NotAList", "1.0.0", WindowA, batch=True)
+        def not_a_list(params: List[ExecutionParams]) -> ValueResult:
+            return ValueResult(1.0)
+
+    with pytest.raises(InvalidAlgorithmArgument):
+
+        @proc.algorithm("Async", "1.0.0", WindowA, batch=True)
+        async def async_batch(params: List[ExecutionParams]) -> List[ValueResult]:
+            return []
+
+
+def test_process_batch_routes_results_to_their_requests():
+    """A batch run in a worker process returns each result to its own DAG part."""
+    requests = [_request(bus, "BusAlgorithm") for bus in range(1, 5)]
+    results = _run_concurrently(processProc, requests)
+
+    for bus, result in enumerate(results, start=1):
+        assert result.exec_id == f"exec-{bus}"
+        value = result.algorithm_result.result
+        assert value.status == pb.ResultStatus.RESULT_STATUS_SUCEEDED
+        assert value.struct_value["bus"] == f"bus-{bus}"
+        assert value.struct_value["pid"] not in (0, os.getpid())
+
+
+def test_timed_out_process_batch_is_terminated():
+    """A batch whose executions all time out has its worker process killed."""
+    results = _run_concurrently(
+        processProc, [_request(bus, "HangingBatch") for bus in range(2)]
+    )
+    for result in results:
+        assert "timed out" in result.algorithm_result.result.struct_value["error"]
+
+    executor = processProc._get_process_executor()
+    deadline = time.monotonic() + 5
+    while executor.terminations < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert executor.terminations == 1
+
+
+def test_timed_out_thread_batch_is_detached():
+    """A batch whose executions all time out no longer holds a pool thread."""
+    proc = Processor("batching", executor_max_workers=1)
+    proc._algorithmsSingleton._flush()
+    release = threading.Event()
+
+    @proc.algorithm("Hanging", "1.0.0", WindowA, batch=True, timeout=0.5)
+    def hanging(params: List[ExecutionParams]) -> List[ValueResult]:
+        release.wait(timeout=5)
+        return [ValueResult(0.0) for _ in params]
+
+    @proc.algorithm("Vectorized", "1.0.0", WindowA, batch=True, timeout=5)
+    def vectorized(params: List[ExecutionParams]) -> List[ValueResult]:
+        return [ValueResult(1.0) for _ in params]
+
+    results = _run_concurrently(proc, [_request(bus, "Hanging") for bus in range(2)])
+    for result in results:
+        assert "timed out" in result.algorithm_result.result.struct_value["error"]
+    assert proc.executor_stats().detached_total == 1
+
+    # the pool's only thread is free for other work
+    (result,) = _run_concurrently(proc, [_request(0)])
+    assert result.algorithm_result.result.single_value == 1.0
+    release.set()
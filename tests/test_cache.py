@@ -0,0 +1,301 @@
+import time
+import asyncio
+
+import pytest
+import service_pb2 as pb
+from google.protobuf import timestamp_pb2
+
+from orca_python import (
+    Processor,
+    WindowType,
+    CachePolicy,
+    ValueResult,
+    ExecutionParams,
+)
+from orca_python.cache import ResultCache, DiskResultStore
+from orca_python.exceptions import InvalidAlgorithmArgument
+
+WindowA = WindowType(name="WindowA", version="1.0.0", description="Test")
+
+
+def test_cache_evicts_least_recently_used():
+    """Once full, the least recently read result is evicted first."""
+    cache = ResultCache(CachePolicy(max_entries=2))
+    cache.put(b"a", "A", 1)
+    cache.put(b"b", "B", 1)
+    assert cache.get(b"a") == "A"
+    cache.put(b"c", "C", 1)
+
+    assert cache.get(b"b") is None
+    assert (cache.get(b"a"), cache.get(b"c")) == ("A", "C")
+    stats = cache.stats()
+    assert (stats.entries, stats.hits, stats.misses, stats.evictions) == (2, 3, 1, 1)
+
+
+def test_cache_evicts_by_size_and_expiry(monkeypatch):
+    """Results are evicted to stay within `max_bytes`, and once expired."""
+    now = [100.0]
+    monkeypatch.setattr("orca_python.cache.time.monotonic", lambda: now[0])
+    cache = ResultCache(CachePolicy(max_bytes=10, ttl=60))
+    cache.put(b"a", "A", 6)
+    cache.put(b"b", "B", 6)
+    cache.put(b"huge", "H", 11)
+    assert cache.get(b"a") is None
+    assert cache.get(b"huge") is None
+    assert cache.stats().size_bytes == 6
+
+    now[0] += 61
+    assert cache.get(b"b") is None
+    assert cache.stats().entries == 0
+
+
+def _processor(calls: list, result_store=None) -> Processor:
+    proc = Processor("ml", result_store=result_store)
+    proc._algorithmsSingleton._flush()
+
+    @proc.algorithm("Upstream", "1.0.0", WindowA)
+    def upstream(params: ExecutionParams) -> ValueResult:
+        _ = params
+        return ValueResult(0.0)
+
+    @proc.algorithm("Cached", "1.0.0", WindowA, depends_on=[upstream], cache=True)
+    def cached(params: ExecutionParams) -> ValueResult:
+        calls.append(params.window.metadata["bus_id"])
+        if params.window.metadata["bus_id"] < 0:
+            raise ValueError("negative bus id")
+        return ValueResult(params.dependency_values["Upstream_1.0.0"] * 10)
+
+    return proc
+
+
+def _execute(proc: Processor, bus_id: int = 1, upstream: float = 1.0) -> pb.Result:
+    request = pb.ExecutionRequest(
+        exec_id="exec-1",
+        window=pb.Window(
+            time_from=timestamp_pb2.Timestamp(seconds=0),
+            time_to=timestamp_pb2.Timestamp(seconds=1),
+            window_type_name=WindowA.name,
+            window_type_version=WindowA.version,
+            origin="test",
+            metadata={"bus_id": bus_id},
+        ),
+        algorithm_results=[
+            pb.AlgorithmResult(
+                algorithm=pb.Algorithm(name="Upstream", version="1.0.0"),
+                result=pb.Result(single_value=upstream),
+            )
+        ],
+        algorithms=[pb.Algorithm(name="Cached", version="1.0.0")],
+    )
+    (result,) = proc.ExecuteDagPart(request, context=None)  # type: ignore[arg-type]
+    return result.algorithm_result.result
+
+
+def test_repeated_execution_is_answered_from_cache():
+    """A re-sent execution returns the cached result without running again."""
+    calls = []
+    proc = _processor(calls)
+    first = _execute(proc)
+    second = _execute(proc)
+
+    assert first == second
+    assert second.single_value == 10.0
+    assert calls == [1]
+    stats = proc.cache_stats()["Cached_1.0.0"]
+    assert (stats.hits, stats.misses) == (1, 1)
+    assert proc.metrics.cache_lookups.value("Cached_1.0.0", "hit") == 1
+
+
+def test_cache_key_covers_window_and_dependencies():
+    """Different metadata or dependency results are different executions."""
+    calls = []
+    proc = _processor(calls)
+    _execute(proc)
+    _execute(proc, bus_id=2)
+    assert _execute(proc, upstream=2.0).single_value == 20.0
+    assert calls == [1, 2, 1]
+
+
+def test_window_is_serialized_once_per_request(monkeypatch):
+    """Cached algorithms of one DAG part share the serialized window."""
+    import orca_python.main as main
+
+    calls = []
+    proc = _processor(calls)
+
+    @proc.algorithm("AlsoCached", "1.0.0", WindowA, cache=True)
+    def also_cached(params: ExecutionParams) -> ValueResult:
+        _ = params
+        return ValueResult(2.0)
+
+    conversions = []
+    windowToPb = main._window_to_pb
+    monkeypatch.setattr(
+        main, "_window_to_pb", lambda w: conversions.append(w) or windowToPb(w)
+    )
+    request = pb.ExecutionRequest(
+        exec_id="exec-1",
+        window=pb.Window(
+            time_from=timestamp_pb2.Timestamp(seconds=0),
+            time_to=timestamp_pb2.Timestamp(seconds=1),
+            window_type_name=WindowA.name,
+            window_type_version=WindowA.version,
+            origin="test",
+            metadata={"bus_id": 1},
+        ),
+        algorithm_results=[
+            pb.AlgorithmResult(
+                algorithm=pb.Algorithm(name="Upstream", version="1.0.0"),
+                result=pb.Result(single_value=1.0),
+            )
+        ],
+        algorithms=[
+            pb.Algorithm(name="Cached", version="1.0.0"),
+            pb.Algorithm(name="AlsoCached", version="1.0.0"),
+        ],
+    )
+    results = list(proc.ExecuteDagPart(request, context=None))  # type: ignore[arg-type]
+
+    assert len(results) == 2
+    assert len(conversions) == 1
+    # the key matches the one derived without the request's serialized window
+    assert _execute(proc).single_value == 10.0
+    assert calls == [1]
+
+
+def test_failures_are_not_cached():
+    """Failed executions run again when re-sent."""
+    calls = []
+    proc = _processor(calls)
+    for _ in range(2):
+        result = _execute(proc, bus_id=-1)
+        assert result.status == pb.ResultStatus.RESULT_STATUS_UNHANDLED_FAILED
+    assert calls == [-1, -1]
+
+
+def test_invalid_cache_option():
+    """`cache` must be a bool or a `CachePolicy`."""
+    proc = Processor("ml")
+    with pytest.raises(InvalidAlgorithmArgument):
+        proc.algorithm("Bad", "1.0.0", WindowA, cache=10)  # type: ignore[arg-type]
+
+
+def test_disk_store_survives_reopening(tmp_path):
+    """Stored results are read back by a new store on the same file."""
+    path = tmp_path / "results" / "store.db"
+    store = DiskResultStore(path)
+    store.put(b"key", "Algo_1.0.0", b"result")
+    store.close()
+
+    store = DiskResultStore(path)
+    assert store.get(b"key") == b"result"
+    assert store.get(b"other") is None
+    stats = store.stats()
+    assert (stats.entries, stats.size_bytes, stats.hits, stats.misses) == (1, 6, 1, 1)
+    store.close()
+
+
+def test_disk_store_compacts_least_recently_read(tmp_path):
+    """Beyond `max_bytes`, the least recently read results are deleted."""
+    store = DiskResultStore(tmp_path / "store.db", max_bytes=300)
+    for i in range(3):
+        store.put(bytes([i]), "Algo_1.0.0", b"x" * 100)
+    store.get(bytes([0]))
+    store.put(b"new", "Algo_1.0.0", b"x" * 100)
+
+    # compaction leaves 90% of max_bytes, so two results are deleted
+    assert store.get(bytes([1])) is None
+    assert store.get(bytes([2])) is None
+    assert store.get(bytes([0])) is not None
+    stats = store.stats()
+    assert (stats.entries, stats.size_bytes, stats.evictions) == (2, 200, 2)
+    store.close()
+
+
+def test_corrupt_disk_store_is_replaced(tmp_path):
+    """A corrupt database is moved aside and the store starts empty."""
+    path = tmp_path / "store.db"
+    path.write_bytes(b"not a sqlite database" * 100)
+
+    store = DiskResultStore(path)
+    assert store.stats().entries == 0
+    store.put(b"key", "Algo_1.0.0", b"result")
+    assert store.get(b"key") == b"result"
+    store.close()
+    assert len(list(tmp_path.glob("store.db.corrupt-*"))) == 1
+
+
+def test_restarted_processor_answers_from_disk(tmp_path):
+    """A new processor answers re-sent work from the result store."""
+    path = tmp_path / "store.db"
+    calls = []
+    store = DiskResultStore(path)
+    first = _execute(_processor(calls, store))
+    store.close()
+
+    store = DiskResultStore(path)
+    proc = _processor(calls, store)
+    assert _execute(proc) == first
+    assert calls == [1]
+    assert proc.metrics.cache_lookups.value("Cached_1.0.0", "disk_hit") == 1
+    store.close()
+
+
+def test_disk_store_compaction_does_not_block_the_loop(tmp_path):
+    """Slow store reads and compactions leave the serving loop responsive."""
+    store = DiskResultStore(tmp_path / "store.db", max_bytes=10)
+    compact = store._compact
+
+    def slow_compact(target: int) -> None:
+        time.sleep(0.3)
+        compact(target)
+
+    store._compact = slow_compact  # type: ignore[method-assign]
+    calls = []
+    proc = _processor(calls, store)
+
+    def request(bus_id: int) -> pb.ExecutionRequest:
+        return pb.ExecutionRequest(
+            exec_id=f"exec-{bus_id}",
+            window=pb.Window(
+                time_from=timestamp_pb2.Timestamp(seconds=0),
+                time_to=timestamp_pb2.Timestamp(seconds=1),
+                window_type_name=WindowA.name,
+                window_type_version=WindowA.version,
+                origin="test",
+                metadata={"bus_id": bus_id},
+            ),
+            algorithm_results=[
+                pb.AlgorithmResult(
+                    algorithm=pb.Algorithm(name="Upstream", version="1.0.0"),
+                    result=pb.Result(single_value=1.0),
+                )
+            ],
+            algorithms=[pb.Algorithm(name="Cached", version="1.0.0")],
+        )
+
+    async def run() -> float:
+        gaps = []
+        done = asyncio.Event()
+
+        async def tick() -> None:
+            last = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(0.01)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        ticker = asyncio.create_task(tick())
+        for bus_id in range(1, 4):
+            # each result outgrows `max_bytes`, so every write compacts
+            _ = [r async for r in proc._execute_dag_part(request(bus_id))]
+        await asyncio.get_running_loop().run_in_executor(None, store.flush)
+        done.set()
+        await ticker
+        return max(gaps)
+
+    assert asyncio.run(run()) < 0.15
+    assert calls == [1, 2, 3]
+    assert store.stats().evictions >= 2
+    store.close()
@@ -0,0 +1,181 @@
+import time
+import asyncio
+import datetime as dt
+from concurrent import futures
+
+import grpc
+import pytest
+import service_pb2 as pb
+import service_pb2_grpc
+
+from orca_python import (
+    Window,
+    EmitWindow,
+    EmitWindows,
+    WindowEmitter,
+    OrcaCoreClient,
+    EmitWindowsAsync,
+)
+
+
+class FakeOrcaCore(service_pb2_grpc.OrcaCoreServicer):
+    """Records emitted windows and the connections they arrived on."""
+
+    def __init__(self) -> None:
+        self.windows = []
+        self.peers = set()
+
+    def EmitWindow(self, request, context):
+        if request.origin == "rejected":
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, "rejected origin")
+        self.windows.append(request)
+        self.peers.add(context.peer())
+        return pb.WindowEmitStatus(
+            status=pb.WindowEmitStatus.StatusEnum.PROCESSING_TRIGGERED
+        )
+
+
+@pytest.fixture
+def core():
+    servicer = FakeOrcaCore()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    service_pb2_grpc.add_OrcaCoreServicer_to_server(servicer, server)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    yield servicer, f"localhost:{port}"
+    server.stop(grace=None)
+
+
+def _window(i: int, origin: str = "test") -> Window:
+    now = dt.datetime(2025, 1, 1)
+    return Window(
+        time_from=now,
+        time_to=now + dt.timedelta(seconds=30),
+        name="Every30Second",
+        version="1.0.0",
+        origin=origin,
+        metadata={"bus_id": i},
+    )
+
+
+def test_emit_window_reuses_one_connection(core):
+    """Windows emitted through a client share a single connection."""
+    servicer, address = core
+    with OrcaCoreClient(address=address, secure=False) as client:
+        for i in range(10):
+            EmitWindow(_window(i), client=client)
+
+    assert len(servicer.windows) == 10
+    assert len(servicer.peers) == 1
+    assert [w.metadata["bus_id"] for w in servicer.windows] == list(range(10))
+    assert servicer.windows[0].time_to.ToDatetime() == dt.datetime(2025, 1, 1, 0, 0, 30)
+
+
+def test_client_reconnects_after_close(core):
+    """A closed client opens a new channel on its next call."""
+    servicer, address = core
+    client = OrcaCoreClient(address=address, secure=False)
+    EmitWindow(_window(0), client=client)
+    stub = client.stub
+    client.close()
+    EmitWindow(_window(1), client=client)
+    assert client.stub is not stub
+    client.close()
+
+    assert len(servicer.windows) == 2
+
+
+def _windows_with_failures() -> list:
+    return [_window(i, "rejected" if i % 10 == 0 else "test") for i in range(50)]
+
+
+def test_emit_windows_reports_each_window(core):
+    """Pipelined emits report failures per window, in order, without raising."""
+    servicer, address = core
+    windows = _windows_with_failures()
+    with OrcaCoreClient(address=address, secure=False) as client:
+        results = EmitWindows(windows, max_in_flight=8, client=client)
+
+    assert [r.window for r in results] == windows
+    assert [not r.ok for r in results] == [i % 10 == 0 for i in range(50)]
+    assert results[0].error.code() == grpc.StatusCode.INVALID_ARGUMENT
+    assert results[1].response.status == (
+        pb.WindowEmitStatus.StatusEnum.PROCESSING_TRIGGERED
+    )
+    assert len(servicer.windows) == 45
+
+
+def test_emit_windows_async(core):
+    """The asyncio variant emits through a `grpc.aio` channel."""
+    servicer, address = core
+
+    async def emit() -> list:
+        client = OrcaCoreClient(address=address, secure=False)
+        try:
+            return await EmitWindowsAsync(
+                _windows_with_failures(), max_in_flight=8, client=client
+            )
+        finally:
+            await client.aclose()
+
+    results = asyncio.run(emit())
+    assert [not r.ok for r in results] == [i % 10 == 0 for i in range(50)]
+    assert len(servicer.windows) == 45
+
+
+def test_async_channel_of_a_previous_loop_is_closed(core):
+    """Emitting from a new event loop closes the channel of the previous one."""
+    servicer, address = core
+    client = OrcaCoreClient(address=address, secure=False)
+
+    channels = []
+    for i in range(2):
+        asyncio.run(EmitWindowsAsync([_window(i)], client=client))
+        channels.append(client._aio_channel)
+
+    first, second = channels
+    assert first is not second
+    assert first.get_state() == grpc.ChannelConnectivity.SHUTDOWN
+    assert second.get_state() != grpc.ChannelConnectivity.SHUTDOWN
+    assert client._stale_aio_channels == []
+    assert len(servicer.windows) == 2
+
+    asyncio.run(client.aclose())
+    assert second.get_state() == grpc.ChannelConnectivity.SHUTDOWN
+
+
+def test_window_emitter_flushes_by_size_and_on_close(core):
+    """Buffered windows are flushed once enough arrive, and the rest on close."""
+    servicer, address = core
+    results = []
+    with OrcaCoreClient(address=address, secure=False) as client:
+        emitter = WindowEmitter(
+            flush_size=10, flush_interval=60, on_result=results.append, client=client
+        )
+        for i in range(10):
+            emitter.emit(_window(i))
+        emitter.flush()
+        assert len(servicer.windows) == 10
+
+        for i in range(10, 15):
+            emitter.emit(_window(i, "rejected" if i == 14 else "test"))
+        emitter.close()
+
+    assert len(servicer.windows) == 14
+    assert len(results) == 15
+    assert (emitter.emitted_total, emitter.failed_total) == (14, 1)
+    assert not results[-1].ok
+
+
+def test_window_emitter_flushes_by_time(core):
+    """A partial buffer is flushed once its oldest window has waited long enough."""
+    servicer, address = core
+    with OrcaCoreClient(address=address, secure=False) as client:
+        with WindowEmitter(
+            flush_size=100, flush_interval=0.05, client=client
+        ) as emitter:
+            emitter.emit(_window(0))
+            deadline = time.monotonic() + 5
+            while not servicer.windows and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert len(servicer.windows) == 1
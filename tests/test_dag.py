@@ -0,0 +1,186 @@
+import sys
+import threading
+from typing import Any, List
+
+import pytest
+import service_pb2 as pb
+from google.protobuf import timestamp_pb2
+
+from orca_python import (
+    Processor,
+    WindowType,
+    ValueResult,
+    StructResult,
+    ExecutionParams,
+)
+from orca_python.dag import find_cycle, local_plan, topological_order
+from orca_python.exceptions import InvalidDependency, CircularDependency
+
+WindowA = WindowType(name="WindowA", version="1.0.0", description="Test")
+
+
+def test_topological_order():
+    """Every algorithm comes after its dependencies."""
+    graph = {"D": ["B", "C"], "B": ["A"], "C": ["A"], "A": []}
+    order = topological_order(graph)
+    assert order.index("A") < order.index("B") < order.index("D")
+    assert order.index("C") < order.index("D")
+
+    with pytest.raises(ValueError, match="A -> B -> A"):
+        topological_order({"A": ["B"], "B": ["A"], "C": ["A"]})
+
+
+def test_find_cycle():
+    graph = {"A": ["B"], "B": ["C"], "C": ["A", "D"], "D": []}
+    assert find_cycle(graph, "A") == ["A", "B", "C", "A"]
+    assert find_cycle(graph, "D") is None
+
+
+def test_local_plan_skips_known_results():
+    """Dependencies whose results were sent are not run again."""
+    graph = {"A": [], "B": ["A"], "C": ["A"], "D": ["B", "C"]}
+    order = topological_order(graph)
+    assert local_plan(graph, order, ["D"], set()) == order
+    assert local_plan(graph, order, ["D"], {"B"}) == ["A", "C", "D"]
+    assert local_plan(graph, order, ["D", "Unknown"], {"B", "C"}) == ["D", "Unknown"]
+
+
+def _remote_stub(name: str, processor: str) -> Any:
+    def stub(params: ExecutionParams) -> ValueResult: ...
+
+    stub.__orca_is_remote__ = True  # type: ignore[attr-defined]
+    stub.__orca_metadata__ = {  # type: ignore[attr-defined]
+        "ProcessorName": processor,
+        "ProcessorRuntime": sys.version,
+        "Name": name,
+        "Version": "1.0.0",
+    }
+    return stub
+
+
+def test_circular_dependencies_are_rejected():
+    """A dependency on the processor's own algorithms may not form a cycle."""
+    proc = Processor("ml")
+    proc._algorithmsSingleton._flush()
+
+    @proc.algorithm("First", "1.0.0", WindowA)
+    def first(params: ExecutionParams) -> ValueResult:
+        return ValueResult(1.0)
+
+    @proc.algorithm("Second", "1.0.0", WindowA, depends_on=[first])
+    def second(params: ExecutionParams) -> ValueResult:
+        return ValueResult(1.0)
+
+    registry = proc._algorithmsSingleton
+    with pytest.raises(CircularDependency, match="First_1.0.0 -> Second_1.0.0"):
+        registry._add_dependency("First_1.0.0", _remote_stub("Second", "ml"), True)
+    # the same algorithm on another processor is a different algorithm
+    registry._add_dependency("First_1.0.0", _remote_stub("Second", "other"), True)
+
+    with pytest.raises(InvalidDependency):
+
+        @proc.algorithm(
+            "Third", "1.0.0", WindowA, depends_on=[_remote_stub("Third", "ml")]
+        )
+        def third(params: ExecutionParams) -> ValueResult:
+            return ValueResult(1.0)
+
+
+def _diamond(proc: Processor, calls: List[str], fail: bool = False) -> None:
+    """Registers `Top`, depending on `Left` and `Right`, which depend on `Base`."""
+    proc._algorithmsSingleton._flush()
+    bothBranches = threading.Barrier(2, timeout=5)
+
+    @proc.algorithm("Base", "1.0.0", WindowA)
+    def base(params: ExecutionParams) -> ValueResult:
+        calls.append("Base")
+        if fail:
+            raise ValueError("base failed")
+        return ValueResult(2)
+
+    @proc.algorithm("Left", "1.0.0", WindowA, depends_on=[base])
+    def left(params: ExecutionParams) -> StructResult:
+        calls.append("Left")
+        # both branches run at once, or neither gets past the barrier
+        bothBranches.wait()
+        base = params.dependency_values["Base_1.0.0"]
+        # passed on as returned, rather than as a protobuf double
+        assert isinstance(base, int)
+        return StructResult({"base": base})
+
+    @proc.algorithm("Right", "1.0.0", WindowA, depends_on=[base])
+    def right(params: ExecutionParams) -> ValueResult:
+        calls.append("Right")
+        bothBranches.wait()
+        return ValueResult(params.dependency_values["Base_1.0.0"] * 10)
+
+    @proc.algorithm("Top", "1.0.0", WindowA, depends_on=[left, right])
+    def top(params: ExecutionParams) -> ValueResult:
+        calls.append("Top")
+        # only its own dependencies, not those run for them
+        assert sorted(params.dependency_values) == ["Left_1.0.0", "Right_1.0.0"]
+        left = params.dependency_values["Left_1.0.0"]
+        return ValueResult(left["base"] + params.dependency_values["Right_1.0.0"])
+
+
+def _request(*results: pb.AlgorithmResult) -> pb.ExecutionRequest:
+    return pb.ExecutionRequest(
+        exec_id="exec-1",
+        window=pb.Window(
+            time_from=timestamp_pb2.Timestamp(seconds=0),
+            time_to=timestamp_pb2.Timestamp(seconds=1),
+            window_type_name=WindowA.name,
+            window_type_version=WindowA.version,
+            origin="test",
+        ),
+        algorithm_results=results,
+        algorithms=[pb.Algorithm(name="Top", version="1.0.0")],
+    )
+
+
+def test_local_dependencies_run_in_process():
+    """Missing local dependencies run first, with only requested results returned."""
+    calls: List[str] = []
+    proc = Processor("ml", local_dag=True)
+    _diamond(proc, calls)
+
+    (result,) = proc.ExecuteDagPart(_request(), context=None)  # type: ignore[arg-type]
+
+    assert result.algorithm_result.algorithm.name == "Top"
+    assert result.algorithm_result.result.single_value == 22
+    assert calls[0] == "Base" and calls[-1] == "Top"
+    assert sorted(calls[1:3]) == ["Left", "Right"]
+    assert proc.metrics.results.value("Left_1.0.0", "succeeded") == 1
+
+
+def test_sent_results_are_not_computed_again():
+    calls: List[str] = []
+    proc = Processor("ml", local_dag=True)
+    _diamond(proc, calls)
+    request = _request(
+        pb.AlgorithmResult(
+            algorithm=pb.Algorithm(name="Left", version="1.0.0"),
+            result=pb.Result(struct_value={"base": 1}),
+        ),
+        pb.AlgorithmResult(
+            algorithm=pb.Algorithm(name="Right", version="1.0.0"),
+            result=pb.Result(single_value=5),
+        ),
+    )
+
+    (result,) = proc.ExecuteDagPart(request, context=None)  # type: ignore[arg-type]
+    assert result.algorithm_result.result.single_value == 6
+    assert calls == ["Top"]
+
+
+def test_failed_local_dependency_fails_its_dependants():
+    calls: List[str] = []
+    proc = Processor("ml", local_dag=True)
+    _diamond(proc, calls, fail=True)
+
+    (result,) = proc.ExecuteDagPart(_request(), context=None)  # type: ignore[arg-type]
+
+    assert calls == ["Base"]
+    value = result.algorithm_result.result
+    assert value.status == pb.ResultStatus.RESULT_STATUS_UNHANDLED_FAILED
+    assert "Dependency" in value.struct_value["error"]
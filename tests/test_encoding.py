@@ -0,0 +1,106 @@
+import array
+import datetime as dt
+
+import numpy as np
+import pytest
+import service_pb2 as pb
+from google.protobuf import struct_pb2, json_format
+
+from orca_python.encoding import (
+    decode_struct,
+    encode_struct,
+    decode_float_array,
+    encode_float_array,
+)
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [1, 2.5, True],
+        (x for x in [1.0, 2.5, 1.0]),
+        np.array([1.0, 2.5, 1.0]),
+        np.array([[1, 2.5, 1]], dtype=np.float32),
+        array.array("d", [1.0, 2.5, 1.0]),
+        memoryview(array.array("f", [1.0, 2.5, 1.0])),
+    ],
+)
+def test_float_array_round_trip(values):
+    """Lists, iterables, NumPy arrays and buffers encode to the same message."""
+    message = pb.FloatArray()
+    encode_float_array(message, values)
+    assert list(message.values) == [1.0, 2.5, 1.0]
+
+    decoded = decode_float_array(message)
+    assert isinstance(decoded, np.ndarray)
+    assert decoded.dtype == np.float32
+    assert not decoded.flags.writeable
+    assert decoded.tolist() == [1.0, 2.5, 1.0]
+
+
+def test_empty_float_array_is_set():
+    """An empty array still sets the result's oneof."""
+    result = pb.Result()
+    encode_float_array(result.float_values, np.array([]))
+    assert result.WhichOneof("result_data") == "float_values"
+    assert len(decode_float_array(result.float_values)) == 0
+
+
+@pytest.mark.parametrize("values", ["abc", {"a": 1}, 5])
+def test_float_array_rejects_non_arrays(values):
+    """Values that are not arrays of numbers are rejected."""
+    with pytest.raises(TypeError):
+        encode_float_array(pb.FloatArray(), values)
+
+
+def test_struct_round_trip_matches_json_format():
+    """Plain payloads encode and decode like `json_format`."""
+    payload = {
+        "min": -1.1,
+        "count": 3,
+        "label": "ok",
+        "flag": True,
+        "missing": None,
+        "empty": [],
+        "nested": {"values": [1, 2.5, {"deep": "yes"}], "inner": {}},
+    }
+    expected = struct_pb2.Struct()
+    json_format.ParseDict(payload, expected)
+
+    struct = struct_pb2.Struct()
+    encode_struct(struct, payload)
+    assert struct == expected
+    assert decode_struct(struct) == json_format.MessageToDict(expected)
+
+
+def test_struct_encodes_numpy_and_datetimes():
+    """NumPy values, datetimes and tuples are encoded natively."""
+    timestamp = dt.datetime(2025, 1, 1, 12, 30)
+    struct = struct_pb2.Struct()
+    encode_struct(
+        struct,
+        {
+            "mean": np.float32(1.5),
+            "count": np.int64(7),
+            "ok": np.bool_(True),
+            "series": np.array([[1.0, 2.0], [3.0, 4.0]]),
+            "at": timestamp,
+            "pair": (1, "a"),
+            1: "int key",
+        },
+    )
+    assert decode_struct(struct) == {
+        "mean": 1.5,
+        "count": 7.0,
+        "ok": True,
+        "series": [[1.0, 2.0], [3.0, 4.0]],
+        "at": timestamp.isoformat(),
+        "pair": [1.0, "a"],
+        "1": "int key",
+    }
+
+
+def test_struct_rejects_unknown_types():
+    """Values without a `Struct` representation are rejected."""
+    with pytest.raises(TypeError):
+        encode_struct(struct_pb2.Struct(), {"value": object()})
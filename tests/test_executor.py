@@ -0,0 +1,101 @@
+import time
+import threading
+
+import pytest
+
+from orca_python.executor import ThreadAlgorithmExecutor
+from orca_python.exceptions import ExecutorSaturated
+
+
+def test_executor_runs_on_named_threads():
+    """Work runs on the executor's own, named threads."""
+    executor = ThreadAlgorithmExecutor(max_workers=2, thread_name_prefix="test-algo")
+    name = executor.submit(lambda: threading.current_thread().name).result(timeout=5)
+    assert name.startswith("test-algo_")
+    executor.shutdown()
+
+
+def test_executor_queue_limit_and_stats():
+    """The queue is bounded and its depth and active count are observable."""
+    executor = ThreadAlgorithmExecutor(max_workers=1, max_queue_size=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking() -> int:
+        started.set()
+        release.wait(timeout=5)
+        return 1
+
+    running = executor.submit(blocking)
+    assert started.wait(timeout=5)
+    queued = executor.submit(blocking)
+
+    stats = executor.stats()
+    assert stats.active_count == 1
+    assert stats.queue_length == 1
+
+    with pytest.raises(ExecutorSaturated):
+        executor.submit(blocking)
+    assert executor.stats().rejected_total == 1
+
+    release.set()
+    assert running.result(timeout=5) == 1
+    assert queued.result(timeout=5) == 1
+
+    executor.shutdown()
+    stats = executor.stats()
+    assert stats.completed_total == 2
+    assert stats.active_count == 0
+    assert stats.queue_length == 0
+
+
+def test_executor_propagates_exceptions():
+    """Exceptions raised by the work are set on the future."""
+    executor = ThreadAlgorithmExecutor(max_workers=1)
+
+    def failing() -> None:
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        executor.submit(failing).result(timeout=5)
+    executor.shutdown()
+
+
+def _blocked_executor(priority_aging: float = 1.0):
+    executor = ThreadAlgorithmExecutor(max_workers=1, priority_aging=priority_aging)
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking() -> None:
+        started.set()
+        release.wait(timeout=5)
+
+    executor.submit(blocking)
+    assert started.wait(timeout=5)
+    return executor, release
+
+
+def test_executor_starts_higher_priorities_first():
+    """Queued work starts by priority, then in submission order."""
+    executor, release = _blocked_executor()
+    order: list = []
+    for name, priority in [("low-1", 0), ("low-2", 0), ("high", 5), ("mid", 1)]:
+        executor.submit(order.append, name, priority=priority)
+
+    release.set()
+    executor.shutdown()
+    assert order == ["high", "mid", "low-1", "low-2"]
+
+
+def test_executor_ages_low_priorities():
+    """Low priority work overtakes high priority work it waited longer than."""
+    executor, release = _blocked_executor(priority_aging=0.01)
+    order: list = []
+    executor.submit(order.append, "low", priority=0)
+    time.sleep(0.1)
+    # worth 0.05s of waiting, less than "low" has already waited
+    executor.submit(order.append, "high", priority=5)
+
+    release.set()
+    executor.shutdown()
+    assert order == ["low", "high"]
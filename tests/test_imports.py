@@ -0,0 +1,126 @@
+import os
+import sys
+import json
+import subprocess
+from typing import Dict
+
+import pytest
+
+# modules only a serving processor needs
+SERVER_MODULES = (
+    "orca_python.main",
+    "orca_python.executor",
+    "orca_python.metrics",
+    "orca_python.cache",
+    "grpc_reflection.v1alpha.reflection",
+    "sqlite3",
+    "http.server",
+    "multiprocessing",
+)
+
+
+def _python(code: str, cwd, *args: str, **env: str) -> subprocess.CompletedProcess:
+    """Runs `code` in a fresh interpreter without the processor's environment."""
+    environ = {
+        key: value
+        for key, value in os.environ.items()
+        if key not in ("ORCA_CORE", "PROCESSOR_ADDRESS", "PROCESSOR_PORT")
+    }
+    environ["PYTHONPATH"] = os.pathsep.join(sys.path)
+    environ.update(env)
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        cwd=cwd,
+        env=environ,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+
+def _import_times(stderr: str) -> Dict[str, int]:
+    """Parses `-X importtime` output into the microseconds of each module."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        selfTime, _, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(selfTime)
+    return times
+
+
+def test_import_does_not_require_configuration(tmp_path):
+    """Importing the SDK reads neither the environment nor `orca.json`."""
+    result = _python(
+        "import sys, logging, orca_python; "
+        "print(sorted(m for m in sys.modules if m.startswith(('grpc', 'orca_python')))); "
+        "print(logging.getLogger().handlers)",
+        tmp_path,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines() == ["['orca_python']", "[]"]
+
+
+def test_window_emitters_do_not_load_the_processor(tmp_path):
+    code = (
+        "import sys, json; from orca_python import EmitWindow, Window; "
+        f"print(json.dumps([m for m in {SERVER_MODULES!r} if m in sys.modules]))"
+    )
+    result = _python(code, tmp_path, "-X", "importtime", ORCA_CORE="localhost:1")
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout) == []
+
+    times = _import_times(result.stderr)
+    assert "orca_python.windows" in times
+    # the SDK's own modules, without gRPC and protobuf, which emitters need
+    sdk = sum(t for name, t in times.items() if name.startswith("orca_python"))
+    assert sdk < 100_000, f"orca_python modules took {sdk}us to import"
+
+
+def test_missing_settings_are_reported_on_use(tmp_path):
+    code = (
+        "from orca_python import envs\n"
+        "from orca_python.exceptions import MissingEnvVar\n"
+        "try:\n"
+        "    envs.ORCA_CORE\n"
+        "except MissingEnvVar as e:\n"
+        "    print(e)\n"
+        "print(envs.PROCESSOR_HOST)\n"
+    )
+    result = _python(code, tmp_path, PROCESSOR_ADDRESS="[::]:8080")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines() == ["ORCA_CORE is required", "[::]"]
+
+
+def test_config_file_is_read_once_and_overridden_by_the_environment(tmp_path):
+    (tmp_path / "orca.json").write_text(
+        json.dumps(
+            {
+                "projectName": "test",
+                "orcaConnectionString": "config:1",
+                "processorPort": 5000,
+                "processorConnectionString": "localhost:5001",
+                "executorMaxWorkers": 3,
+            }
+        )
+    )
+    code = (
+        "import builtins\n"
+        "from orca_python import envs\n"
+        "opens = []\n"
+        "realOpen = builtins.open\n"
+        "builtins.open = lambda *a, **k: opens.append(a[0]) or realOpen(*a, **k)\n"
+        "print(envs.ORCA_CORE, envs.PROCESSOR_HOST, envs.EXECUTOR_MAX_WORKERS)\n"
+        "print(len([f for f in opens if str(f).endswith('orca.json')]))\n"
+    )
+    result = _python(code, tmp_path, ORCA_CORE="env:2")
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.splitlines() == ["env:2 localhost 3", "1"]
+
+
+@pytest.mark.parametrize("name", ["Processor", "EmitWindow", "DiskResultStore"])
+def test_exports_resolve_lazily(name):
+    import orca_python
+
+    assert getattr(orca_python, name).__name__ == name
+    assert name in dir(orca_python)
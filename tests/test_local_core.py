@@ -0,0 +1,160 @@
+import time
+import datetime as dt
+from typing import List, Iterator
+from concurrent import futures
+
+import grpc
+import pytest
+import service_pb2 as pb
+import service_pb2_grpc
+
+from orca_python import (
+    Window,
+    Processor,
+    EmitWindow,
+    WindowType,
+    ValueResult,
+    OrcaCoreClient,
+    ExecutionParams,
+)
+from orca_python.windows import _window_to_pb
+from orca_python.local_core import LocalOrcaCore
+
+Minute = WindowType(name="Minute", version="1.0.0", description="Test")
+Unused = WindowType(name="Unused", version="1.0.0", description="Test")
+
+
+@pytest.fixture
+def core() -> Iterator[LocalOrcaCore]:
+    core = LocalOrcaCore(rate=20, max_in_flight=4)
+    yield core
+    core.stop()
+
+
+def _serve(core: LocalOrcaCore, corePort: int, calls: List[float]) -> grpc.Server:
+    """Registers a processor whose `Scaled` algorithm depends on `Raw`."""
+    client = OrcaCoreClient(address=f"localhost:{corePort}", secure=False)
+    proc = Processor("ml", client=client)
+    proc._algorithmsSingleton._flush()
+
+    @proc.algorithm("Raw", "1.0.0", Minute)
+    def raw(params: ExecutionParams) -> ValueResult:
+        return ValueResult(params.window.metadata["value"])
+
+    @proc.algorithm("Scaled", "1.0.0", Minute, depends_on=[raw])
+    def scaled(params: ExecutionParams) -> ValueResult:
+        calls.append(params.dependency_values["Raw_1.0.0"])
+        return ValueResult(params.dependency_values["Raw_1.0.0"] * 10)
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+    service_pb2_grpc.add_OrcaProcessorServicer_to_server(proc, server)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    proc._orcaProcessorConnStr = f"localhost:{port}"
+    proc.Register()
+    return server
+
+
+def _window(i: int, type: WindowType = Minute) -> Window:
+    start = dt.datetime(2024, 1, 1) + dt.timedelta(minutes=i)
+    return Window(
+        time_from=start,
+        time_to=start + dt.timedelta(minutes=1),
+        name=type.name,
+        version=type.version,
+        origin="test",
+        metadata={"value": i},
+    )
+
+
+def test_emitted_windows_run_their_dependencies_in_order(core):
+    """Each window runs `Raw`, then `Scaled` with `Raw`'s result, at the rate set."""
+    corePort = core.start()
+    calls: List[float] = []
+    server = _serve(core, corePort, calls)
+    try:
+        with OrcaCoreClient(address=f"localhost:{corePort}", secure=False) as client:
+            started = time.perf_counter()
+            for i in range(10):
+                EmitWindow(_window(i), client=client)
+            # nothing triggered, so not counted
+            EmitWindow(_window(0, Unused), client=client)
+            assert core.wait_idle(timeout=10)
+            elapsed = time.perf_counter() - started
+    finally:
+        server.stop(grace=None)
+
+    assert sorted(calls) == list(range(10))
+    # 10 windows at 20 a second are spaced over at least 0.45 seconds
+    assert elapsed >= 0.4
+    stats = core.stats()
+    assert (stats.emitted, stats.completed, stats.queued) == (10, 10, 0)
+    assert (stats.failed_results, stats.failed_calls) == (0, 0)
+    assert 0 < stats.latency_p50 <= stats.latency_p99 <= stats.latency_p999
+
+
+def test_full_queue_refuses_windows():
+    core = LocalOrcaCore(max_queue_size=1)
+    core.RegisterProcessor(
+        pb.ProcessorRegistration(
+            name="ml",
+            connection_str="localhost:1",
+            supported_algorithms=[
+                pb.Algorithm(
+                    name="Raw",
+                    version="1.0.0",
+                    window_type=pb.WindowType(name=Minute.name, version=Minute.version),
+                )
+            ],
+        ),
+        context=None,  # type: ignore[arg-type]
+    )
+
+    # not started, so nothing is dispatched
+    statuses = [
+        core.EmitWindow(_window_to_pb(_window(i, type)), context=None).status  # type: ignore[arg-type]
+        for i, type in enumerate([Minute, Minute, Unused])
+    ]
+    assert statuses == [
+        pb.WindowEmitStatus.PROCESSING_TRIGGERED,
+        pb.WindowEmitStatus.TRIGGERING_FAILED,
+        pb.WindowEmitStatus.NO_TRIGGERED_ALGORITHMS,
+    ]
+    assert core.stats().emitted == 1
+
+
+def test_processors_of_a_level_run_at_once(core):
+    """A level takes as long as its slowest processor, not their sum."""
+    corePort = core.start()
+    servers = []
+    try:
+        for name in ("left", "right"):
+            client = OrcaCoreClient(address=f"localhost:{corePort}", secure=False)
+            proc = Processor(name, client=client)
+            proc._algorithmsSingleton._flush()
+
+            @proc.algorithm(name.capitalize(), "1.0.0", Minute)
+            def slow(params: ExecutionParams) -> ValueResult:
+                _ = params
+                time.sleep(0.3)
+                return ValueResult(1.0)
+
+            server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+            service_pb2_grpc.add_OrcaProcessorServicer_to_server(proc, server)
+            port = server.add_insecure_port("localhost:0")
+            server.start()
+            servers.append(server)
+            proc._orcaProcessorConnStr = f"localhost:{port}"
+            proc.Register()
+
+        with OrcaCoreClient(address=f"localhost:{corePort}", secure=False) as client:
+            EmitWindow(_window(0), client=client)
+            assert core.wait_idle(timeout=10)
+    finally:
+        for server in servers:
+            server.stop(grace=None)
+
+    stats = core.stats()
+    assert (stats.completed, stats.failed_results, stats.failed_calls) == (1, 0, 0)
+    # one after the other, the two would take at least 0.6 seconds
+    assert stats.latency_p50 < 0.55
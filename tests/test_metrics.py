@@ -0,0 +1,104 @@
+import urllib.error
+import urllib.request
+
+import pytest
+import service_pb2 as pb
+from google.protobuf import timestamp_pb2
+
+from orca_python import (
+    Processor,
+    WindowType,
+    ValueResult,
+    StructResult,
+    ExecutionParams,
+)
+from orca_python.metrics import Histogram, MetricsServer
+
+proc = Processor("ml")
+
+WindowA = WindowType(name="WindowA", version="1.0.0", description="Test")
+
+
+@proc.algorithm("ValueAlgorithm", "1.0.0", WindowA)
+def value_algorithm(params: ExecutionParams) -> ValueResult:
+    _ = params
+    return ValueResult(1.5)
+
+
+@proc.algorithm("WrongTypeAlgorithm", "1.0.0", WindowA)
+def wrong_type_algorithm(params: ExecutionParams) -> ValueResult:
+    _ = params
+    return ValueResult("not a number")  # type: ignore[arg-type]
+
+
+@proc.algorithm("FailingAlgorithm", "1.0.0", WindowA)
+def failing_algorithm(params: ExecutionParams) -> StructResult:
+    _ = params
+    raise RuntimeError("boom")
+
+
+def _execute(*names: str) -> None:
+    request = pb.ExecutionRequest(
+        exec_id="exec-1",
+        window=pb.Window(
+            time_from=timestamp_pb2.Timestamp(seconds=0),
+            time_to=timestamp_pb2.Timestamp(seconds=1),
+            window_type_name=WindowA.name,
+            window_type_version=WindowA.version,
+            origin="test",
+        ),
+        algorithms=[pb.Algorithm(name=name, version="1.0.0") for name in names],
+    )
+    list(proc.ExecuteDagPart(request, context=None))  # type: ignore[arg-type]
+
+
+def test_histogram_buckets_are_cumulative():
+    """Observations land in the first bucket whose bound they do not exceed."""
+    histogram = Histogram("latency_seconds", "Latency.", ("algorithm",), (0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value, "A_1.0.0")
+
+    assert histogram.count("A_1.0.0") == 4
+    assert histogram.sum("A_1.0.0") == pytest.approx(2.65)
+    lines = histogram.render()
+    assert 'latency_seconds_bucket{algorithm="A_1.0.0",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{algorithm="A_1.0.0",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{algorithm="A_1.0.0",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{algorithm="A_1.0.0"} 4' in lines
+
+
+def test_executions_are_recorded_per_algorithm():
+    """Timings, result sizes and outcomes are recorded for each `name_version`."""
+    _execute("ValueAlgorithm", "WrongTypeAlgorithm", "FailingAlgorithm")
+    metrics = proc.metrics
+
+    assert metrics.queue_wait.count("ValueAlgorithm_1.0.0") == 1
+    assert metrics.execution.count("ValueAlgorithm_1.0.0") == 1
+    assert metrics.encode.count("ValueAlgorithm_1.0.0") == 1
+    assert metrics.result_bytes.sum("ValueAlgorithm_1.0.0") > 0
+    assert metrics.results.value("ValueAlgorithm_1.0.0", "succeeded") == 1
+    assert metrics.results.value("WrongTypeAlgorithm_1.0.0", "handled_failure") == 1
+    assert metrics.results.value("FailingAlgorithm_1.0.0", "unhandled_failure") == 1
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    """The endpoint serves the metrics in the Prometheus text format."""
+    _execute("ValueAlgorithm")
+    server = MetricsServer(proc.metrics, port=0)
+    assert server._server.server_address[0] == "127.0.0.1"
+    server.start()
+    try:
+        url = f"http://127.0.0.1:{server.port}"
+        with urllib.request.urlopen(f"{url}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            body = response.read().decode()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{url}/other", timeout=5)
+    finally:
+        server.stop()
+
+    assert "# TYPE orca_algorithm_execution_seconds histogram" in body
+    assert (
+        'orca_algorithm_results_total{algorithm="ValueAlgorithm_1.0.0",outcome="succeeded"}'
+        in body
+    )
@@ -0,0 +1,106 @@
+import os
+import time
+
+import service_pb2 as pb
+from google.protobuf import timestamp_pb2
+
+from orca_python import (
+    Processor,
+    WindowType,
+    ValueResult,
+    ExecutionParams,
+)
+
+# algorithms run in worker processes must be importable, so they are registered
+# at module level. The workers import this module to register them.
+proc = Processor("ml", process_max_workers=1)
+
+WindowA = WindowType(name="WindowA", version="1.0.0", description="Test")
+
+
+@proc.algorithm("PidAlgorithm", "1.0.0", WindowA, executor="process")
+def pid_algorithm(params: ExecutionParams) -> ValueResult:
+    _ = params
+    return ValueResult(os.getpid())
+
+
+@proc.algorithm("CrashAlgorithm", "1.0.0", WindowA, executor="process")
+def crash_algorithm(params: ExecutionParams) -> ValueResult:
+    _ = params
+    os._exit(1)
+
+
+@proc.algorithm("ThreadAlgorithm", "1.0.0", WindowA)
+def thread_algorithm(params: ExecutionParams) -> ValueResult:
+    _ = params
+    return ValueResult(os.getpid())
+
+
+def _execution_request(*names: str) -> pb.ExecutionRequest:
+    return pb.ExecutionRequest(
+        exec_id="exec-1",
+        window=pb.Window(
+            time_from=timestamp_pb2.Timestamp(seconds=0),
+            time_to=timestamp_pb2.Timestamp(seconds=1),
+            window_type_name=WindowA.name,
+            window_type_version=WindowA.version,
+            origin="test",
+        ),
+        algorithm_results=[
+            pb.AlgorithmResult(
+                algorithm=pb.Algorithm(name="Upstream", version="1.0.0"),
+                result=pb.Result(single_value=2.0),
+            )
+        ],
+        algorithms=[pb.Algorithm(name=name, version="1.0.0") for name in names],
+    )
+
+
+def _run(*names: str) -> dict:
+    results = proc.ExecuteDagPart(_execution_request(*names), context=None)  # type: ignore[arg-type]
+    return {
+        r.algorithm_result.algorithm.name: r.algorithm_result.result for r in results
+    }
+
+
+def test_process_and_thread_algorithms():
+    """Process algorithms run in a worker, alongside thread algorithms."""
+    results = _run("PidAlgorithm", "ThreadAlgorithm")
+    assert results["ThreadAlgorithm"].single_value == os.getpid()
+    assert results["PidAlgorithm"].status == pb.ResultStatus.RESULT_STATUS_SUCEEDED
+    assert results["PidAlgorithm"].single_value not in (0, os.getpid())
+
+
+def test_crashed_worker_is_restarted():
+    """A crashed worker fails its execution and is replaced."""
+    workerPid = _run("PidAlgorithm")["PidAlgorithm"].single_value
+
+    crashed = _run("CrashAlgorithm")["CrashAlgorithm"]
+    assert crashed.status == pb.ResultStatus.RESULT_STATUS_UNHANDLED_FAILED
+    assert "crashed" in crashed.struct_value["error"]
+
+    restarted = _run("PidAlgorithm")["PidAlgorithm"]
+    assert restarted.status == pb.ResultStatus.RESULT_STATUS_SUCEEDED
+    assert restarted.single_value not in (0, workerPid)
+    assert proc._get_process_executor().restarts == 1
+
+
+@proc.algorithm("SleepAlgorithm", "1.0.0", WindowA, executor="process", timeout=0.5)
+def sleep_algorithm(params: ExecutionParams) -> ValueResult:
+    _ = params
+    time.sleep(60)
+    return ValueResult(0)
+
+
+def test_timed_out_worker_is_terminated():
+    """A process algorithm that times out has its worker killed and replaced."""
+    workerPid = _run("PidAlgorithm")["PidAlgorithm"].single_value
+
+    timedOut = _run("SleepAlgorithm")["SleepAlgorithm"]
+    assert timedOut.status == pb.ResultStatus.RESULT_STATUS_UNHANDLED_FAILED
+    assert "timed out after 0.5s" in timedOut.struct_value["error"]
+    assert proc._get_process_executor().terminations == 1
+
+    restarted = _run("PidAlgorithm")["PidAlgorithm"]
+    assert restarted.status == pb.ResultStatus.RESULT_STATUS_SUCEEDED
+    assert restarted.single_value not in (0, workerPid)
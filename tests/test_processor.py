@@ -0,0 +1,373 @@
+import asyncio
+import threading
+
+import grpc
+import numpy as np
+import pytest
+import service_pb2 as pb
+import service_pb2_grpc
+from google.protobuf import timestamp_pb2
+
+from orca_python import (
+    Processor,
+    WindowType,
+    ArrayResult,
+    ValueResult,
+    StructResult,
+    ExecutionParams,
+)
+from orca_python.main import DependencyResults
+from orca_python.exceptions import InvalidAlgorithmArgument
+
+proc = Processor("ml")
+
+WindowA = WindowType(name="WindowA", version="1.0.0", description="Test")
+
+
+def _register_algorithms() -> None:
+    proc._algorithmsSingleton._flush()
+
+    @proc.algorithm("ValueAlgorithm", "1.0.0", WindowA)
+    def value_algorithm(params: ExecutionParams) -> ValueResult:
+        _ = params
+        return ValueResult(1.5)
+
+    @proc.algorithm("StructAlgorithm", "1.0.0", WindowA)
+    def struct_algorithm(params: ExecutionParams) -> StructResult:
+        return StructResult({"origin": params.window.origin})
+
+    _ = value_algorithm, struct_algorithm
+
+
+def _execution_request(exec_id: str = "exec-1") -> pb.ExecutionRequest:
+    return pb.ExecutionRequest(
+        exec_id=exec_id,
+        window=pb.Window(
+            time_from=timestamp_pb2.Timestamp(seconds=0),
+            time_to=timestamp_pb2.Timestamp(seconds=1),
+            window_type_name=WindowA.name,
+            window_type_version=WindowA.version,
+            origin="test",
+        ),
+        algorithms=[
+            pb.Algorithm(name="ValueAlgorithm", version="1.0.0"),
+            pb.Algorithm(name="StructAlgorithm", version="1.0.0"),
+        ],
+    )
+
+
+def _results_by_name(results) -> dict:
+    return {r.algorithm_result.algorithm.name: r.algorithm_result for r in results}
+
+
+def _assert_results(results) -> None:
+    assert len(results) == 2
+    byName = _results_by_name(results)
+    assert byName["ValueAlgorithm"].result.single_value == 1.5
+    assert byName["StructAlgorithm"].result.struct_value["origin"] == "test"
+    for algoResult in byName.values():
+        assert algoResult.result.status == pb.ResultStatus.RESULT_STATUS_SUCEEDED
+
+
+def test_execute_dag_part_sync():
+    """The synchronous servicer streams a result for every algorithm."""
+    _register_algorithms()
+    results = list(proc.ExecuteDagPart(_execution_request(), context=None))  # type: ignore[arg-type]
+    _assert_results(results)
+    assert all(r.exec_id == "exec-1" for r in results)
+
+
+def test_execute_dag_part_aio_server():
+    """The grpc.aio server streams results over a real channel."""
+    _register_algorithms()
+
+    async def run() -> list:
+        server, port = await proc._start_aio_server("localhost:0")
+        try:
+            async with grpc.aio.insecure_channel(f"localhost:{port}") as channel:
+                stub = service_pb2_grpc.OrcaProcessorStub(channel)
+
+                async def collect(request: pb.ExecutionRequest) -> list:
+                    return [result async for result in stub.ExecuteDagPart(request)]
+
+                requests = [_execution_request(f"exec-{i}") for i in range(5)]
+                return await asyncio.gather(*(collect(r) for r in requests))
+        finally:
+            await server.stop(grace=None)
+
+    streams = asyncio.run(run())
+    for i, results in enumerate(streams):
+        _assert_results(results)
+        assert all(r.exec_id == f"exec-{i}" for r in results)
+
+
+def test_async_algorithm_runs_on_serving_loop():
+    """Coroutine algorithms are awaited directly, without the executor."""
+    proc._algorithmsSingleton._flush()
+
+    @proc.algorithm("AsyncAlgorithm", "1.0.0", WindowA)
+    async def async_algorithm(params: ExecutionParams) -> ValueResult:
+        await asyncio.sleep(0.01)
+        return ValueResult(float(len(params.window.origin)))
+
+    _ = async_algorithm
+    assert proc._algorithmsSingleton._algorithms["AsyncAlgorithm_1.0.0"].is_async
+
+    request = _execution_request()
+    del request.algorithms[:]
+    request.algorithms.add(name="AsyncAlgorithm", version="1.0.0")
+
+    submitted = proc.executor_stats().submitted_total
+    results = list(proc.ExecuteDagPart(request, context=None))  # type: ignore[arg-type]
+    assert len(results) == 1
+    result = results[0].algorithm_result.result
+    assert result.status == pb.ResultStatus.RESULT_STATUS_SUCEEDED
+    assert result.single_value == 4.0
+    assert proc.executor_stats().submitted_total == submitted
+
+
+def test_async_algorithm_cannot_use_process_executor():
+    """Coroutine algorithms are rejected for the process executor."""
+    proc._algorithmsSingleton._flush()
+
+    with pytest.raises(InvalidAlgorithmArgument):
+
+        @proc.algorithm("AsyncAlgorithm", "1.0.0", WindowA, executor="process")
+        async def async_algorithm(params: ExecutionParams) -> ValueResult:
+            _ = params
+            return ValueResult(1.0)
+
+
+def test_dependency_values_are_decoded_lazily_once():
+    """Dependency results are decoded on first access and shared."""
+    dependencies = [
+        pb.AlgorithmResult(
+            algorithm=pb.Algorithm(name="Single", version="1.0.0"),
+            result=pb.Result(single_value=2.0),
+        ),
+        pb.AlgorithmResult(
+            algorithm=pb.Algorithm(name="Struct", version="1.0.0"),
+            result=pb.Result(struct_value={"a": {"b": [1, 2]}}),
+        ),
+    ]
+    values = DependencyResults(dependencies)
+
+    assert set(values) == {"Single_1.0.0", "Struct_1.0.0"}
+    assert values._decoded == {}
+    assert values["Single_1.0.0"] == 2.0
+    assert list(values._decoded) == ["Single_1.0.0"]
+    assert values["Struct_1.0.0"] == {"a": {"b": [1, 2]}}
+    assert values["Struct_1.0.0"] is values["Struct_1.0.0"]
+    with pytest.raises(TypeError):
+        values["Single_1.0.0"] = 3.0  # type: ignore[index]
+
+
+def test_dependency_values_shared_across_request():
+    """Every algorithm of a request reads the same window and dependencies."""
+    proc._algorithmsSingleton._flush()
+    seen = []
+
+    @proc.algorithm("ReaderA", "1.0.0", WindowA)
+    def reader_a(params: ExecutionParams) -> ValueResult:
+        seen.append((params.window, params.dependency_values))
+        return ValueResult(params.dependency_values["Upstream_1.0.0"])
+
+    @proc.algorithm("ReaderB", "1.0.0", WindowA)
+    def reader_b(params: ExecutionParams) -> ValueResult:
+        seen.append((params.window, params.dependency_values))
+        return ValueResult(params.dependency_values["Upstream_1.0.0"] * 2)
+
+    _ = reader_a, reader_b
+
+    request = _execution_request()
+    del request.algorithms[:]
+    request.algorithms.add(name="ReaderA", version="1.0.0")
+    request.algorithms.add(name="ReaderB", version="1.0.0")
+    request.algorithm_results.add(
+        algorithm=pb.Algorithm(name="Upstream", version="1.0.0"),
+        result=pb.Result(single_value=3.0),
+    )
+
+    results = _results_by_name(proc.ExecuteDagPart(request, context=None))  # type: ignore[arg-type]
+    assert results["ReaderA"].result.single_value == 3.0
+    assert results["ReaderB"].result.single_value == 6.0
+    assert len(seen) == 2
+    assert seen[0][0] is seen[1][0]
+    assert seen[0][1] is seen[1][1]
+
+
+def test_array_results_and_dependencies():
+    """NumPy array results are encoded, and array dependencies decoded, in bulk."""
+    proc._algorithmsSingleton._flush()
+
+    @proc.algorithm("ArrayAlgorithm", "1.0.0", WindowA)
+    def array_algorithm(params: ExecutionParams) -> ArrayResult:
+        upstream = params.dependency_values["Upstream_1.0.0"]
+        assert isinstance(upstream, np.ndarray)
+        return ArrayResult(upstream * 2)
+
+    _ = array_algorithm
+
+    request = _execution_request()
+    del request.algorithms[:]
+    request.algorithms.add(name="ArrayAlgorithm", version="1.0.0")
+    request.algorithm_results.add(
+        algorithm=pb.Algorithm(name="Upstream", version="1.0.0"),
+        result=pb.Result(float_values=pb.FloatArray(values=[1.0, 2.0, 3.0])),
+    )
+
+    results = _results_by_name(proc.ExecuteDagPart(request, context=None))  # type: ignore[arg-type]
+    result = results["ArrayAlgorithm"].result
+    assert result.status == pb.ResultStatus.RESULT_STATUS_SUCEEDED
+    assert list(result.float_values.values) == [2.0, 4.0, 6.0]
+
+
+def test_health_check_reports_load():
+    """Health checks report in-flight executions and live process metrics."""
+    proc._algorithmsSingleton._flush()
+    started = threading.Event()
+    release = threading.Event()
+
+    @proc.algorithm("BlockingAlgorithm", "1.0.0", WindowA)
+    def blocking_algorithm(params: ExecutionParams) -> ValueResult:
+        _ = params
+        started.set()
+        release.wait(timeout=5)
+        return ValueResult(1.0)
+
+    request = _execution_request()
+    del request.algorithms[:]
+    request.algorithms.append(pb.Algorithm(name="BlockingAlgorithm", version="1.0.0"))
+    runner = threading.Thread(
+        target=lambda: list(proc.ExecuteDagPart(request, context=None))  # type: ignore[arg-type]
+    )
+    runner.start()
+    assert started.wait(timeout=5)
+
+    health = proc.HealthCheck(pb.HealthCheckRequest(), context=None)  # type: ignore[arg-type]
+    assert health.status == pb.HealthCheckResponse.STATUS_SERVING
+    assert health.metrics.active_tasks == 1
+    assert health.metrics.memory_bytes > 0
+    assert health.metrics.cpu_percent >= 0.0
+
+    release.set()
+    runner.join(timeout=5)
+    health = proc.HealthCheck(pb.HealthCheckRequest(), context=None)  # type: ignore[arg-type]
+    assert health.metrics.active_tasks == 0
+
+
+def test_health_check_reports_overload():
+    """A processor with a saturated queue reports that it is not serving."""
+    busy = Processor("busy", executor_max_workers=1, overload_threshold=2)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking() -> None:
+        started.set()
+        release.wait(timeout=5)
+
+    pending = [busy._executor.submit(blocking)]
+    assert started.wait(timeout=5)
+    pending += [busy._executor.submit(blocking) for _ in range(2)]
+
+    health = busy.HealthCheck(pb.HealthCheckRequest(), context=None)  # type: ignore[arg-type]
+    assert health.status == pb.HealthCheckResponse.STATUS_NOT_SERVING
+    assert "2 executions queued" in health.message
+
+    release.set()
+    for future in pending:
+        future.result(timeout=5)
+    health = busy.HealthCheck(pb.HealthCheckRequest(), context=None)  # type: ignore[arg-type]
+    assert health.status == pb.HealthCheckResponse.STATUS_SERVING
+    busy._executor.shutdown()
+
+
+def test_timed_out_thread_algorithm_is_detached():
+    """A thread algorithm that times out fails and its thread is replaced."""
+    slow = Processor("slow", executor_max_workers=1, algorithm_timeout=0.5)
+    slow._algorithmsSingleton._flush()
+    release = threading.Event()
+
+    @slow.algorithm("Hanging", "1.0.0", WindowA)
+    def hanging(params: ExecutionParams) -> ValueResult:
+        _ = params
+        release.wait(timeout=5)
+        return ValueResult(0.0)
+
+    @slow.algorithm("Quick", "1.0.0", WindowA, timeout=5)
+    def quick(params: ExecutionParams) -> ValueResult:
+        _ = params
+        return ValueResult(1.0)
+
+    request = _execution_request()
+    del request.algorithms[:]
+    request.algorithms.add(name="Hanging", version="1.0.0")
+    result = list(slow.ExecuteDagPart(request, context=None))[0]  # type: ignore[arg-type]
+    assert (
+        result.algorithm_result.result.status
+        == pb.ResultStatus.RESULT_STATUS_UNHANDLED_FAILED
+    )
+    assert "timed out" in result.algorithm_result.result.struct_value["error"]
+
+    # the pool's only slot is free again while the hung thread keeps running
+    stats = slow.executor_stats()
+    assert (stats.active_count, stats.detached_count, stats.detached_total) == (0, 1, 1)
+    request.algorithms[0].name = "Quick"
+    result = list(slow.ExecuteDagPart(request, context=None))[0]  # type: ignore[arg-type]
+    assert result.algorithm_result.result.single_value == 1.0
+    assert slow.metrics.timeouts.value("Hanging_1.0.0") == 1
+
+    release.set()
+    slow._executor.shutdown()
+    assert slow.executor_stats().detached_count == 0
+
+
+def test_timed_out_async_algorithm_is_cancelled():
+    """An async algorithm that times out is cancelled."""
+    proc._algorithmsSingleton._flush()
+    cancelled = []
+
+    @proc.algorithm("SlowAsync", "1.0.0", WindowA, timeout=0.1)
+    async def slow_async(params: ExecutionParams) -> ValueResult:
+        _ = params
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return ValueResult(0.0)
+
+    request = _execution_request()
+    del request.algorithms[:]
+    request.algorithms.add(name="SlowAsync", version="1.0.0")
+    result = list(proc.ExecuteDagPart(request, context=None))[0]  # type: ignore[arg-type]
+    assert "timed out" in result.algorithm_result.result.struct_value["error"]
+    assert cancelled == [True]
+
+
+def test_timeout_must_be_positive():
+    """Timeouts must be positive."""
+    with pytest.raises(InvalidAlgorithmArgument):
+        proc.algorithm("Bad", "1.0.0", WindowA, timeout=0)
+
+
+def test_algorithm_priority_defaults_to_window_priority():
+    """Algorithms take the priority of their window type unless they set one."""
+    proc._algorithmsSingleton._flush()
+    Alerts = WindowType(
+        name="Alerts", version="1.0.0", description="Realtime", priority=10
+    )
+
+    @proc.algorithm("Alerting", "1.0.0", Alerts)
+    def alerting(params: ExecutionParams) -> ValueResult:
+        _ = params
+        return ValueResult(1.0)
+
+    @proc.algorithm("Backfilling", "1.0.0", Alerts, priority=-1)
+    def backfilling(params: ExecutionParams) -> ValueResult:
+        _ = params
+        return ValueResult(1.0)
+
+    algorithms = proc._algorithmsSingleton._algorithms
+    assert algorithms["Alerting_1.0.0"].priority == 10
+    assert algorithms["Backfilling_1.0.0"].priority == -1
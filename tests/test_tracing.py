@@ -0,0 +1,170 @@
+import pytest
+import service_pb2 as pb
+from google.protobuf import timestamp_pb2
+
+from orca_python import (
+    Processor,
+    WindowType,
+    ValueResult,
+    ExecutionParams,
+)
+from orca_python.tracing import OpenTelemetryTracer
+
+WindowA = WindowType(name="WindowA", version="1.0.0", description="Test")
+
+
+class RecordedSpan:
+    def __init__(self, name, parent, attributes, start_time):
+        self.name = name
+        self.parent = parent
+        self.attributes = dict(attributes or {})
+        self.start_time = start_time
+        self.end_time = None
+        self.exceptions = []
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_exception(self, exception):
+        self.exceptions.append(exception)
+
+    def end(self, end_time=None):
+        self.end_time = end_time if end_time is not None else self.start_time or 1
+
+
+class RecordingTracer:
+    def __init__(self):
+        self.spans = []
+
+    def start_span(self, name, parent=None, attributes=None, start_time=None):
+        span = RecordedSpan(name, parent, attributes, start_time)
+        self.spans.append(span)
+        return span
+
+
+def _processor(tracer) -> Processor:
+    proc = Processor("ml", tracer=tracer)
+    proc._algorithmsSingleton._flush()
+
+    @proc.algorithm("Upstream", "1.0.0", WindowA)
+    def upstream(params: ExecutionParams) -> ValueResult:
+        _ = params
+        return ValueResult(1.0)
+
+    @proc.algorithm("Downstream", "1.0.0", WindowA, depends_on=[upstream])
+    def downstream(params: ExecutionParams) -> ValueResult:
+        return ValueResult(params.dependency_values["Upstream_1.0.0"] + 1)
+
+    @proc.algorithm("Failing", "1.0.0", WindowA)
+    def failing(params: ExecutionParams) -> ValueResult:
+        _ = params
+        raise RuntimeError("boom")
+
+    return proc
+
+
+def _execute(proc: Processor) -> dict:
+    request = pb.ExecutionRequest(
+        exec_id="exec-7",
+        window=pb.Window(
+            time_from=timestamp_pb2.Timestamp(seconds=0),
+            time_to=timestamp_pb2.Timestamp(seconds=1),
+            window_type_name=WindowA.name,
+            window_type_version=WindowA.version,
+            origin="test",
+        ),
+        algorithm_results=[
+            pb.AlgorithmResult(
+                algorithm=pb.Algorithm(name="Upstream", version="1.0.0"),
+                result=pb.Result(single_value=2.0),
+            )
+        ],
+        algorithms=[
+            pb.Algorithm(name="Downstream", version="1.0.0"),
+            pb.Algorithm(name="Failing", version="1.0.0"),
+        ],
+    )
+    results = proc.ExecuteDagPart(request, context=None)  # type: ignore[arg-type]
+    return {r.algorithm_result.algorithm.name: r.algorithm_result for r in results}
+
+
+def test_spans_cover_each_phase():
+    """A DAG part span parents a span per algorithm, which parents its phases."""
+    tracer = RecordingTracer()
+    results = _execute(_processor(tracer))
+    assert results["Downstream"].result.single_value == 3.0
+
+    (root,) = [s for s in tracer.spans if s.name == "orca.execute_dag_part"]
+    assert root.parent is None
+    assert root.attributes["orca.exec_id"] == "exec-7"
+    assert root.attributes["orca.window_type"] == "WindowA_1.0.0"
+
+    algorithms = {
+        s.attributes["orca.algorithm"]: s
+        for s in tracer.spans
+        if s.name == "orca.algorithm"
+    }
+    assert all(s.parent is root for s in algorithms.values())
+
+    downstream = algorithms["Downstream_1.0.0"]
+    phases = [s.name for s in tracer.spans if s.parent is downstream]
+    assert phases == ["orca.queue_wait", "orca.execute", "orca.encode"]
+    assert downstream.attributes["orca.outcome"] == "succeeded"
+
+    failing = algorithms["Failing_1.0.0"]
+    assert failing.attributes["orca.outcome"] == "unhandled_failure"
+    assert str(failing.exceptions[0]) == "boom"
+    assert all(s.end_time is not None for s in tracer.spans)
+
+
+def test_dependency_decodes_are_traced_when_read():
+    """Each dependency result is decoded, and traced, once when first read."""
+    tracer = RecordingTracer()
+    _execute(_processor(tracer))
+
+    (root,) = [s for s in tracer.spans if s.name == "orca.execute_dag_part"]
+    (decode,) = [s for s in tracer.spans if s.name == "orca.decode_dependency"]
+    assert decode.parent is root
+    assert decode.attributes["orca.dependency"] == "Upstream_1.0.0"
+    assert decode.start_time <= decode.end_time
+
+
+def test_worker_phases_are_ordered_in_time():
+    """Phases timed on a worker are reported with their real start and end."""
+    tracer = RecordingTracer()
+    _execute(_processor(tracer))
+    queueWait, execute = [
+        s for s in tracer.spans if s.name in ("orca.queue_wait", "orca.execute")
+    ][:2]
+    assert queueWait.start_time <= queueWait.end_time == execute.start_time
+    assert execute.start_time <= execute.end_time
+
+
+def test_opentelemetry_tracer():
+    """The OpenTelemetry adapter exports a trace per DAG part."""
+    sdk_trace = pytest.importorskip("opentelemetry.sdk.trace")
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+    exporter = InMemorySpanExporter()
+    provider = sdk_trace.TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    tracer = OpenTelemetryTracer(provider.get_tracer("test"))
+
+    _execute(_processor(tracer))
+
+    spans = exporter.get_finished_spans()
+    assert len({span.context.trace_id for span in spans}) == 1
+    (root,) = [span for span in spans if span.name == "orca.execute_dag_part"]
+    execute = [span for span in spans if span.name == "orca.execute"]
+    assert len(execute) == 1
+    assert all(span.start_time >= root.start_time for span in execute)
+    failing = [
+        span
+        for span in spans
+        if span.name == "orca.algorithm"
+        and span.attributes["orca.algorithm"] == "Failing_1.0.0"
+    ]
+    assert not failing[0].status.is_ok
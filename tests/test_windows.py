@@ -1,6 +1,11 @@
+import datetime as dt
+
 import pytest
+import service_pb2 as pb
+from google.protobuf import timestamp_pb2
 
-from orca_python import WindowType, MetadataField
+from orca_python import Window, WindowType, MetadataField
+from orca_python.windows import WindowMetadata
 from orca_python.exceptions import InvalidWindowArgument, InvalidMetadataFieldArgument
 
 
@@ -36,3 +41,30 @@ def test_window_type_definition():
             MetadataField(name="test name", description="test description")
         ],
     )
+
+
+def test_window_from_pb_decodes_metadata_lazily():
+    """Protobuf window metadata is decoded per field, on first access."""
+    window_pb = pb.Window(
+        time_from=timestamp_pb2.Timestamp(seconds=0),
+        time_to=timestamp_pb2.Timestamp(seconds=30),
+        window_type_name="TestWindow",
+        window_type_version="1.0.0",
+        origin="test",
+        metadata={"bus_id": 1, "route": {"stops": ["a", "b"]}},
+    )
+    window = Window.from_pb(window_pb)
+
+    assert window.time_to - window.time_from == dt.timedelta(seconds=30)
+    assert isinstance(window.metadata, WindowMetadata)
+    assert len(window.metadata) == 2
+    assert window.metadata._decoded == {}
+
+    assert window.metadata["bus_id"] == 1
+    assert window.metadata.get("missing") is None
+    assert "missing" not in window_pb.metadata.fields
+    assert list(window.metadata._decoded) == ["bus_id"]
+    assert window.metadata.to_dict() == {"bus_id": 1, "route": {"stops": ["a", "b"]}}
+
+    with pytest.raises(TypeError):
+        window.metadata["bus_id"] = 2  # type: ignore[index]